@@ -0,0 +1,132 @@
+# agregaciones.py
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from motor_puntajes import SEGMENTOS, UMBRAL_APROBACION
+
+MAX_CONSULTAS_CACHE = 256
+
+# Dimensiones disponibles y cómo se normaliza cada columna antes de agrupar
+DIMENSIONES = {
+    "Segmento TRL": lambda df: df["Segmento TRL"].astype(str),
+    "Industria": lambda df: df["Industria"].astype(object).fillna("No especificada").astype(str).str.strip(),
+    "Ubicación": lambda df: df["Ubicación"].astype(str).str.strip().str.capitalize().replace({"Nan": "No especificada", "": "No especificada"}),
+    "Nivel de Inglés": lambda df: df["Nivel de Inglés"].astype(object).fillna("No especificado").str.strip().str.capitalize(),
+    "Docente Acompañante": lambda df: np.where(df["Docente Acompañante"].astype(bool), "Sí", "No"),
+    "Aprobado": lambda df: df["Aprobado"].astype(str),
+}
+
+PUNTAJES = {
+    "puntaje_trl_1_3": "Puntaje TRL 1-3",
+    "puntaje_trl_4_7": "Puntaje TRL 4-7",
+    "puntaje_trl_8_9": "Puntaje TRL 8-9",
+    "puntaje_total": "Puntaje Total",
+}
+
+# Métrica -> (columna auxiliar, función de agregación)
+METRICAS = {"conteo": (None, "size"), "tasa_aprobacion": ("_aprobado", "mean")}
+for _clave, _columna in PUNTAJES.items():
+    METRICAS[f"promedio_{_clave}"] = (_columna, "mean")
+    METRICAS[f"maximo_{_clave}"] = (_columna, "max")
+for _segmento in SEGMENTOS:
+    # Proyectos con puntaje >= UMBRAL_APROBACION en el segmento
+    METRICAS["aprobados_" + _segmento.lower().replace(" ", "_").replace("-", "_")] = (f"_supera {_segmento}", "sum")
+
+
+def _columna_auxiliar(df, columna):
+    if columna == "_aprobado":
+        return (df["Aprobado"] == "Sí").to_numpy(dtype=float)
+    if columna.startswith("_supera "):
+        return (df[f"Puntaje {columna.removeprefix('_supera ')}"] >= UMBRAL_APROBACION).to_numpy(dtype=int)
+    # Puntajes en float32 dentro del frame: se agregan en doble precisión
+    return df[columna].to_numpy(dtype=float)
+
+
+def validar_consulta(dimensiones, metricas):
+    desconocidas = [d for d in dimensiones if d not in DIMENSIONES] + [m for m in metricas if m not in METRICAS]
+    if desconocidas:
+        raise ValueError(f"Dimensiones o métricas desconocidas: {', '.join(desconocidas)}")
+    pedidas = [*dimensiones, *metricas]
+    repetidas = [c for c in dict.fromkeys(pedidas) if pedidas.count(c) > 1]
+    if repetidas:
+        raise ValueError(f"Dimensiones o métricas repetidas: {', '.join(repetidas)}")
+    if not metricas:
+        raise ValueError("Se necesita al menos una métrica")
+
+
+def agregar(df, dimensiones=(), metricas=("conteo",)):
+    """Agrupa `df` por `dimensiones` y calcula `metricas`, sin modificar `df`.
+
+    Las filas salen ordenadas de mayor a menor por la primera métrica, como
+    `value_counts`. Sin dimensiones se obtiene una sola fila con el total.
+    """
+    dimensiones, metricas = list(dimensiones), list(metricas)
+    validar_consulta(dimensiones, metricas)
+
+    base = pd.DataFrame({d: DIMENSIONES[d](df) for d in dimensiones}, index=df.index)
+    columnas = {METRICAS[m][0] for m in metricas} - {None}
+    for columna in columnas:
+        base[columna] = _columna_auxiliar(df, columna)
+
+    especificacion = {m: METRICAS[m] for m in metricas}
+    if dimensiones:
+        agrupado = base.groupby(dimensiones, sort=False, dropna=False)
+        resultado = pd.DataFrame({
+            m: agrupado.size() if funcion == "size" else agrupado[columna].agg(funcion)
+            for m, (columna, funcion) in especificacion.items()
+        }).reset_index()
+        resultado = resultado.sort_values(metricas[0], ascending=False, kind="stable")
+    else:
+        resultado = pd.DataFrame([{
+            m: len(base) if funcion == "size" else base[columna].agg(funcion)
+            for m, (columna, funcion) in especificacion.items()
+        }])
+
+    if "tasa_aprobacion" in resultado:
+        resultado["tasa_aprobacion"] = resultado["tasa_aprobacion"] * 100
+    for metrica in metricas:
+        if METRICAS[metrica][1] == "mean":
+            resultado[metrica] = resultado[metrica].round(1)
+
+    return {
+        "dimensiones": dimensiones,
+        "metricas": metricas,
+        "filas": resultado.astype(object).where(resultado.notna(), None).to_dict(orient="records"),
+    }
+
+
+class CacheLRU:
+    """Resultados por clave con desalojo del menos usado; seguro entre hilos."""
+
+    def __init__(self, maximo=MAX_CONSULTAS_CACHE):
+        self.maximo = maximo
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave, calcular, guardar=True):
+        """Valor guardado para `clave`, o `calcular()`; con `guardar=False` no desplaza a otras claves."""
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                return self._datos[clave]
+        valor = calcular()
+        if not guardar:
+            return valor
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+        return valor
+
+
+cache_agregaciones = CacheLRU()
+
+
+def consultar(snapshot, dimensiones=(), metricas=("conteo",)):
+    """`agregar` sobre el snapshot, memorizado por (versión del dataset, consulta)."""
+    clave = (snapshot.version, tuple(dimensiones), tuple(metricas))
+    return cache_agregaciones.obtener(clave, lambda: agregar(snapshot.df, dimensiones, metricas))
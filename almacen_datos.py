@@ -0,0 +1,371 @@
+# almacen_datos.py
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bloqueos import BloqueoArchivo
+from data_loader import construir_diccionario
+from insights import RUTA_REGLAS, MotorInsights
+from motor_puntajes import compilar_diccionario
+from procesamiento import COLUMNAS_FRIAS, VERSION_PROCESAMIENTO, memoria, procesar_incremental
+
+RUTA_DATOS = "datos_formularios.parquet"
+# Snapshot procesado en Arrow IPC sin comprimir: cada worker lo mapea en memoria en lugar de copiarlo
+RUTA_PROCESADOS = "datos_procesados.arrow"
+RUTA_CSV = "datos_formularios.csv"
+RUTA_DICCIONARIO = "diccionario.csv"
+# Columnas de texto largo por id, en Arrow IPC sin comprimir para leerlas mapeadas en memoria
+RUTA_TEXTOS = "datos_textos.arrow"
+# Exportar también datos_formularios.csv en cada actualización (desactivado por defecto)
+EXPORTAR_CSV = os.getenv("EXPORTAR_CSV", "0") == "1"
+
+
+@dataclass(frozen=True)
+class SnapshotDatos:
+    """Versión inmutable del dataset procesado. Nunca modificar `df` en sitio."""
+    version: str
+    df: pd.DataFrame
+    diccionario: dict
+    version_diccionario: str
+    motor_insights: MotorInsights
+    textos: "TablaTextos"
+    creado: datetime
+    huella: tuple
+    cambios: dict
+    derivados: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def memo(self, clave, calcular):
+        """Resultado derivado de este snapshot, calculado la primera vez que se pide.
+
+        Quien lo recibe no debe modificarlo: se comparte entre peticiones.
+        """
+        if clave not in self.derivados:
+            self.derivados[clave] = calcular()
+        return self.derivados[clave]
+
+    def memoria(self):
+        """Bytes que ocupa el frame procesado en memoria."""
+        return self.memo(("memoria",), lambda: memoria(self.df))
+
+
+def tipar_crudos(df):
+    """Normaliza entradas crudas a los tipos que infiere `pd.read_csv`.
+
+    La API de Gravity Forms devuelve todo como texto: los vacíos pasan a nulos y
+    las columnas completamente numéricas a número, para que el Parquet quede
+    tipado y el procesamiento vea lo mismo que con el CSV.
+    """
+    df = df.copy()
+    for columna in df.columns:
+        serie = df[columna]
+        if serie.dtype != object:
+            continue
+        serie = serie.mask(serie == "")
+        presentes = serie.notna()
+        if not presentes.any():
+            df[columna] = serie.astype("float64")
+            continue
+
+        numerica = pd.to_numeric(serie, errors="coerce")
+        if numerica.notna().sum() == presentes.sum():
+            if presentes.all() and (numerica % 1 == 0).all():
+                numerica = numerica.astype("int64")
+            df[columna] = numerica
+        else:
+            df[columna] = serie.where(~presentes, serie.astype(str))
+    return df
+
+
+def _a_pandas(tabla, split_blocks=False):
+    """Convierte una tabla Arrow dejando los textos faltantes como NaN, igual que `pd.read_csv`.
+
+    Con `split_blocks` las columnas numéricas sin nulos no se copian: siguen
+    apuntando a la memoria de la tabla (p. ej. un archivo mapeado) y son de
+    solo lectura.
+    """
+    df = tabla.to_pandas(split_blocks=split_blocks)
+    texto = df.columns[df.dtypes == object]
+    df[texto] = df[texto].where(df[texto].notna(), np.nan)
+    return df
+
+
+def _temporal(ruta):
+    """Archivo temporal único junto a `ruta`, para publicarlo después con `os.replace`."""
+    descriptor, temporal = tempfile.mkstemp(
+        dir=os.path.dirname(ruta) or ".", prefix=f"{os.path.basename(ruta)}.", suffix=".tmp"
+    )
+    os.close(descriptor)
+    return temporal
+
+
+def _escribir_parquet(df, ruta, metadatos=None):
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    if metadatos:
+        tabla = tabla.replace_schema_metadata({**(tabla.schema.metadata or {}), **metadatos})
+    temporal = _temporal(ruta)
+    pq.write_table(tabla, temporal, compression="zstd")
+    os.replace(temporal, ruta)
+
+
+def _escribir_arrow(tabla, ruta, version):
+    """Publica `tabla` en Arrow IPC de forma atómica; quien ya la tenga mapeada sigue viendo la anterior."""
+    tabla = tabla.replace_schema_metadata({**(tabla.schema.metadata or {}), b"version": version.encode()})
+    temporal = _temporal(ruta)
+    with pa.OSFile(temporal, "wb") as destino, pa.ipc.new_file(destino, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    os.replace(temporal, ruta)
+
+
+def _leer_arrow(ruta, version):
+    """Tabla mapeada en memoria desde `ruta`, o None si no existe o es de otra versión."""
+    if not os.path.exists(ruta):
+        return None
+    lector = pa.ipc.open_file(pa.memory_map(ruta))
+    if (lector.schema.metadata or {}).get(b"version") != version.encode():
+        return None
+    return lector.read_all()
+
+
+class TablaTextos:
+    """Columnas de texto largo (`COLUMNAS_FRIAS`) de cada entrada, leídas por `id` solo cuando se piden.
+
+    `tabla` es el archivo de la versión del snapshot ya mapeado en memoria:
+    aunque una actualización publique otro, este sigue viendo el suyo. Las
+    filas que nadie pide no llegan a leerse del disco, y el índice por `id` se
+    arma la primera vez que se consulta.
+    """
+
+    def __init__(self, tabla, version):
+        self.tabla = tabla
+        self.version = version
+        self._posiciones = None
+        self._lock = threading.Lock()
+
+    @property
+    def columnas(self):
+        return [c for c in COLUMNAS_FRIAS if c in self.tabla.column_names]
+
+    def _indice(self):
+        if self._posiciones is None:
+            with self._lock:
+                if self._posiciones is None:
+                    self._posiciones = pd.Index(self.tabla.column("id").to_numpy())
+        return self._posiciones
+
+    def filas(self, ids, columnas=None):
+        """Frame con `columnas` de las entradas `ids`, en ese orden; NaN para ids desconocidos."""
+        tabla = self.tabla
+        columnas = self.columnas if columnas is None else list(columnas)
+        posiciones = self._indice().get_indexer(pd.Index(ids))
+        encontradas = posiciones >= 0
+        presentes = [c for c in columnas if c in tabla.column_names]
+        df = pd.DataFrame(np.nan, index=range(len(posiciones)), columns=columnas, dtype=object)
+        if encontradas.any() and presentes:
+            filas = _a_pandas(tabla.select(presentes).take(posiciones[encontradas]))
+            df.loc[encontradas, presentes] = filas.to_numpy()
+        return df
+
+
+def _publicar_textos(crudo, ruta, version):
+    """Tabla mapeada con `id` + `COLUMNAS_FRIAS` de los crudos; la escribe antes si el archivo es de otra versión."""
+    tabla = _leer_arrow(ruta, version)
+    if tabla is None:
+        nombres = pq.read_schema(pa.BufferReader(crudo)).names
+        tabla = pq.read_table(pa.BufferReader(crudo), columns=["id"] + [c for c in COLUMNAS_FRIAS if c in nombres])
+        _escribir_arrow(tabla, ruta, version)
+        tabla = _leer_arrow(ruta, version)
+    return tabla
+
+
+class AlmacenDatos:
+    """Cache en proceso del dataset procesado, reconstruido una sola vez por versión.
+
+    Las entradas crudas se guardan en Parquet y el frame procesado en un archivo
+    Arrow IPC inmutable junto con su versión, de modo que un reinicio no vuelve
+    a puntuar. Con varios workers, cada uno mapea ese mismo archivo en memoria
+    y solo el primero que ve una versión nueva la procesa.
+    La versión es un hash del contenido de los datos crudos, del diccionario y
+    de las reglas de insights. Cada petición solo hace un `stat` de esos
+    archivos; si no cambiaron, recibe el mismo snapshot sin recalcular nada.
+
+    El texto largo de cada entrada no entra al frame procesado: queda en
+    `ruta_textos` y se lee por id con `snapshot.textos`.
+    """
+
+    def __init__(self, ruta_datos=RUTA_DATOS, ruta_diccionario=RUTA_DICCIONARIO,
+                 ruta_procesados=RUTA_PROCESADOS, ruta_csv=RUTA_CSV, ruta_reglas=RUTA_REGLAS,
+                 ruta_textos=RUTA_TEXTOS):
+        self.ruta_datos = ruta_datos
+        self.ruta_diccionario = ruta_diccionario
+        self.ruta_reglas = ruta_reglas
+        self.ruta_procesados = ruta_procesados
+        self.ruta_csv = ruta_csv
+        self.ruta_textos = ruta_textos
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def existen_crudos(self):
+        """Indica si hay entradas locales, migrando `datos_formularios.csv` a Parquet la primera vez."""
+        if os.path.exists(self.ruta_datos):
+            return True
+        if not (self.ruta_csv and os.path.exists(self.ruta_csv)):
+            return False
+        # El precalentado, la primera petición y los otros workers pueden llegar a la vez
+        with BloqueoArchivo("migracion_crudos"):
+            if not os.path.exists(self.ruta_datos):
+                _escribir_parquet(tipar_crudos(pd.read_csv(self.ruta_csv)), self.ruta_datos)
+        return True
+
+    def cargar_crudos(self, columnas=None):
+        """Lee las entradas crudas (solo `columnas` si se indican) con el archivo mapeado en memoria."""
+        return _a_pandas(pq.read_table(self.ruta_datos, columns=columnas, memory_map=True))
+
+    def _huella(self):
+        huella = []
+        for ruta in (self.ruta_datos, self.ruta_diccionario, self.ruta_reglas):
+            info = os.stat(ruta)
+            huella.append((info.st_mtime_ns, info.st_size))
+        return tuple(huella)
+
+    def snapshot(self):
+        """Devuelve el snapshot vigente, reconstruyéndolo si los archivos cambiaron.
+
+        Mientras otra petición o una actualización construye la versión nueva,
+        los lectores reciben la anterior en lugar de esperar.
+        """
+        actual = self._snapshot
+        if actual is not None and actual.huella == self._huella():
+            return actual
+
+        if not self._lock.acquire(blocking=False):
+            if actual is not None:
+                # Hay una versión nueva en construcción: seguir sirviendo la anterior
+                return actual
+            self._lock.acquire()
+        try:
+            actual = self._snapshot
+            if actual is not None and actual.huella == self._huella():
+                return actual
+            self._snapshot = self._construir(actual)
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+    def vigente(self):
+        """El snapshot que `snapshot()` devolvería sin esperar ni procesar, o None si hay que construirlo."""
+        actual = self._snapshot
+        if actual is None:
+            return None
+        if self._lock.locked():
+            return actual
+        try:
+            return actual if actual.huella == self._huella() else None
+        except OSError:
+            return None
+
+    def recargar(self):
+        """Construye una nueva versión y la publica de forma atómica."""
+        with self._lock:
+            self._snapshot = self._construir(self._snapshot)
+            return self._snapshot
+
+    def guardar_crudos(self, df):
+        """Persiste las entradas crudas sin dejar archivos a medio escribir y publica la nueva versión."""
+        df = tipar_crudos(df)
+        _escribir_parquet(df, self.ruta_datos)
+        if EXPORTAR_CSV:
+            self.exportar_csv(df)
+        return self.recargar()
+
+    def exportar_csv(self, df=None, ruta=None):
+        ruta = ruta or self.ruta_csv
+        df = self.cargar_crudos() if df is None else df
+        temporal = _temporal(ruta)
+        df.to_csv(temporal, index=False)
+        os.replace(temporal, ruta)
+        return ruta
+
+    def _cargar_procesados(self, version):
+        """Frame procesado publicado, mapeado en memoria, solo si corresponde a `version`."""
+        tabla = _leer_arrow(self.ruta_procesados, version)
+        return None if tabla is None else _a_pandas(tabla, split_blocks=True)
+
+    def _guardar_procesados(self, df, version):
+        try:
+            _escribir_arrow(pa.Table.from_pandas(df, preserve_index=False), self.ruta_procesados, version)
+        except (pa.ArrowException, ValueError):
+            # Columnas que Arrow no puede tipar: se sirve igual, solo no se persiste
+            pass
+
+    def _columnas_a_procesar(self, crudo, diccionario):
+        """Columnas crudas que necesita el procesamiento: todas salvo el texto largo."""
+        nombres = pq.read_schema(pa.BufferReader(crudo)).names
+        if compilar_diccionario(diccionario).evaluar_todo:
+            # Hay preguntas sin campo conocido y se buscan en todas las columnas
+            return nombres
+        return [c for c in nombres if c not in COLUMNAS_FRIAS]
+
+    def _construir(self, anterior):
+        self.existen_crudos()
+        huella = self._huella()
+        with open(self.ruta_datos, "rb") as f:
+            crudo = f.read()
+        with open(self.ruta_diccionario, "rb") as f:
+            crudo_diccionario = f.read()
+        with open(self.ruta_reglas, "rb") as f:
+            crudo_reglas = f.read()
+
+        # Todo lo que no son los datos crudos: si cambia, hay que volver a puntuar cada fila
+        version_diccionario = hashlib.sha256(
+            crudo_diccionario + b"\0" + crudo_reglas + b"\0" + VERSION_PROCESAMIENTO
+        ).hexdigest()[:16]
+        version_crudos = hashlib.sha256(crudo).hexdigest()[:16]
+        version = hashlib.sha256(f"{version_crudos}|{version_diccionario}".encode()).hexdigest()[:16]
+        if anterior is not None and anterior.version == version:
+            # Mismo contenido (p. ej. el archivo solo fue tocado): se reutiliza el frame
+            return replace(anterior, huella=huella)
+
+        if anterior is not None and anterior.version_diccionario == version_diccionario:
+            diccionario = anterior.diccionario
+            motor_insights = anterior.motor_insights
+        else:
+            diccionario = construir_diccionario(pd.read_csv(io.BytesIO(crudo_diccionario)))
+            motor_insights = MotorInsights.desde_json(crudo_reglas)
+
+        # Con varios workers, uno solo procesa y publica la versión; el resto espera y la mapea
+        with BloqueoArchivo("procesados"):
+            textos = TablaTextos(_publicar_textos(crudo, self.ruta_textos, version_crudos), version_crudos)
+            df = self._cargar_procesados(version)
+            if df is not None:
+                cambios = {"procesadas": 0, "reutilizadas": len(df), "eliminadas": 0, "completo": False}
+            else:
+                # Solo se vuelven a puntuar las entradas nuevas o modificadas
+                previo = anterior.df if anterior is not None and anterior.version_diccionario == version_diccionario else None
+                crudos = _a_pandas(pq.read_table(pa.BufferReader(crudo), columns=self._columnas_a_procesar(crudo, diccionario)))
+                df, cambios = procesar_incremental(crudos, diccionario, previo, motor_insights)
+                self._guardar_procesados(df, version)
+                # Se sirve lo publicado, igual que los demás workers, y se suelta la copia propia
+                publicado = self._cargar_procesados(version)
+                if publicado is not None:
+                    df = publicado
+
+        return SnapshotDatos(
+            version=version,
+            df=df,
+            diccionario=diccionario,
+            version_diccionario=version_diccionario,
+            motor_insights=motor_insights,
+            textos=textos,
+            creado=datetime.now(),
+            huella=huella,
+            cambios=cambios,
+        )
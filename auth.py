@@ -1,25 +1,104 @@
 # auth.py
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 import pandas as pd
-import streamlit as st
-
-def obtener_todas_las_entradas(usuario, clave_app, url_base):
-    print(f"Credenciales recibidas - Usuario: {usuario}, Clave: {clave_app}")
-    all_entries = []
-    page = 1
-    while True:
-        params = {"paging[page_size]": 100, "paging[current_page]": page}
-        response = requests.get(url_base, auth=HTTPBasicAuth(usuario, clave_app), params=params)
-        if response.status_code != 200:
-            st.error(f"Error {response.status_code}: {response.text}")
-            return pd.DataFrame()
-        data = response.json()
-        entries = data.get("entries", [])
-        if not entries:
-            break
-        all_entries.extend(entries)
-        if len(entries) < 100:
-            break
-        page += 1
-    return pd.DataFrame(all_entries)
+
+TAMANO_PAGINA = 100
+CONCURRENCIA = int(os.getenv("GF_CONCURRENCIA", "4"))
+TIMEOUT = (5, 30)  # conexión, lectura (segundos)
+
+def crear_sesion(usuario, clave_app, concurrencia=CONCURRENCIA):
+    """Sesión con keep-alive, pool del tamaño de la concurrencia y reintentos con backoff exponencial en 429/5xx."""
+    reintentos = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=concurrencia, max_retries=reintentos)
+    sesion = requests.Session()
+    sesion.auth = HTTPBasicAuth(usuario, clave_app)
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    return sesion
+
+def _obtener_pagina(sesion, url_base, page, params_extra=None):
+    params = {"paging[page_size]": TAMANO_PAGINA, "paging[current_page]": page}
+    if params_extra:
+        params.update(params_extra)
+    inicio = time.perf_counter()
+    response = sesion.get(url_base, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json(), (time.perf_counter() - inicio) * 1000
+
+def descargar_entradas(usuario, clave_app, url_base, params_extra=None, concurrencia=CONCURRENCIA, progreso=None):
+    """Descarga todas las páginas de entradas de un formulario.
+
+    Lee `total_count` de la primera página y pide el resto en paralelo con
+    `concurrencia` conexiones. Un error HTTP (tras los reintentos) se propaga.
+    `progreso(paginas_descargadas, paginas_totales)` se llama tras cada página.
+    Devuelve el DataFrame y métricas de la descarga con la latencia de cada página.
+    """
+    inicio = time.perf_counter()
+    with crear_sesion(usuario, clave_app, concurrencia) as sesion:
+        primera, latencia = _obtener_pagina(sesion, url_base, 1, params_extra)
+        paginas = {1: primera.get("entries", [])}
+        latencias = {1: latencia}
+
+        if "total_count" in primera:
+            total_paginas = max(1, math.ceil(int(primera["total_count"]) / TAMANO_PAGINA))
+            if progreso:
+                progreso(1, total_paginas)
+            with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+                futuros = {
+                    pool.submit(_obtener_pagina, sesion, url_base, page, params_extra): page
+                    for page in range(2, total_paginas + 1)
+                }
+                for futuro in as_completed(futuros):
+                    page = futuros[futuro]
+                    datos, latencias[page] = futuro.result()
+                    paginas[page] = datos.get("entries", [])
+                    if progreso:
+                        progreso(len(paginas), total_paginas)
+        else:
+            # API sin total_count: paginar secuencialmente hasta una página incompleta
+            page = 1
+            while len(paginas[page]) == TAMANO_PAGINA:
+                page += 1
+                datos, latencias[page] = _obtener_pagina(sesion, url_base, page, params_extra)
+                paginas[page] = datos.get("entries", [])
+                if progreso:
+                    progreso(len(paginas), None)
+
+    entradas = [entrada for page in sorted(paginas) for entrada in paginas[page]]
+    df = pd.DataFrame(entradas)
+    if "id" in df.columns:
+        # Una entrada puede repetirse si el formulario cambió entre páginas
+        df = df.drop_duplicates(subset="id", keep="last").reset_index(drop=True)
+
+    metricas = {
+        "paginas": len(paginas),
+        "entradas": len(df),
+        "concurrencia": concurrencia,
+        "duracion_ms": round((time.perf_counter() - inicio) * 1000, 1),
+        "latencias_ms": [round(latencias[page], 1) for page in sorted(latencias)],
+    }
+    return df, metricas
+
+def parametros_actualizadas(desde):
+    """Filtro de la API REST de Gravity Forms para entradas con `date_updated` posterior a `desde`."""
+    return {
+        "search": json.dumps({"field_filters": [{"key": "date_updated", "value": desde, "operator": ">"}]}),
+        "sorting[key]": "date_updated",
+        "sorting[direction]": "ASC",
+    }
@@ -1,28 +1,35 @@
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, Request, Header, Query
+from fastapi import FastAPI, HTTPException, Request, Response, Header, Query
 from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-import pandas as pd
 import base64
-import numpy as np
-from auth import obtener_todas_las_entradas
-from funciones import segmento_trl, calcular_puntajes_por_segmento, generar_insights, generar_excel_aprobados
-from data_loader import cargar_diccionario
-from visualizaciones import graficos_generales
+from funciones import generar_excel_aprobados, generar_csv_aprobados
+from almacen_datos import AlmacenDatos
+from sincronizacion import sincronizar
+from tareas import DIRECTORIO_TAREAS, GestorActualizaciones, PoolTrabajos, ProgramadorActualizaciones
+from bloqueos import BloqueoArchivo
+from tablero import SECCIONES, construir_tablero, seccion, pagina_proyectos, posiciones_proyectos
+from cache_http import verificar_cache
+from agregaciones import consultar, validar_consulta
+from buscador import buscar_proyectos, detalle_proyecto, proyectos_de
+from insights import materializar
+from reportes import RegistroExportaciones, RenderizadorReportes, buscar_por_nombre, zip_reportes
 from urllib.parse import unquote
+import asyncio
+import json
 import os
-import io
-import re
 from dotenv import load_dotenv
 
 # Cargar .env
 load_dotenv()
 APP_PASSWORD = os.getenv("APP_PASSWORD", "").strip()
+# Minutos entre actualizaciones automáticas (0 = desactivado)
+INTERVALO_ACTUALIZACION_MIN = float(os.getenv("ACTUALIZACION_INTERVALO_MIN", "0"))
+URL_ENTRADAS = os.getenv("GF_URL_ENTRADAS", "https://fablab.ucontinental.edu.pe/wp-json/gf/v2/forms/9/entries")
 
 app = FastAPI()
 
@@ -39,6 +46,8 @@ async def serve_spa():
     return FileResponse("templates/static/index.html")
 
 templates = Jinja2Templates(directory=templates_dir)
+renderizador = RenderizadorReportes(templates)
+exportaciones = RegistroExportaciones()
 
 app.add_middleware(
     CORSMiddleware,
@@ -65,157 +74,300 @@ def validar_contraseña(authorization: str = Header(...)):
     except Exception as e:
         raise HTTPException(status_code=401, detail="Error en autenticación")
 
+# Validación del parámetro `auth` de los reportes que se abren en otra pestaña
+def validar_auth_reporte(auth: str):
+    try:
+        decoded = base64.b64decode(auth).decode("utf-8")
+        _, password = decoded.split(":", 1)
+
+        password_limpia = password.strip().replace("\u00A0", " ").replace("\u200B", "")
+        esperado = APP_PASSWORD.replace("\u00A0", " ").replace("\u200B", "")
+
+        if password_limpia != esperado:
+            raise HTTPException(status_code=401, detail="Credenciales inválidas")
+    except Exception:
+        raise HTTPException(status_code=401, detail="Error en autenticación")
+
 class ProjectRequest(BaseModel):
     nombre: str
-
-def obtener_y_guardar_datos():
-    df = obtener_todas_las_entradas(
-        usuario="multimediafalab",
-        clave_app=APP_PASSWORD,
-        url_base="https://fablab.ucontinental.edu.pe/wp-json/gf/v2/forms/9/entries"
+    limite: int | None = Field(None, ge=1, le=500)
+    campos: list[str] | None = None
+
+# Campos que devuelve la búsqueda rápida si no se piden otros
+CAMPOS_SUGERENCIAS = ["id", "Nombre del Proyecto", "Aprobado", "Segmento TRL", "Puntaje Total"]
+# Campos de /proyecto/{id} si no se piden otros
+CAMPOS_DETALLE = [
+    "id", "Nombre del Proyecto", "Aprobado", "Nivel TRL", "Segmento TRL", "Docente Acompañante",
+    "Ubicación", "Nivel de Inglés", "Industria", "Puntaje TRL 1-3", "Puntaje TRL 4-7",
+    "Puntaje TRL 8-9", "Puntaje Total", "Insights"
+]
+
+# Snapshot procesado compartido por todos los endpoints
+almacen = AlmacenDatos()
+
+def obtener_y_guardar_datos(completo=False, progreso=None, fase=None, solo_si_faltan=False):
+    # Con varios workers (WEB_CONCURRENCY), una sola sincronización a la vez
+    with BloqueoArchivo("sincronizacion"):
+        if solo_si_faltan and almacen.existen_crudos():
+            return None
+        return sincronizar(
+            usuario="multimediafalab",
+            clave_app=APP_PASSWORD,
+            url_base=URL_ENTRADAS,
+            almacen=almacen,
+            forzar_completo=completo,
+            progreso=progreso,
+            fase=fase
+        )
+
+def ejecutar_actualizacion(tarea):
+    resumen = obtener_y_guardar_datos(
+        tarea.opciones.get("completo", False),
+        progreso=tarea.reportar_paginas,
+        fase=tarea.cambiar_fase
     )
-    if not df.empty:
-        df.to_csv("datos_formularios.csv", index=False)
-    return df
-
-
-def cargar_y_procesar_datos():
-    if not os.path.exists("datos_formularios.csv"):
-        df = obtener_y_guardar_datos()
-    else:
-        df = pd.read_csv("datos_formularios.csv")
-
-    diccionario = cargar_diccionario("diccionario.csv")
-    return procesar_datos_completos(df, diccionario)
-
-def procesar_datos_completos(df, diccionario):
-    df = df.rename(columns={
-        "1": "Nombre del Proyecto",
-        "14": "Nivel TRL",
-        "15": "Docente Acompañante",
-        "17": "Nivel de Inglés",
-        "30": "Ubicación",
-        "3": "Industria"
-    })
-
-    df["Nivel TRL"] = pd.to_numeric(df["Nivel TRL"], errors="coerce").fillna(0)
-    df["Segmento TRL"] = df["Nivel TRL"].apply(segmento_trl)
-
-    for segmento in ["TRL 1-3", "TRL 4-7", "TRL 8-9"]:
-        df[f"Puntaje {segmento}"] = 0.0
-    df["Aprobado"] = "No"
-
-    for idx, row in df.iterrows():
-        puntajes = calcular_puntajes_por_segmento(row, diccionario)
-        extra = 0
-
-        nivel_ingles = str(row.get("Nivel de Inglés", "")).strip().lower()
-        if "intermedio" in nivel_ingles:
-            extra += 2
-        elif "avanzado" in nivel_ingles:
-            extra += 4
-
-        docente = str(row.get("Docente Acompañante", "")).strip().lower()
-        if docente == "si":
-            extra += 10
-
-        for segmento in puntajes:
-            df.at[idx, f"Puntaje {segmento}"] = puntajes[segmento] + extra
-
-        if any((puntajes[seg] + extra) >= 50 for seg in puntajes):
-            df.at[idx, "Aprobado"] = "Sí"
-
-    df["Docente Acompañante"] = df["Docente Acompañante"].astype(str).str.strip().str.upper() == "SI"
-    df["Nivel de Inglés"] = df["Nivel de Inglés"].fillna("No especificado").str.strip().str.capitalize()
-    df["Puntaje Total"] = df["Puntaje TRL 1-3"] + df["Puntaje TRL 4-7"] + df["Puntaje TRL 8-9"]
-    df["Insights"] = df.apply(lambda row: generar_insights(row, diccionario), axis=1)
-
-    return df
-
-@app.post("/actualizar-datos")
-async def actualizar_datos(authorization: str = Header(...)):
+    snapshot = almacen.snapshot()
+    return {**resumen, "version": snapshot.version, "cambios": snapshot.cambios, "memoria_bytes": snapshot.memoria()}
+
+# Las actualizaciones corren en segundo plano; los lectores siguen usando el snapshot anterior
+gestor_actualizaciones = GestorActualizaciones(ejecutar_actualizacion, DIRECTORIO_TAREAS)
+programador = ProgramadorActualizaciones(gestor_actualizaciones, INTERVALO_ACTUALIZACION_MIN)
+# Solo el worker que toma este bloqueo corre las actualizaciones programadas
+bloqueo_programador = BloqueoArchivo("programador")
+# pandas, Plotly, openpyxl y Jinja corren aquí y no en el event loop
+trabajos = PoolTrabajos()
+
+@app.on_event("startup")
+def iniciar_programador():
+    if bloqueo_programador.intentar():
+        programador.iniciar()
+
+def precalentar():
+    # Mapea el snapshot persistido; solo procesa si los archivos cambiaron desde que se guardó
+    if almacen.existen_crudos():
+        seccion(almacen.snapshot(), "metricas")
+
+@app.on_event("startup")
+async def precalentar_snapshot():
+    # Sin esperar: el servidor acepta peticiones mientras el pool carga el snapshot
+    app.state.precalentado = asyncio.get_running_loop().create_task(trabajos.ejecutar(precalentar))
+
+@app.on_event("shutdown")
+def detener_programador():
+    programador.detener()
+    bloqueo_programador.liberar()
+    trabajos.cerrar()
+
+
+def construir_snapshot():
+    if not almacen.existen_crudos():
+        obtener_y_guardar_datos(solo_si_faltan=True)
+    return almacen.snapshot()
+
+async def obtener_snapshot():
+    # Lo habitual es que el snapshot ya esté listo; solo construirlo pasa por el pool
+    snapshot = almacen.vigente()
+    if snapshot is None:
+        snapshot = await trabajos.ejecutar(construir_snapshot)
+    return snapshot
+
+def a_json(contenido):
+    """Bytes JSON con el mismo formato que `JSONResponse` de FastAPI; se arma en el pool, no en el loop."""
+    return json.dumps(
+        jsonable_encoder(contenido), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+async def respuesta_json(snapshot, clave, calcular, cabeceras):
+    """Respuesta ya serializada, guardada por versión del snapshot."""
+    contenido = await trabajos.ejecutar(snapshot.memo, ("json", *clave), lambda: a_json(calcular()))
+    return Response(contenido, media_type="application/json", headers=cabeceras)
+
+@app.post("/actualizar-datos", status_code=202)
+async def actualizar_datos(authorization: str = Header(...), completo: bool = Query(False)):
     validar_contraseña(authorization)
-    try:
-        df = obtener_y_guardar_datos()
-        return {"mensaje": f"Datos cargados ({len(df)} registros)"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    tarea, nueva = gestor_actualizaciones.iniciar(origen="api", completo=completo)
+    return {
+        "mensaje": "Actualización iniciada" if nueva else "Ya hay una actualización en curso",
+        "tarea": tarea.a_dict()
+    }
 
-@app.get("/metricas-principales")
-async def obtener_metricas(authorization: str = Header(...)):
+@app.get("/actualizar-datos/{tarea_id}")
+async def estado_actualizacion(tarea_id: str, authorization: str = Header(...)):
     validar_contraseña(authorization)
-    df = cargar_y_procesar_datos()
-
-    # Top proyecto por segmento TRL
-    top_proyectos_trl = {}
-    for segmento in ["TRL 1-3", "TRL 4-7", "TRL 8-9"]:
-        filtro = df[df["Segmento TRL"] == segmento]
-        if not filtro.empty:
-            top_row = filtro.loc[filtro["Puntaje Total"].idxmax()]
-            top_proyectos_trl[segmento] = top_row["Nombre del Proyecto"]
-
-    # Nivel de inglés más común
-    nivel_ingles_mas_comun = df["Nivel de Inglés"].mode().iloc[0] if not df["Nivel de Inglés"].empty else "No especificado"
-
+    tarea = gestor_actualizaciones.obtener(tarea_id)
+    if tarea is None:
+        raise HTTPException(status_code=404, detail="Actualización no encontrada")
+    return tarea.a_dict()
+
+@app.get("/estado-servidor")
+async def estado_servidor(authorization: str = Header(...)):
+    """Ocupación del pool de trabajos y versión del snapshot cargado; no espera al pool."""
+    validar_contraseña(authorization)
+    snapshot = almacen.vigente()
     return {
-        "formularios": len(df),
-        "trl_max": int(df["Nivel TRL"].max()),
-        "aprobados": int((df["Aprobado"] == "Sí").sum()),
-        "docente_si": int(df["Docente Acompañante"].sum()),
-        "docente_no": len(df) - int(df["Docente Acompañante"].sum()),
-        "puntaje_maximo": round(df["Puntaje Total"].max(), 1),
-        "top_proyectos_trl": top_proyectos_trl,
-        "nivel_ingles_mas_comun": nivel_ingles_mas_comun
+        "trabajos": trabajos.estado(),
+        "version": snapshot.version if snapshot else None,
     }
 
-@app.get("/datos-graficos")
-async def obtener_datos_graficos(authorization: str = Header(...)):
+@app.get("/dashboard")
+async def obtener_tablero(
+    request: Request,
+    response: Response,
+    authorization: str = Header(...),
+    secciones: str = Query(",".join(SECCIONES))
+):
     validar_contraseña(authorization)
-    df = cargar_y_procesar_datos()
-    fig1, fig2, fig3, fig4, fig5, fig6, fig7 = graficos_generales(
-        df, "Industria", "Nivel de Inglés", "Ubicación"
+    pedidas = [nombre.strip() for nombre in secciones.split(",") if nombre.strip()]
+    desconocidas = [nombre for nombre in pedidas if nombre not in SECCIONES]
+    if desconocidas:
+        raise HTTPException(status_code=400, detail=f"Secciones desconocidas: {', '.join(desconocidas)}")
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
+    # Sin repetidas: la clave del cache queda acotada a combinaciones de SECCIONES
+    pedidas = list(dict.fromkeys(pedidas))
+    return await respuesta_json(
+        snapshot, ("tablero", *pedidas), lambda: construir_tablero(snapshot, pedidas), cabeceras
     )
 
-    return {
-        "graficos": {
-            "grafico_1": fig1.to_json(),
-            "grafico_2": fig2.to_json(),
-            "grafico_3": fig3.to_json(),
-            "grafico_4": fig4.to_json(),
-            "grafico_5": fig5.to_json() if fig5 else None,
-            "grafico_6": fig6.to_json() if fig6 else None,
-            "grafico_7": fig7.to_json() if fig7 else None,
-        }
-    }
+@app.get("/metricas-principales")
+async def obtener_metricas(request: Request, authorization: str = Header(...)):
+    validar_contraseña(authorization)
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
+    return await respuesta_json(snapshot, ("metricas",), lambda: seccion(snapshot, "metricas"), cabeceras)
+
+@app.get("/datos-graficos")
+async def obtener_datos_graficos(
+    request: Request,
+    authorization: str = Header(...),
+    formato: str = Query("datos", pattern="^(datos|plotly)$")
+):
+    """Series agregadas por gráfico; `formato=plotly` devuelve las figuras completas como antes."""
+    validar_contraseña(authorization)
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
+    nombre = "graficos_plotly" if formato == "plotly" else "graficos"
+    return await respuesta_json(snapshot, (nombre,), lambda: {"graficos": seccion(snapshot, nombre)}, cabeceras)
+
+@app.get("/agregaciones")
+async def obtener_agregaciones(
+    request: Request,
+    response: Response,
+    authorization: str = Header(...),
+    dimensiones: list[str] = Query([]),
+    metricas: list[str] = Query(["conteo"])
+):
+    """Group-by sobre el dataset procesado, p. ej. `?dimensiones=Industria&metricas=conteo&metricas=tasa_aprobacion`."""
+    validar_contraseña(authorization)
+    try:
+        validar_consulta(dimensiones, metricas)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    snapshot = await obtener_snapshot()
+    response.headers.update(verificar_cache(request, snapshot))
+    return await trabajos.ejecutar(consultar, snapshot, dimensiones, metricas)
 
 @app.post("/buscar-proyecto")
 async def buscar_proyecto(request: ProjectRequest, authorization: str = Header(...)):   
+    """Búsqueda por nombre sin distinguir tildes ni mayúsculas, de la coincidencia más cercana a la más lejana."""
     validar_contraseña(authorization)
-    df = cargar_y_procesar_datos()
+    snapshot = await obtener_snapshot()
 
-    if "Nombre del Proyecto" not in df.columns:
+    if "Nombre del Proyecto" not in snapshot.df.columns:
         raise HTTPException(status_code=400, detail="Columna 'Nombre del Proyecto' no encontrada")
 
-    df = df.fillna("")
-    resultados = df[df["Nombre del Proyecto"].str.contains(request.nombre, case=False, na=False)]
+    try:
+        resultados = await trabajos.ejecutar(buscar_proyectos, snapshot, request.nombre, request.limite, request.campos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    if resultados.empty:
+    if not resultados:
         raise HTTPException(status_code=404, detail="Proyecto no encontrado")
 
-    return {"proyectos": resultados.replace({np.nan: None}).to_dict(orient="records")}
+    return {"proyectos": resultados}
+
+@app.get("/buscar-proyecto/sugerencias")
+async def sugerir_proyectos(
+    request: Request,
+    response: Response,
+    authorization: str = Header(...),
+    q: str = Query(..., max_length=200),
+    limite: int = Query(8, ge=1, le=50),
+    campos: list[str] = Query(CAMPOS_SUGERENCIAS)
+):
+    """Autocompletado para el buscador: pocos resultados y pocos campos."""
+    validar_contraseña(authorization)
+    snapshot = await obtener_snapshot()
+    response.headers.update(verificar_cache(request, snapshot))
+    try:
+        return {"proyectos": await trabajos.ejecutar(buscar_proyectos, snapshot, q, limite, campos)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/proyectos")
-async def obtener_proyectos(authorization: str = Header(...)):
+async def obtener_proyectos(
+    request: Request,
+    response: Response,
+    authorization: str = Header(...),
+    limite: int | None = Query(None, ge=1, le=500),
+    desplazamiento: int = Query(0, ge=0),
+    orden: str | None = Query(None),
+    aprobados_primero: bool = Query(False),
+    segmento: str | None = Query(None),
+    industria: str | None = Query(None),
+    aprobado: str | None = Query(None, pattern="^(Sí|No)$"),
+    campos: str | None = Query(None)
+):
+    """Proyectos paginados, p. ej. `?limite=10&orden=-Puntaje Total&aprobado=Sí&campos=Nombre del Proyecto,Puntaje Total`."""
     validar_contraseña(authorization)
-    df = cargar_y_procesar_datos()
-    return {
-        "proyectos": df[[
-            "Nombre del Proyecto", "Aprobado", "Puntaje TRL 1-3",
-            "Puntaje TRL 4-7", "Puntaje TRL 8-9", "Puntaje Total",
-            "Segmento TRL", "Industria", "Insights"
-        ]].to_dict(orient="records")
-    }
+    snapshot = await obtener_snapshot()
+    response.headers.update(verificar_cache(request, snapshot))
+    try:
+        return await trabajos.ejecutar(
+            pagina_proyectos, snapshot, limite, desplazamiento, orden, aprobados_primero,
+            filtros={"segmento": segmento, "industria": industria, "aprobado": aprobado},
+            campos=[c.strip() for c in campos.split(",") if c.strip()] if campos else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/proyecto/{id}")
+async def obtener_proyecto(
+    request: Request,
+    id: int,
+    authorization: str = Header(...),
+    campos: str | None = Query(None)
+):
+    """Detalle de un proyecto por su `id` de Gravity Forms."""
+    validar_contraseña(authorization)
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
+    campos = [c.strip() for c in campos.split(",") if c.strip()] if campos else CAMPOS_DETALLE
+
+    def detalle_json():
+        proyecto = detalle_proyecto(snapshot, id, campos)
+        return None if proyecto is None else a_json(proyecto)
 
+    try:
+        contenido = await trabajos.ejecutar(detalle_json)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if contenido is None:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+    return Response(contenido, media_type="application/json", headers=cabeceras)
+
+@app.get("/proyecto/{id}/reporte", response_class=HTMLResponse)
+async def generar_reporte_proyecto_por_id(request: Request, id: int, auth: str = Query(...)):
+    validar_auth_reporte(auth)
+
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
+    posicion = proyectos_de(snapshot).posicion(id)
+    if posicion is None:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+
+    html = await trabajos.ejecutar(renderizador.reporte_proyecto, snapshot, posicion, request)
+    return HTMLResponse(html, headers=cabeceras)
 
 @app.get("/reporte-proyecto/{nombre}", response_class=HTMLResponse)
 async def generar_reporte_proyecto(
@@ -223,150 +375,115 @@ async def generar_reporte_proyecto(
     nombre: str,
     auth: str = Query(...)
 ):
-    try:
-        decoded = base64.b64decode(auth).decode("utf-8")
-        _, password = decoded.split(":", 1)
-
-        # Usar la misma lógica de limpieza que en los otros reportes
-        password_limpia = password.strip().replace("\u00A0", " ").replace("\u200B", "")
-        esperado = APP_PASSWORD.replace("\u00A0", " ").replace("\u200B", "")
+    """Reporte por nombre; se mantiene para enlaces antiguos, los nuevos usan `/proyecto/{id}/reporte`."""
+    validar_auth_reporte(auth)
+
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
+    # Nombre exacto primero; si no, la primera fila que lo contenga (comportamiento anterior)
+    nombre = unquote(nombre)
+    ids = proyectos_de(snapshot).ids(nombre)
+    posicion = proyectos_de(snapshot).posicion(ids[0]) if ids else buscar_por_nombre(snapshot, nombre)
+    if posicion is None:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
 
-        if password_limpia != esperado:
-            raise HTTPException(status_code=401, detail="Credenciales inválidas")
+    html = await trabajos.ejecutar(renderizador.reporte_proyecto, snapshot, posicion, request)
+    return HTMLResponse(html, headers=cabeceras)
 
-    except Exception as e:
-        raise HTTPException(status_code=401, detail="Error en autenticación")
+@app.get("/reportes-proyectos", response_class=StreamingResponse)
+async def descargar_reportes_proyectos(
+    request: Request,
+    auth: str = Query(...),
+    aprobado: str | None = Query(None, pattern="^(Sí|No)$"),
+    segmento: str | None = Query(None),
+    industria: str | None = Query(None),
+    tarea: str | None = Query(None, pattern=r"^[0-9a-f]{12}$")
+):
+    """ZIP con el reporte HTML de cada proyecto (o de los filtrados), enviado a medida que se genera.
+
+    `tarea` es el id que devolvió `POST /reportes-proyectos/exportaciones`; con
+    él se consulta el avance en `/reportes-proyectos/progreso/{tarea}`.
+    """
+    validar_auth_reporte(auth)
+    snapshot = await obtener_snapshot()
+    posiciones = await trabajos.ejecutar(
+        posiciones_proyectos, snapshot, filtros={"aprobado": aprobado, "segmento": segmento, "industria": industria}
+    )
+    if len(posiciones) == 0:
+        raise HTTPException(status_code=404, detail="No hay proyectos para los filtros indicados")
 
-    df = cargar_y_procesar_datos()
-    nombre_decodificado = unquote(nombre)
+    exportacion = exportaciones.iniciar(tarea or exportaciones.reservar().id, len(posiciones))
+    if exportacion is None:
+        raise HTTPException(status_code=404, detail="Exportación no encontrada o ya iniciada")
+    return StreamingResponse(
+        zip_reportes(renderizador, snapshot, posiciones, request, exportacion, trabajos),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": "attachment; filename=reportes_proyectos.zip",
+            "X-Tarea-Id": exportacion.id,
+        }
+    )
 
-    proyecto = df[df["Nombre del Proyecto"].str.contains(re.escape(nombre_decodificado), case=False, na=False)]
-    if proyecto.empty:
-        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+@app.post("/reportes-proyectos/exportaciones", status_code=201)
+async def reservar_exportacion(authorization: str = Header(...)):
+    """Id para una descarga de `/reportes-proyectos`, generado aquí para que nadie reutilice otro."""
+    validar_contraseña(authorization)
+    return exportaciones.reservar().a_dict()
 
-    proyecto = proyecto.iloc[0]
-    insights = generar_insights(proyecto)
-
-    context = {
-        "request": request,
-        "fecha_generacion": datetime.now().strftime("%d/%m/%Y %H:%M"),
-        "nombre_proyecto": proyecto["Nombre del Proyecto"],
-        "aprobado": proyecto["Aprobado"],
-        "nivel_trl": proyecto["Nivel TRL"],
-        "segmento_trl": proyecto["Segmento TRL"],
-        "docente_acompanante": "Sí" if proyecto["Docente Acompañante"] else "No",
-        "ubicacion": proyecto.get("Ubicación", "No especificada"),
-        "nivel_ingles": proyecto.get("Nivel de Inglés", "No especificado"),
-        "trl_1_3": proyecto["Puntaje TRL 1-3"],
-        "trl_4_7": proyecto["Puntaje TRL 4-7"],
-        "trl_8_9": proyecto["Puntaje TRL 8-9"],
-        "insights": insights
-    }
-    return templates.TemplateResponse("reports/reporte_template.html", context)
+@app.get("/reportes-proyectos/progreso/{tarea}")
+async def progreso_reportes_proyectos(tarea: str, authorization: str = Header(...)):
+    validar_contraseña(authorization)
+    exportacion = exportaciones.obtener(tarea)
+    if exportacion is None:
+        raise HTTPException(status_code=404, detail="Exportación no encontrada")
+    return exportacion.a_dict()
 
 @app.get("/insights-generales")
-async def obtener_insights_generales(authorization: str = Header(...)):
+async def obtener_insights_generales(request: Request, authorization: str = Header(...)):
     validar_contraseña(authorization)
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
     try:
-        df = cargar_y_procesar_datos()
-        df["Puntaje Total"] = df["Puntaje TRL 1-3"] + df["Puntaje TRL 4-7"] + df["Puntaje TRL 8-9"]
-
-        total = len(df)
-        aprobados = int((df["Aprobado"] == "Sí").sum())
-        porcentaje = round((aprobados / total) * 100, 1) if total > 0 else 0.0
-
-        distribucion = df["Segmento TRL"].value_counts().to_dict()
-        distribucion = {str(k): int(v) for k, v in distribucion.items()}
-
-        promedios = {
-            "TRL 1-3": round(df["Puntaje TRL 1-3"].mean(), 1),
-            "TRL 4-7": round(df["Puntaje TRL 4-7"].mean(), 1),
-            "TRL 8-9": round(df["Puntaje TRL 8-9"].mean(), 1),
-            "Total": round(df["Puntaje Total"].mean(), 1)
-        }
-
-        top_rows = df.nlargest(3, "Puntaje Total")[["Nombre del Proyecto", "Puntaje Total"]]
-        top_proyectos = [
-            {"Nombre del Proyecto": str(row["Nombre del Proyecto"]), "Puntaje Total": round(float(row["Puntaje Total"]), 1)}
-            for _, row in top_rows.iterrows()
-        ]
-
-        insights = [
-            f"📊 {aprobados} de {total} proyectos están aprobados ({porcentaje}%)",
-            f"🏆 Proyecto con mayor puntaje: {top_proyectos[0]['Nombre del Proyecto']} ({top_proyectos[0]['Puntaje Total']} pts)" if top_proyectos else "No hay proyectos destacados",
-            f"🔍 Distribución TRL: {distribucion.get('TRL 1-3', 0)} inicial, {distribucion.get('TRL 4-7', 0)} en desarrollo, {distribucion.get('TRL 8-9', 0)} listos",
-            f"📈 Promedios: TRL 1-3: {promedios['TRL 1-3']}, TRL 4-7: {promedios['TRL 4-7']}, TRL 8-9: {promedios['TRL 8-9']}",
-            "💡 Recomendación: " + ("Mentoría a proyectos iniciales" if distribucion.get('TRL 1-3', 0) > distribucion.get('TRL 8-9', 0) else "Preparar implementación")
-        ]
-
-        return jsonable_encoder({
-            "metricas": {
-                "total_proyectos": total,
-                "aprobados": aprobados,
-                "porcentaje_aprobados": porcentaje,
-                "distribucion_trl": distribucion,
-                "promedios": promedios
-            },
-            "top_proyectos": top_proyectos,
-            "insights": insights
-        })
+        return await respuesta_json(snapshot, ("insights",), lambda: seccion(snapshot, "insights"), cabeceras)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al generar insights: {str(e)}")
 
 @app.get("/reporte-aprobados", response_class=StreamingResponse)
-async def generar_reporte_aprobados():
-    df = cargar_y_procesar_datos()
-    aprobados = df[df["Aprobado"] == "Sí"]
-
-    if aprobados.empty:
+async def generar_reporte_aprobados(request: Request, formato: str = Query("xlsx", pattern="^(xlsx|csv)$")):
+    """Excel de aprobados, generado una vez por versión del dataset; `formato=csv` lo envía por bloques."""
+    snapshot = await obtener_snapshot()
+    # Primero la revalidación: el ETag solo depende de la versión, así que un 304 no toca el frame
+    cabeceras = verificar_cache(request, snapshot)
+
+    # La máscara de aprobados queda guardada en el snapshot, como los filtros de /proyectos
+    posiciones = await trabajos.ejecutar(posiciones_proyectos, snapshot, filtros={"aprobado": "Sí"})
+    if len(posiciones) == 0:
         raise HTTPException(status_code=404, detail="No hay proyectos aprobados.")
 
-    excel_file = generar_excel_aprobados(aprobados)
+    def materializar_aprobados():
+        return materializar(snapshot.df.iloc[posiciones], snapshot.motor_insights)
 
-    return StreamingResponse(
-        excel_file,
+    if formato == "csv":
+        aprobados = await trabajos.ejecutar(materializar_aprobados)
+        # Starlette recorre el generador síncrono fuera del event loop
+        cabeceras["Content-Disposition"] = "attachment; filename=proyectos_aprobados.csv"
+        return StreamingResponse(generar_csv_aprobados(aprobados), media_type="text/csv; charset=utf-8", headers=cabeceras)
+
+    def generar_excel():
+        return generar_excel_aprobados(materializar_aprobados()).getvalue()
+
+    contenido = await trabajos.ejecutar(snapshot.memo, ("excel_aprobados",), generar_excel)
+    cabeceras["Content-Disposition"] = "attachment; filename=proyectos_aprobados.xlsx"
+    return Response(
+        contenido,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": "attachment; filename=proyectos_aprobados.xlsx"
-        }
+        headers=cabeceras
     )
-    
+
 @app.get("/reporte-top10", response_class=HTMLResponse)
 async def generar_reporte_top10(request: Request, auth: str = Query(...)):
-    try:
-        decoded = base64.b64decode(auth).decode("utf-8")
-        _, password = decoded.split(":", 1)
-
-        password_limpia = password.strip().replace("\u00A0", " ").replace("\u200B", "")
-        esperado = APP_PASSWORD.replace("\u00A0", " ").replace("\u200B", "")
-
-        if password_limpia != esperado:
-            raise HTTPException(status_code=401, detail="Credenciales inválidas")
-    except:
-        raise HTTPException(status_code=401, detail="Error en autenticación")
+    validar_auth_reporte(auth)
 
-    df = cargar_y_procesar_datos()
-    top10 = df.sort_values(by="Puntaje Total", ascending=False).head(10)
-
-    proyectos_contexto = []
-    for _, proyecto in top10.iterrows():
-        proyectos_contexto.append({
-            "nombre_proyecto": proyecto["Nombre del Proyecto"],
-            "aprobado": proyecto["Aprobado"],
-            "nivel_trl": proyecto["Nivel TRL"],
-            "segmento_trl": proyecto["Segmento TRL"],
-            "docente_acompanante": "Sí" if proyecto["Docente Acompañante"] else "No",
-            "ubicacion": proyecto.get("Ubicación", "No especificada"),
-            "nivel_ingles": proyecto.get("Nivel de Inglés", "No especificado"),
-            "trl_1_3": proyecto["Puntaje TRL 1-3"],
-            "trl_4_7": proyecto["Puntaje TRL 4-7"],
-            "trl_8_9": proyecto["Puntaje TRL 8-9"],
-            "puntaje_total": proyecto["Puntaje Total"],
-            "insights": generar_insights(proyecto),
-        })
-
-    return templates.TemplateResponse("reports/reporte_top10.html", {
-        "request": request,
-        "fecha_generacion": datetime.now().strftime("%d/%m/%Y %H:%M"),
-        "proyectos": proyectos_contexto
-    })
+    snapshot = await obtener_snapshot()
+    cabeceras = verificar_cache(request, snapshot)
+    return HTMLResponse(await trabajos.ejecutar(renderizador.reporte_top10, snapshot, request), headers=cabeceras)
@@ -0,0 +1,323 @@
+# benchmarks/ejecutar.py
+"""Tiempos y memoria del pipeline y de los endpoints sobre datasets sintéticos.
+
+Cada tamaño corre en un proceso aparte, dentro de un directorio de trabajo
+temporal con el dataset de `generar_datos.py`, así los archivos del repo no se
+tocan y la memoria de un tamaño no se mezcla con la del siguiente. Uso:
+
+    python benchmarks/ejecutar.py 1k 10k --salida benchmarks/resultados/actual.json
+    python benchmarks/ejecutar.py 1k 10k --comparar benchmarks/resultados/anterior.json
+"""
+import argparse
+import base64
+import gc
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generar_datos  # noqa: E402
+
+FORMATO_RESULTADOS = 1
+DIRECTORIO_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+# Archivos del repo que el directorio de trabajo enlaza tal cual
+ENLACES = ["diccionario.csv", "insights_config.json", "templates", "front", "assets"]
+CLAVE = "benchmark"
+TOLERANCIA = 0.2
+
+# (nombre, método, ruta, cuerpo); {id} y {auth} se completan con un proyecto del dataset
+ENDPOINTS = [
+    ("metricas", "GET", "/metricas-principales", None),
+    ("datos_graficos", "GET", "/datos-graficos", None),
+    ("datos_graficos_plotly", "GET", "/datos-graficos?formato=plotly", None),
+    ("agregaciones", "GET", "/agregaciones?dimensiones=Industria&metricas=conteo&metricas=tasa_aprobacion", None),
+    ("proyectos", "GET", "/proyectos?limite=50&orden=-Puntaje Total&aprobado=Sí", None),
+    ("sugerencias", "GET", "/buscar-proyecto/sugerencias?q=robot sol", None),
+    ("buscar", "POST", "/buscar-proyecto", {"nombre": "sensor inteligente", "limite": 20}),
+    ("proyecto", "GET", "/proyecto/{id}", None),
+    ("reporte_proyecto", "GET", "/proyecto/{id}/reporte?auth={auth}", None),
+    ("reporte_top10", "GET", "/reporte-top10?auth={auth}", None),
+    ("insights", "GET", "/insights-generales", None),
+    ("dashboard", "GET", "/dashboard", None),
+    ("excel_aprobados", "GET", "/reporte-aprobados", None),
+    ("csv_aprobados", "GET", "/reporte-aprobados?formato=csv", None),
+    ("zip_reportes", "GET", "/reportes-proyectos?auth={auth}&aprobado=Sí&segmento=TRL 8-9", None),
+    ("estado_servidor", "GET", "/estado-servidor", None),
+]
+
+
+def _resumen(tiempos):
+    return {
+        "segundos": [round(t, 6) for t in tiempos],
+        "mediana_s": round(statistics.median(tiempos), 6),
+        "minimo_s": round(min(tiempos), 6),
+    }
+
+
+def medir(funcion, repeticiones, memoria=True):
+    """Corre `funcion` `repeticiones` veces y una más bajo tracemalloc para el pico de memoria."""
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    resultado = _resumen(tiempos)
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        funcion()
+        resultado["pico_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return resultado
+
+
+def _preparar_directorio(directorio, ruta_dataset):
+    for nombre in ENLACES:
+        os.symlink(os.path.join(RAIZ, nombre), os.path.join(directorio, nombre))
+    os.symlink(ruta_dataset, os.path.join(directorio, "datos_formularios.parquet"))
+    os.environ.update({
+        "APP_PASSWORD": CLAVE,
+        "JINJA_CACHE_DIR": os.path.join(directorio, "jinja"),
+        "BLOQUEOS_DIR": os.path.join(directorio, ".bloqueos"),
+        "TAREAS_DIR": os.path.join(directorio, "tareas"),
+        "ACTUALIZACION_INTERVALO_MIN": "0",
+    })
+    os.chdir(directorio)
+
+
+def medir_etapas(repeticiones, omitir, memoria):
+    """Funciones del pipeline llamadas directamente, sin pasar por la API."""
+    from almacen_datos import AlmacenDatos
+    from data_loader import cargar_diccionario
+    from funciones import generar_csv_aprobados, generar_excel_aprobados
+    from insights import cargar_motor, materializar
+    from procesamiento import procesar_datos_completos
+    from visualizaciones import datos_graficos, graficos_generales
+
+    almacen = AlmacenDatos()
+    crudo = almacen.cargar_crudos()
+    diccionario = cargar_diccionario()
+    motor = cargar_motor()
+    procesado = procesar_datos_completos(crudo, diccionario, motor)
+    aprobados = materializar(procesado[procesado["Aprobado"] == "Sí"], motor)
+
+    etapas = {
+        "ingesta": almacen.cargar_crudos,
+        "procesar_datos_completos": lambda: procesar_datos_completos(crudo, diccionario, motor),
+        "insights_evaluar": lambda: motor.evaluar(procesado),
+        "insights_textos": lambda: materializar(procesado, motor),
+        "graficos_generales": lambda: graficos_generales(procesado, "Industria", "Nivel de Inglés", "Ubicación"),
+        "datos_graficos": lambda: datos_graficos(procesado),
+        "generar_excel_aprobados": lambda: generar_excel_aprobados(aprobados),
+        "generar_csv_aprobados": lambda: sum(len(bloque) for bloque in generar_csv_aprobados(aprobados)),
+    }
+    return {
+        nombre: medir(funcion, repeticiones, memoria)
+        for nombre, funcion in etapas.items() if nombre not in omitir
+    }
+
+
+def medir_api(repeticiones, omitir):
+    """Snapshot y endpoints a través de un TestClient: la primera llamada es en frío."""
+    from fastapi.testclient import TestClient
+
+    import backend_api
+    from almacen_datos import AlmacenDatos
+
+    inicio = time.perf_counter()
+    snapshot = backend_api.almacen.snapshot()
+    resultado = {"snapshot": {
+        "procesar_s": round(time.perf_counter() - inicio, 6),
+        "memoria_bytes": snapshot.memoria(),
+    }}
+    # Otro proceso (o un reinicio) solo mapea el archivo procesado que dejó el primero
+    inicio = time.perf_counter()
+    AlmacenDatos().snapshot()
+    resultado["snapshot"]["cargar_persistido_s"] = round(time.perf_counter() - inicio, 6)
+
+    cliente = TestClient(backend_api.app)
+    auth = base64.b64encode(f"usuario:{CLAVE}".encode()).decode()
+    cabeceras = {"Authorization": f"Basic {auth}"}
+    valores = {"id": int(snapshot.df["id"].iloc[0]), "auth": auth}
+
+    endpoints = {}
+    for nombre, metodo, ruta, cuerpo in ENDPOINTS:
+        if nombre in omitir:
+            continue
+        url = ruta.format(**valores)
+
+        def pedir():
+            return cliente.request(metodo, url, headers=cabeceras, json=cuerpo)
+
+        inicio = time.perf_counter()
+        respuesta = pedir()
+        frio = time.perf_counter() - inicio
+        endpoints[nombre] = {
+            "metodo": metodo,
+            "ruta": ruta,
+            "estado": respuesta.status_code,
+            "bytes": len(respuesta.content),
+            "frio_s": round(frio, 6),
+            **medir(pedir, repeticiones, memoria=False),
+        }
+    resultado["endpoints"] = endpoints
+    return resultado
+
+
+def medir_tamano(nombre, repeticiones, omitir, memoria, directorio_datos):
+    filas = generar_datos.TAMANOS.get(nombre) or int(nombre)
+    ruta = generar_datos.ruta_dataset(nombre, directorio_datos)
+    if not os.path.exists(ruta):
+        import pandas as pd
+        ruta = generar_datos.escribir(nombre, filas, pd.read_csv(os.path.join(RAIZ, "diccionario.csv")), directorio_datos)
+
+    # Snapshots, bloqueos y bytecode de la corrida se borran al terminar
+    with tempfile.TemporaryDirectory(prefix="bench_trl_") as directorio:
+        anterior = os.getcwd()
+        _preparar_directorio(directorio, ruta)
+        try:
+            resultado = {"filas": filas, "etapas": medir_etapas(repeticiones, omitir, memoria)}
+            resultado.update(medir_api(repeticiones, omitir))
+        finally:
+            os.chdir(anterior)
+    resultado["rss_max_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return resultado
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _entorno():
+    import numpy
+    import pandas
+    import pyarrow
+    return {
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def comparar(actual, anterior, tolerancia=TOLERANCIA):
+    """Mediciones cuya mediana creció más que `tolerancia` respecto de `anterior`."""
+    regresiones = []
+    for tamano, datos in actual["tamanos"].items():
+        previos = anterior.get("tamanos", {}).get(tamano)
+        if previos is None:
+            continue
+        for grupo in ("etapas", "endpoints"):
+            for nombre, medicion in datos.get(grupo, {}).items():
+                previa = previos.get(grupo, {}).get(nombre)
+                if not previa or not previa.get("mediana_s"):
+                    continue
+                razon = medicion["mediana_s"] / previa["mediana_s"]
+                if razon > 1 + tolerancia:
+                    regresiones.append({
+                        "tamano": tamano, "grupo": grupo, "nombre": nombre,
+                        "anterior_s": previa["mediana_s"], "actual_s": medicion["mediana_s"],
+                        "razon": round(razon, 2),
+                    })
+    return regresiones
+
+
+def _imprimir(resultados):
+    for tamano, datos in resultados["tamanos"].items():
+        print(f"\n== {tamano} ({datos['filas']} filas) ==")
+        print(f"  snapshot: procesar {datos['snapshot']['procesar_s']:.3f} s, "
+              f"cargar persistido {datos['snapshot']['cargar_persistido_s']:.3f} s, "
+              f"{datos['snapshot']['memoria_bytes'] / 2**20:.1f} MiB")
+        for nombre, medicion in datos["etapas"].items():
+            pico = f", pico {medicion['pico_bytes'] / 2**20:.1f} MiB" if "pico_bytes" in medicion else ""
+            print(f"  {nombre:<28} {medicion['mediana_s']:.4f} s{pico}")
+        for nombre, medicion in datos["endpoints"].items():
+            print(f"  {medicion['metodo']} {nombre:<24} {medicion['estado']} "
+                  f"frío {medicion['frio_s']:.4f} s, mediana {medicion['mediana_s']:.4f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("tamanos", nargs="*", default=["1k", "10k"],
+                        help=f"{', '.join(generar_datos.TAMANOS)} o una cantidad de filas")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--omitir", nargs="*", default=[], help="etapas o endpoints a no medir")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir el pico con tracemalloc")
+    parser.add_argument("--datos", default=generar_datos.DIRECTORIO_DATOS)
+    parser.add_argument("--salida", help="JSON de resultados (por defecto benchmarks/resultados/<commit>.json)")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    parser.add_argument("--un-tamano", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.un_tamano:
+        # Proceso hijo: mide un tamaño y escribe el resultado en `--salida`
+        resultado = medir_tamano(args.un_tamano.lower(), args.repeticiones, set(args.omitir),
+                                 not args.sin_memoria, args.datos)
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f)
+        return
+
+    commit = _commit()
+    resultados = {
+        "formato": FORMATO_RESULTADOS,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "entorno": _entorno(),
+        "repeticiones": args.repeticiones,
+        "tamanos": {},
+    }
+    for tamano in args.tamanos:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as temporal:
+            ruta_parcial = temporal.name
+        comando = [sys.executable, os.path.abspath(__file__), "--un-tamano", tamano, "--salida", ruta_parcial,
+                   "--repeticiones", str(args.repeticiones), "--datos", os.path.abspath(args.datos)]
+        if args.omitir:
+            comando += ["--omitir", *args.omitir]
+        if args.sin_memoria:
+            comando.append("--sin-memoria")
+        print(f"Midiendo {tamano}...", flush=True)
+        subprocess.run(comando, check=True)
+        with open(ruta_parcial, encoding="utf-8") as f:
+            resultados["tamanos"][tamano.lower()] = json.load(f)
+        os.remove(ruta_parcial)
+
+    nombre = commit or datetime.now().strftime("%Y%m%d%H%M%S")
+    salida = args.salida or os.path.join(DIRECTORIO_RESULTADOS, f"{nombre}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    _imprimir(resultados)
+    print(f"\nResultados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regresiones = comparar(resultados, json.load(f), args.tolerancia)
+        for r in regresiones:
+            print(f"REGRESIÓN {r['tamano']} {r['grupo']}/{r['nombre']}: "
+                  f"{r['anterior_s']:.4f} s -> {r['actual_s']:.4f} s (x{r['razon']})")
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# benchmarks/generar_datos.py
+"""Datasets sintéticos con el formato de `datos_formularios.csv`.
+
+Las respuestas evaluadas se toman de `diccionario.csv` y los campos 12 y 13
+tienen textos largos como los reales. Uso:
+
+    python benchmarks/generar_datos.py 1k 10k 100k 1m --salida benchmarks/datos
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from motor_puntajes import CAMPOS_POR_PREGUNTA  # noqa: E402
+
+TAMANOS = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DIRECTORIO_DATOS = os.path.join(RAIZ, "benchmarks", "datos")
+
+# Orden exacto de columnas de la API de Gravity Forms (formulario 9)
+COLUMNAS = [
+    "id", "form_id", "post_id", "date_created", "date_updated", "is_starred", "is_read", "ip",
+    "source_url", "user_agent", "currency", "payment_status", "payment_date", "payment_amount",
+    "payment_method", "transaction_id", "is_fulfilled", "created_by", "transaction_type", "status",
+    "source_id", "1", "3", "4", "12", "13", "14", "15", "20", "21", "29", "23", "25", "26", "17",
+    "30", "19", "38", "40", "42", "44", "60", "59", "51", "61", "52", "57", "64", "65", "66", "68",
+    "70", "28", "45", "55", "48", "50", "56", "67", "62", "63", "69",
+]
+# Campos del formulario que llegan siempre vacíos
+COLUMNAS_VACIAS = [
+    "post_id", "payment_status", "payment_date", "payment_amount", "payment_method", "transaction_id",
+    "is_fulfilled", "transaction_type", "28", "45", "55", "48", "50", "56", "67", "62", "63", "69",
+]
+
+INDUSTRIAS = [
+    "Innovación en Ingeniería y Tecnología", "Sostenibilidad y Medio Ambiente",
+    "Tecnologías Digitales y de la Información", "Ciencias de la Salud y Biotecnología",
+    "Proyectos Sociales y Comunitarios", "Innovación y Gestión Empresarial",
+]
+ETAPAS = ["Idea", "Prototipo", "MVP"]
+CARRERAS = [
+    "Arquitectura", "Ingeniería Ambiental", "Ingeniería Industrial", "Ingeniería de Sistemas e Informática",
+    "Ingeniería Mecánica", "Ingeniería Mecatrónica", "Ingeniería Civil", "Derecho", "Psicología",
+    "Administración y Marketing", "Tecnología Médica", "Enfermería",
+]
+NIVELES_INGLES = ["Básico", "Intermedio", "Avanzado"]
+CIUDADES = ["Huancayo", "Arequipa", "Lima", "Cusco"]
+MEDIOS = ["Por un Docente", "Por un amigo", "Correo", "Red social", "TV"]
+URLS = [
+    "https://fablab.ucontinental.edu.pe/fellowship/",
+    "https://fablab.ucontinental.edu.pe/fellowship/?utm_medium=paid&utm_source=an&utm_id=120220274960480245_v2_s04",
+    "https://fablab.ucontinental.edu.pe/fablab-fellowship/",
+]
+AGENTES = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 18_3 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.3 Mobile/15E148 Safari/604.1",
+]
+NOMBRES = ["Ana", "Luis", "María", "José", "Lucía", "Carlos", "Rosa", "Jorge", "Sofía", "Miguel", "Valeria", "Diego"]
+APELLIDOS = ["Quispe", "Huamán", "Rojas", "Mamani", "Flores", "Torres", "Gutiérrez", "Ochoa", "Vargas", "Ramos"]
+PALABRAS_PROYECTO = [
+    "Sistema", "Plataforma", "Dispositivo", "Robot", "Sensor", "Aplicación", "Prototipo", "Red",
+    "inteligente", "solar", "portátil", "modular", "de monitoreo", "de reciclaje", "de riego",
+    "para agricultura", "para personas con discapacidad", "de purificación de agua", "educativo", "textil",
+]
+FRASES = [
+    "El proyecto propone una solución de bajo costo para comunidades de la región.",
+    "Se basa en sensores conectados que envían datos a una plataforma web en tiempo real.",
+    "La propuesta surge de una necesidad identificada durante el trabajo de campo.",
+    "Busca reducir el impacto ambiental de los procesos productivos locales.",
+    "El equipo ha realizado entrevistas con usuarios potenciales para validar el problema.",
+    "Se plantea escalar la solución a otras ciudades en una segunda etapa.",
+    "El diseño prioriza materiales reciclados y componentes de fácil reemplazo.",
+    "La validación inicial mostró una mejora significativa frente a las alternativas actuales.",
+    "Se requiere financiamiento para completar las pruebas en un entorno real.",
+    "La iniciativa articula a estudiantes de distintas carreras y a un docente asesor.",
+]
+# Textos distintos de los campos 12 y 13; las filas los reparten para no ocupar memoria por fila
+TEXTOS_DISTINTOS = 5_000
+PROPORCION_SIN_RESPUESTAS = 0.28
+
+
+def _respuestas(diccionario):
+    """Respuestas posibles de cada campo evaluado, según `diccionario.csv`."""
+    respuestas = {}
+    for pregunta, grupo in diccionario.groupby("Pregunta", sort=False):
+        campo = CAMPOS_POR_PREGUNTA.get(str(pregunta).strip())
+        if campo is not None:
+            respuestas[campo] = grupo["Respuesta"].astype(str).str.strip().unique()
+    return respuestas
+
+
+def _textos(rng, cantidad, frases_por_texto):
+    return np.array([
+        " ".join(rng.choice(FRASES, size=frases_por_texto)) for _ in range(cantidad)
+    ], dtype=object)
+
+
+def generar(filas, diccionario, semilla=0):
+    """DataFrame de `filas` entradas con las columnas y tipos de `datos_formularios.csv`."""
+    rng = np.random.default_rng(semilla)
+    elegir = lambda opciones, p=None: rng.choice(np.array(opciones, dtype=object), size=filas, p=p)
+
+    inicio = datetime(2025, 3, 1).timestamp()
+    creado = pd.to_datetime(inicio + np.sort(rng.uniform(0, 120 * 86400, filas)), unit="s")
+    actualizado = creado + pd.to_timedelta(rng.integers(0, 3 * 86400, filas), unit="s")
+    nombres = elegir(NOMBRES)
+    apellidos = elegir(APELLIDOS) + " " + elegir(APELLIDOS)
+
+    datos = {
+        "id": np.arange(filas, 0, -1, dtype=np.int64),
+        "form_id": np.full(filas, 9, dtype=np.int64),
+        "date_created": creado.strftime("%Y-%m-%d %H:%M:%S"),
+        "date_updated": actualizado.strftime("%Y-%m-%d %H:%M:%S"),
+        "is_starred": np.zeros(filas, dtype=np.int64),
+        "is_read": (rng.random(filas) < 0.02).astype(np.int64),
+        "ip": pd.Series(rng.integers(1, 255, (filas, 4)).astype(str).tolist()).str.join("."),
+        "source_url": elegir(URLS),
+        "user_agent": elegir(AGENTES),
+        "currency": np.full(filas, "USD", dtype=object),
+        "created_by": np.where(rng.random(filas) < 0.02, 411.0, np.nan),
+        "status": np.full(filas, "active", dtype=object),
+        "source_id": np.where(rng.random(filas) < 0.75, 55569.0, np.nan),
+        "1": (elegir(PALABRAS_PROYECTO[:8]) + " " + elegir(PALABRAS_PROYECTO[8:])
+              + " " + pd.Series(rng.integers(1, max(2, filas // 3), filas)).astype(str).to_numpy()),
+        "3": elegir(INDUSTRIAS, [0.38, 0.22, 0.14, 0.11, 0.09, 0.06]),
+        "4": elegir(ETAPAS, [0.45, 0.5, 0.05]),
+        "12": _textos(rng, TEXTOS_DISTINTOS, 8)[rng.integers(0, TEXTOS_DISTINTOS, filas)],
+        "13": _textos(rng, TEXTOS_DISTINTOS, 7)[rng.integers(0, TEXTOS_DISTINTOS, filas)],
+        "14": rng.choice(np.arange(1, 10), size=filas, p=[0.2, 0.1, 0.22, 0.08, 0.25, 0.06, 0.05, 0.02, 0.02]),
+        "15": elegir(["SI", "NO"]),
+        "20": nombres,
+        "21": apellidos,
+        "29": pd.Series(rng.integers(10_000_000, 99_999_999, filas)).astype(str).to_numpy() + "@continental.edu.pe",
+        "23": elegir(CARRERAS),
+        "25": elegir(CARRERAS),
+        "26": rng.integers(1, 13, filas),
+        "17": np.where(rng.random(filas) < 0.02, None, elegir(NIVELES_INGLES, [0.38, 0.52, 0.1])),
+        "30": np.where(rng.random(filas) < 0.03, None, elegir(CIUDADES, [0.34, 0.29, 0.2, 0.17])),
+        "19": elegir(MEDIOS, [0.35, 0.28, 0.2, 0.15, 0.02]),
+    }
+
+    sin_respuestas = rng.random(filas) < PROPORCION_SIN_RESPUESTAS
+    for campo, opciones in _respuestas(diccionario).items():
+        datos[campo] = np.where(sin_respuestas, None, elegir(opciones))
+    for columna in COLUMNAS_VACIAS:
+        datos[columna] = np.full(filas, np.nan)
+
+    return pd.DataFrame(datos)[COLUMNAS]
+
+
+def ruta_dataset(nombre, directorio=DIRECTORIO_DATOS):
+    return os.path.join(directorio, nombre, "datos_formularios.parquet")
+
+
+def escribir(nombre, filas, diccionario, directorio=DIRECTORIO_DATOS, csv=False):
+    """Genera el dataset `nombre` y lo guarda como Parquet (y CSV si se pide); devuelve la ruta."""
+    ruta = ruta_dataset(nombre, directorio)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    df = generar(filas, diccionario)
+    df.to_parquet(ruta, index=False)
+    if csv:
+        df.to_csv(os.path.join(os.path.dirname(ruta), "datos_formularios.csv"), index=False)
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("tamanos", nargs="+", help=f"{', '.join(TAMANOS)} o una cantidad de filas")
+    parser.add_argument("--salida", default=DIRECTORIO_DATOS)
+    parser.add_argument("--diccionario", default=os.path.join(RAIZ, "diccionario.csv"))
+    parser.add_argument("--csv", action="store_true", help="también escribir datos_formularios.csv")
+    args = parser.parse_args()
+
+    diccionario = pd.read_csv(args.diccionario)
+    for nombre in args.tamanos:
+        filas = TAMANOS.get(nombre.lower()) or int(nombre)
+        ruta = escribir(nombre.lower(), filas, diccionario, args.salida, args.csv)
+        print(f"{nombre}: {filas} filas -> {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# bloqueos.py
+import os
+
+try:
+    import fcntl
+except ImportError:
+    # Sin fcntl (Windows) hay un solo proceso por despliegue: los bloqueos no hacen nada
+    fcntl = None
+
+DIRECTORIO_BLOQUEOS = os.getenv("BLOQUEOS_DIR", ".bloqueos")
+
+
+class BloqueoArchivo:
+    """Bloqueo exclusivo entre procesos (p. ej. los workers de uvicorn) sobre un archivo.
+
+    Se usa con `with` para esperar el bloqueo, o con `intentar()` para
+    tomarlo solo si está libre. El sistema lo libera si el proceso muere.
+    """
+
+    def __init__(self, nombre, directorio=DIRECTORIO_BLOQUEOS):
+        self.ruta = os.path.join(directorio, f"{nombre}.lock")
+        self._archivo = None
+
+    def _abrir(self):
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+        self._archivo = open(self.ruta, "a")
+
+    def adquirir(self):
+        self._abrir()
+        if fcntl is not None:
+            fcntl.flock(self._archivo, fcntl.LOCK_EX)
+
+    def intentar(self):
+        """Toma el bloqueo sin esperar; devuelve False si lo tiene otro proceso."""
+        self._abrir()
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(self._archivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            self._archivo.close()
+            self._archivo = None
+            return False
+
+    def liberar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def __enter__(self):
+        self.adquirir()
+        return self
+
+    def __exit__(self, *exc):
+        self.liberar()
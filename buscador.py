@@ -0,0 +1,177 @@
+# buscador.py
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from insights import materializar
+from procesamiento import COLUMNAS_FRIAS
+
+# Fracción mínima de trigramas de la consulta presentes en el nombre para una coincidencia aproximada
+SIMILITUD_MINIMA = 0.6
+
+# Orden de las coincidencias: cuanto más alto, antes aparece
+EXACTA, PREFIJO, PREFIJO_PALABRA, CONTIENE, APROXIMADA = 4, 3, 2, 1, 0
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes y con cualquier signo convertido en un solo espacio."""
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).casefold()
+    return re.sub(r"[\W_]+", " ", texto).strip()
+
+
+def trigramas(texto):
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def _trigramas_internos(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceBusqueda:
+    """Índice de nombres de proyecto: trigramas, palabras y nombres ordenados, todo normalizado.
+
+    Se construye una vez por versión del dataset; `buscar` resuelve cada tipo
+    de coincidencia con búsquedas binarias y listas de posiciones en lugar de
+    recorrer todos los nombres.
+    """
+
+    def __init__(self, nombres):
+        self.nombres = [normalizar(n) if isinstance(n, str) else "" for n in nombres]
+
+        postings = {}
+        palabras = {}
+        for posicion, nombre in enumerate(self.nombres):
+            for trigrama in trigramas(nombre) if nombre else ():
+                postings.setdefault(trigrama, []).append(posicion)
+            for palabra in set(nombre.split()):
+                palabras.setdefault(palabra, []).append(posicion)
+        self._postings = {t: np.array(p, dtype=np.int32) for t, p in postings.items()}
+        self._palabras = sorted(palabras)
+        self._posiciones_palabra = [np.array(palabras[p], dtype=np.int32) for p in self._palabras]
+
+        self._orden = np.array(sorted(range(len(self.nombres)), key=self.nombres.__getitem__), dtype=np.int32)
+        self._ordenados = [self.nombres[i] for i in self._orden]
+
+    def _rango(self, lista, prefijo):
+        return bisect.bisect_left(lista, prefijo), bisect.bisect_left(lista, prefijo + "\uffff")
+
+    def _comparten(self, grupo):
+        """Cuántos trigramas de `grupo` tiene cada fila."""
+        listas = [self._postings[t] for t in grupo if t in self._postings]
+        if not listas:
+            return np.zeros(len(self.nombres), dtype=np.int64)
+        return np.bincount(np.concatenate(listas), minlength=len(self.nombres))
+
+    def buscar(self, consulta, limite=None):
+        """Lista de (posición, clase de coincidencia, similitud), de mejor a peor."""
+        consulta = normalizar(consulta)
+        if not consulta or not self.nombres:
+            return []
+
+        clase = np.full(len(self.nombres), -1, dtype=np.int8)
+        similitud = np.zeros(len(self.nombres))
+        if len(consulta) >= 3:
+            de_consulta = trigramas(consulta)
+            similitud = self._comparten(de_consulta) / len(de_consulta)
+            clase[similitud >= SIMILITUD_MINIMA] = APROXIMADA
+
+            # Filas con todos los trigramas de la consulta: candidatas a contenerla
+            internos = _trigramas_internos(consulta)
+            candidatas = np.flatnonzero(self._comparten(internos) == len(internos))
+            contienen = [p for p in candidatas.tolist() if consulta in self.nombres[p]]
+            clase[contienen] = CONTIENE
+            if " " in consulta:
+                clase[[p for p in contienen if (" " + consulta) in (" " + self.nombres[p])]] = PREFIJO_PALABRA
+
+        if " " not in consulta:
+            inicio, fin = self._rango(self._palabras, consulta)
+            if fin > inicio:
+                clase[np.concatenate(self._posiciones_palabra[inicio:fin])] = PREFIJO_PALABRA
+
+        inicio, fin = self._rango(self._ordenados, consulta)
+        clase[self._orden[inicio:fin]] = PREFIJO
+        clase[self._orden[inicio:bisect.bisect_right(self._ordenados, consulta)]] = EXACTA
+
+        posiciones = np.flatnonzero(clase >= 0)
+        posiciones = posiciones[np.lexsort((posiciones, -similitud[posiciones], -clase[posiciones]))]
+        if limite:
+            posiciones = posiciones[:limite]
+        return [(int(p), int(clase[p]), float(similitud[p])) for p in posiciones]
+
+
+class IndiceProyectos:
+    """Posición de cada proyecto por `id` de Gravity Forms e ids por nombre normalizado."""
+
+    def __init__(self, ids, nombres):
+        self.posiciones = {}
+        self.ids_por_nombre = {}
+        for posicion, (id, nombre) in enumerate(zip(ids, nombres)):
+            if id is None or id != id:
+                continue
+            # Si un id se repitiera, vale la primera fila, igual que en la búsqueda
+            self.posiciones.setdefault(int(id), posicion)
+            self.ids_por_nombre.setdefault(normalizar(nombre) if isinstance(nombre, str) else "", []).append(int(id))
+
+    def posicion(self, id):
+        return self.posiciones.get(id)
+
+    def ids(self, nombre):
+        """Ids de los proyectos con exactamente ese nombre, sin distinguir tildes ni mayúsculas."""
+        return self.ids_por_nombre.get(normalizar(nombre), [])
+
+
+def proyectos_de(snapshot):
+    """Índice por id del snapshot, construido la primera vez que se pide."""
+    return snapshot.memo(
+        ("proyectos_por_id",),
+        lambda: IndiceProyectos(snapshot.df["id"].tolist(), snapshot.df["Nombre del Proyecto"].tolist()),
+    )
+
+
+def indice_de(snapshot):
+    """Índice de búsqueda del snapshot, construido la primera vez que se pide."""
+    return snapshot.memo(("busqueda",), lambda: IndiceBusqueda(snapshot.df["Nombre del Proyecto"].tolist()))
+
+
+def _registros(filas):
+    # Vacíos como "" también en columnas categóricas, donde `fillna("")` no se permite
+    return filas.astype(object).where(filas.notna(), "").to_dict(orient="records")
+
+
+def _validar_campos(df, campos):
+    desconocidos = [c for c in campos or [] if c not in df.columns and c not in COLUMNAS_FRIAS]
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(desconocidos)}")
+
+
+def _filas(snapshot, posiciones, campos):
+    """Registros de `posiciones`; el texto largo solo se lee si no se piden campos o si está entre ellos."""
+    if not len(posiciones):
+        return []
+    filas = snapshot.df.iloc[posiciones]
+    frias = [c for c in COLUMNAS_FRIAS if c in campos] if campos else snapshot.textos.columnas
+    if frias:
+        textos = snapshot.textos.filas(filas["id"], frias).set_axis(filas.index)
+        filas = pd.concat([filas, textos], axis=1)
+    return _registros(materializar(filas, snapshot.motor_insights, campos or None))
+
+
+def detalle_proyecto(snapshot, id, campos=None):
+    """Registro del proyecto con ese `id` (solo `campos` si se indican), o None si no existe."""
+    _validar_campos(snapshot.df, campos)
+    posicion = proyectos_de(snapshot).posicion(id)
+    if posicion is None:
+        return None
+    return _filas(snapshot, [posicion], campos)[0]
+
+
+def buscar_proyectos(snapshot, consulta, limite=None, campos=None):
+    """Registros de los proyectos que coinciden con `consulta`, solo con `campos` si se indican."""
+    _validar_campos(snapshot.df, campos)
+    posiciones = [posicion for posicion, _, _ in indice_de(snapshot).buscar(consulta, limite)]
+    return _filas(snapshot, posiciones, campos)
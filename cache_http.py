@@ -0,0 +1,59 @@
+# cache_http.py
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import HTTPException
+
+# Los navegadores guardan la respuesta pero la revalidan siempre: con datos sin
+# cambios la revalidación se responde con 304 sin tocar pandas.
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_para(version, request):
+    """ETag fuerte a partir de la versión del dataset, la ruta y los parámetros (sin credenciales)."""
+    parametros = sorted((k, v) for k, v in request.query_params.multi_items() if k != "auth")
+    clave = json.dumps([version, request.url.path, parametros], ensure_ascii=False)
+    return '"' + hashlib.sha256(clave.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def ultima_modificacion(snapshot):
+    """Segundos epoch de la modificación más reciente de los archivos del snapshot."""
+    return max(mtime_ns for mtime_ns, _ in snapshot.huella) // 1_000_000_000
+
+
+def _coincide_etag(if_none_match, etag):
+    candidatos = [valor.strip() for valor in if_none_match.split(",")]
+    return "*" in candidatos or any(c.removeprefix("W/") == etag for c in candidatos)
+
+
+def _no_modificado_desde(if_modified_since, modificado):
+    try:
+        return modificado <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def verificar_cache(request, snapshot):
+    """Cabeceras de cache para la respuesta, o HTTPException 304 si el cliente ya la tiene.
+
+    Como indica RFC 9110, If-Modified-Since solo se evalúa si no hay If-None-Match.
+    """
+    modificado = ultima_modificacion(snapshot)
+    cabeceras = {
+        "ETag": etag_para(snapshot.version, request),
+        "Last-Modified": formatdate(modificado, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Authorization",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        no_modificado = _coincide_etag(if_none_match, cabeceras["ETag"])
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        no_modificado = if_modified_since is not None and _no_modificado_desde(if_modified_since, modificado)
+
+    if no_modificado:
+        raise HTTPException(status_code=304, headers=cabeceras)
+    return cabeceras
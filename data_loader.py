@@ -1,10 +1,7 @@
 # data_loader.py
 import pandas as pd
-import streamlit as st
 
-@st.cache_data
-def cargar_diccionario(path="diccionario.csv"):
-    df_dic = pd.read_csv(path)
+def construir_diccionario(df_dic):
     mapa = {}
     for _, row in df_dic.iterrows():
         pregunta = str(row["Pregunta"]).strip()
@@ -15,3 +12,7 @@ def cargar_diccionario(path="diccionario.csv"):
             mapa[pregunta] = {}
         mapa[pregunta][respuesta] = {"puntaje": puntaje, "segmento": segmento}
     return mapa
+
+# Sin Streamlit: la API lo importa. Las apps de Streamlit ponen su propio cache encima
+def cargar_diccionario(path="diccionario.csv"):
+    return construir_diccionario(pd.read_csv(path))
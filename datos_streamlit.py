@@ -0,0 +1,77 @@
+# datos_streamlit.py
+import streamlit as st
+
+from almacen_datos import AlmacenDatos
+from bloqueos import BloqueoArchivo
+from buscador import buscar_proyectos
+from sincronizacion import sincronizar
+from tablero import seccion
+from visualizaciones import graficos_generales
+
+# Campos de los resultados de búsqueda de las apps de Streamlit
+CAMPOS_BUSQUEDA = [
+    "id", "Nombre del Proyecto", "Aprobado", "Puntaje TRL 1-3",
+    "Puntaje TRL 4-7", "Puntaje TRL 8-9"
+]
+
+
+@st.cache_resource
+def obtener_almacen():
+    """El mismo `AlmacenDatos` que usa la API, uno por proceso y compartido entre sesiones."""
+    return AlmacenDatos()
+
+
+def obtener_snapshot():
+    """Snapshot vigente, o None si aún no hay datos locales.
+
+    Streamlit vuelve a correr el script en cada interacción; si los archivos
+    no cambiaron, esto solo hace `stat` y devuelve el mismo snapshot.
+    """
+    almacen = obtener_almacen()
+    if not almacen.existen_crudos():
+        return None
+    return almacen.snapshot()
+
+
+def actualizar_datos(usuario, clave_app, url_base):
+    """Sincroniza con Gravity Forms; el próximo `obtener_snapshot` ve la versión nueva.
+
+    Toma el mismo bloqueo que la API; devuelve None si ya hay una sincronización en curso.
+    """
+    bloqueo = BloqueoArchivo("sincronizacion")
+    if not bloqueo.intentar():
+        return None
+    try:
+        return sincronizar(usuario=usuario, clave_app=clave_app, url_base=url_base, almacen=obtener_almacen())
+    finally:
+        bloqueo.liberar()
+
+
+# Los parámetros con `_` no entran en la clave de Streamlit: la versión identifica al snapshot
+
+@st.cache_data(max_entries=4)
+def indicadores(version, _snapshot):
+    df = _snapshot.df
+    metricas = seccion(_snapshot, "metricas")
+    ingles = df["Nivel de Inglés"].astype(object).fillna("No especificado").str.strip().str.capitalize()
+    return {**metricas, "con_ingles": int((~ingles.isin(["Básico", "No especificado"])).sum())}
+
+
+@st.cache_resource(max_entries=2)
+def figuras(version, _snapshot):
+    """Figuras Plotly del dashboard, armadas una vez por versión del dataset."""
+    return graficos_generales(_snapshot.df, "Industria", "Nivel de Inglés", "Ubicación")
+
+
+@st.cache_data(max_entries=256)
+def buscar(version, _snapshot, consulta):
+    return buscar_proyectos(_snapshot, consulta, campos=CAMPOS_BUSQUEDA)
+
+
+def mostrar_en_pares(*figs):
+    """Muestra las figuras de a dos por fila, omitiendo las que no se generaron."""
+    figs = [fig for fig in figs if fig is not None]
+    for inicio in range(0, len(figs), 2):
+        for columna, fig in zip(st.columns(2), figs[inicio:inicio + 2]):
+            with columna:
+                st.plotly_chart(fig, use_container_width=True)
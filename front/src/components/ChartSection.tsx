@@ -1,9 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import Plot from 'react-plotly.js';
 import { ChevronLeft, ChevronRight } from 'lucide-react';
+import { construirGraficos, DatosGraficos } from '../utils/chartSpecs';
 
 interface ChartSectionProps {
-  graficos: any;
+  graficos: DatosGraficos | null;
 }
 
 const ChartSection: React.FC<ChartSectionProps> = ({ graficos }) => {
@@ -17,24 +18,7 @@ const ChartSection: React.FC<ChartSectionProps> = ({ graficos }) => {
     return () => window.removeEventListener('resize', checkMobile);
   }, []);
 
-  const parseChartData = (chartData: string) => {
-    try {
-      return chartData ? JSON.parse(chartData) : null;
-    } catch (error) {
-      console.error('Error parsing chart data:', error);
-      return null;
-    }
-  };
-
-  const chartData = [
-    { title: '📊 Aprobados por Nivel TRL', data: parseChartData(graficos?.grafico_1) },
-    { title: '✅ Proyectos Aprobados', data: parseChartData(graficos?.grafico_2) },
-    { title: '📈 Aprobación por TRL', data: parseChartData(graficos?.grafico_3) },
-    { title: '🔍 Puntajes TRL 1-3', data: parseChartData(graficos?.grafico_4) },
-    { title: '🏭 Proyectos por Industria', data: parseChartData(graficos?.grafico_5) },
-    { title: '🌍 Nivel de Inglés', data: parseChartData(graficos?.grafico_6) },
-    { title: '📍 Ubicación Geográfica', data: parseChartData(graficos?.grafico_7) },
-  ];
+  const chartData = construirGraficos(graficos);
 
   const slidesPerView = isMobile ? 1 : 2;
   const totalSlides = Math.ceil(chartData.length / slidesPerView);
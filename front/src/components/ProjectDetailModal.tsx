@@ -33,11 +33,13 @@ const ProjectDetailModal: React.FC<ProjectDetailModalProps> = ({ project, onClos
            .trim();
   
       const passwordLimpia = cleanPassword(password);
-      const projectName = encodeURIComponent(project["Nombre del Proyecto"]);
       
       // Usar el mismo formato de autenticación que otros endpoints
       const auth = btoa(`multimediafalab:${passwordLimpia}`);
-      const url = `${apiUrl}/reporte-proyecto/${projectName}?auth=${encodeURIComponent(auth)}`;
+      // Por id: el nombre puede repetirse entre proyectos
+      const url = project.id != null
+        ? `${apiUrl}/proyecto/${project.id}/reporte?auth=${encodeURIComponent(auth)}`
+        : `${apiUrl}/reporte-proyecto/${encodeURIComponent(project["Nombre del Proyecto"])}?auth=${encodeURIComponent(auth)}`;
       
       const win = window.open(url, '_blank');
       if (win) {
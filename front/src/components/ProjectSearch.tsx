@@ -1,8 +1,12 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import {
   buscarProyecto,
+  sugerirProyectos,
+  obtenerProyecto,
   descargarReporteAprobados,
   descargarReporteTop10,
+  descargarReportesProyectos,
+  obtenerProgresoReportes,
 } from "../services/api";
 import ProjectDetailModal from "./ProjectDetailModal";
 import { FiSearch, FiDownload } from "react-icons/fi";
@@ -23,14 +27,62 @@ const ProjectSearch: React.FC<ProjectSearchProps> = ({ password }) => {
     null
   );
   const [isModalOpen, setIsModalOpen] = useState(false);
+  const [suggestions, setSuggestions] = useState<ProjectData[]>([]);
+  const [submittedTerm, setSubmittedTerm] = useState("");
+  const [zipProgress, setZipProgress] = useState<string | null>(null);
 
-  const handleSearch = async (e?: React.FormEvent) => {
+  const handleDownloadZip = async () => {
+    const tarea = await descargarReportesProyectos(password);
+    if (!tarea) return;
+    setZipProgress("Preparando reportes...");
+    let intentosSinRespuesta = 0;
+    const timer = setInterval(async () => {
+      try {
+        const progreso = await obtenerProgresoReportes(tarea, password);
+        if (progreso.estado === "ejecutando") {
+          setZipProgress(`Generando reportes: ${progreso.generados} de ${progreso.total}`);
+        } else {
+          clearInterval(timer);
+          setZipProgress(progreso.estado === "completado" ? null : "No se pudo completar la descarga");
+        }
+      } catch {
+        // La descarga aún no empezó en el servidor (o no llegó a empezar)
+        intentosSinRespuesta += 1;
+        if (intentosSinRespuesta > 30) {
+          clearInterval(timer);
+          setZipProgress(null);
+        }
+      }
+    }, 1000);
+  };
+
+  // Autocompletado: consulta el índice del backend tras una pausa al escribir
+  useEffect(() => {
+    const term = searchTerm.trim();
+    if (!term || term === submittedTerm) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      const results = await sugerirProyectos(term, password);
+      if (!cancelled) setSuggestions(results || []);
+    }, 200);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm, submittedTerm, password]);
+
+  const handleSearch = async (e?: React.FormEvent, term = searchTerm) => {
     if (e) e.preventDefault();
-    if (!searchTerm.trim()) return;
+    if (!term.trim()) return;
 
+    setSuggestions([]);
+    setSubmittedTerm(term.trim());
     setIsSearching(true);
     try {
-      const results = await buscarProyecto(searchTerm, password);
+      const results = await buscarProyecto(term, password);
       setSearchResults(results || []);
     } catch (error) {
       console.error("Error searching:", error);
@@ -40,6 +92,18 @@ const ProjectSearch: React.FC<ProjectSearchProps> = ({ password }) => {
     }
   };
 
+  // Una sugerencia identifica un proyecto concreto: se abre su detalle por id
+  const handleSelectSuggestion = async (sugerencia: ProjectData) => {
+    setSuggestions([]);
+    setSearchTerm(sugerencia["Nombre del Proyecto"]);
+    setSubmittedTerm(sugerencia["Nombre del Proyecto"]);
+    const proyecto = await obtenerProyecto(sugerencia.id, password);
+    if (proyecto) {
+      setSearchResults([proyecto]);
+      handleViewDetails(proyecto);
+    }
+  };
+
   const handleViewDetails = (project: ProjectData) => {
     setSelectedProject(project);
     setIsModalOpen(true);
@@ -66,7 +130,16 @@ const ProjectSearch: React.FC<ProjectSearchProps> = ({ password }) => {
             <FiDownload />
             Descargar PDF Top 10
           </button>
+          <button
+            onClick={handleDownloadZip}
+            disabled={zipProgress !== null}
+            className="inline-flex items-center justify-center gap-2 px-4 py-2 bg-blue-600 hover:bg-blue-700 text-white rounded-md text-lg transition disabled:opacity-50"
+          >
+            <FiDownload />
+            Descargar todos los reportes (ZIP)
+          </button>
         </div>
+        {zipProgress && <p className="mt-3 text-base text-gray-600">{zipProgress}</p>}
       </section>
 
       <section>
@@ -74,13 +147,33 @@ const ProjectSearch: React.FC<ProjectSearchProps> = ({ password }) => {
           onSubmit={handleSearch}
           className="flex flex-col sm:flex-row flex-wrap gap-4 mb-6 w-full"
         >
-          <input
-            type="text"
-            value={searchTerm}
-            onChange={(e) => setSearchTerm(e.target.value)}
-            placeholder="Buscar proyecto por nombre..."
-            className="flex-grow w-full sm:w-auto px-4 py-2 text-lg border border-gray-300 rounded-md focus:ring-2 focus:outline-none focus:ring-purple-500 focus:border-purple-500"
-          />
+          <div className="relative flex-grow w-full sm:w-auto">
+            <input
+              type="text"
+              value={searchTerm}
+              onChange={(e) => setSearchTerm(e.target.value)}
+              placeholder="Buscar proyecto por nombre..."
+              className="w-full px-4 py-2 text-lg border border-gray-300 rounded-md focus:ring-2 focus:outline-none focus:ring-purple-500 focus:border-purple-500"
+            />
+            {suggestions.length > 0 && (
+              <ul className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-md shadow-lg max-h-72 overflow-y-auto">
+                {suggestions.map((sugerencia) => (
+                  <li key={sugerencia.id}>
+                    <button
+                      type="button"
+                      onClick={() => handleSelectSuggestion(sugerencia)}
+                      className="w-full flex justify-between gap-4 px-4 py-2 text-left text-base text-gray-800 hover:bg-purple-50"
+                    >
+                      <span className="truncate">{sugerencia["Nombre del Proyecto"]}</span>
+                      <span className="shrink-0 text-sm text-gray-500">
+                        {sugerencia["Segmento TRL"]} · {sugerencia["Puntaje Total"]} pts
+                      </span>
+                    </button>
+                  </li>
+                ))}
+              </ul>
+            )}
+          </div>
           <button
             type="submit"
             disabled={isSearching}
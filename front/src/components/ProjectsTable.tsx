@@ -3,6 +3,7 @@ import { ChevronUpIcon, ChevronDownIcon } from "@heroicons/react/24/solid";
 import ProjectDetailModal from "./ProjectDetailModal";
 
 interface ProjectData {
+  id?: number;
   "Nombre del Proyecto": string;
   Aprobado: "Sí" | "No";
   "Puntaje TRL 1-3": number;
@@ -26,6 +27,9 @@ interface ProjectsTableProps {
   setCurrentPage: (page: number) => void;
   hidePagination?: boolean;
   password: string;
+  // Si se indica, `proyectos` ya es la página pedida al backend, ordenada por él
+  totalItems?: number;
+  onSortChange?: (key: string, direction: "ascending" | "descending") => void;
 }
 
 const ProjectsTable: React.FC<ProjectsTableProps> = ({
@@ -35,6 +39,8 @@ const ProjectsTable: React.FC<ProjectsTableProps> = ({
   setCurrentPage,
   hidePagination,
   password,
+  totalItems,
+  onSortChange,
 }) => {
   const [sortConfig, setSortConfig] = useState<{
     key: string;
@@ -53,7 +59,10 @@ const ProjectsTable: React.FC<ProjectsTableProps> = ({
     setIsModalOpen(true);
   };
 
-  const sortedProjects = [...proyectos].sort((a, b) => {
+  const paginadoEnServidor = totalItems !== undefined;
+  const totalPages = Math.ceil((totalItems ?? proyectos.length) / itemsPerPage);
+
+  const sortedProjects = paginadoEnServidor ? proyectos : [...proyectos].sort((a, b) => {
     if (a.Aprobado !== b.Aprobado) return a.Aprobado === "Sí" ? -1 : 1;
     if (a[sortConfig.key] < b[sortConfig.key])
       return sortConfig.direction === "ascending" ? -1 : 1;
@@ -62,10 +71,9 @@ const ProjectsTable: React.FC<ProjectsTableProps> = ({
     return 0;
   });
 
-  const paginatedProjects = sortedProjects.slice(
-    (currentPage - 1) * itemsPerPage,
-    currentPage * itemsPerPage
-  );
+  const paginatedProjects = paginadoEnServidor
+    ? sortedProjects
+    : sortedProjects.slice((currentPage - 1) * itemsPerPage, currentPage * itemsPerPage);
 
   const requestSort = (key: string) => {
     const direction =
@@ -73,6 +81,7 @@ const ProjectsTable: React.FC<ProjectsTableProps> = ({
         ? "descending"
         : "ascending";
     setSortConfig({ key, direction });
+    onSortChange?.(key, direction);
   };
 
   return (
@@ -152,7 +161,7 @@ const ProjectsTable: React.FC<ProjectsTableProps> = ({
         <div className="flex flex-col md:flex-row justify-between items-center px-6 py-4 bg-gray-50 border-t gap-4">
           <span className="text-base text-gray-700">
             Página <strong>{currentPage}</strong> de{" "}
-            <strong>{Math.ceil(proyectos.length / itemsPerPage)}</strong>
+            <strong>{totalPages}</strong>
           </span>
           <div className="flex gap-2">
             <button
@@ -164,9 +173,7 @@ const ProjectsTable: React.FC<ProjectsTableProps> = ({
             </button>
             <button
               onClick={() => setCurrentPage(currentPage + 1)}
-              disabled={
-                currentPage >= Math.ceil(proyectos.length / itemsPerPage)
-              }
+              disabled={currentPage >= totalPages}
               className="px-4 py-2 rounded-md bg-purple-600 text-white font-medium hover:bg-purple-700 disabled:opacity-50 transition"
             >
               Siguiente
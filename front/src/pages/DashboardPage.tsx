@@ -1,4 +1,4 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import { motion } from "framer-motion";
 import GeneralInsights from "../components/GeneralInsights";
 import {
@@ -20,12 +20,7 @@ import ChartSection from "../components/ChartSection";
 import DataStatus from "../components/DataStatus";
 import Top10ProjectsView from "../components/Top10ProjectsView";
 import ProjectsTable from "../components/ProjectsTable";
-import {
-  obtenerProyectos,
-  getMetricasPrincipales,
-  getGraficosData,
-  getInsightsGenerales,
-} from "../services/api";
+import { getDashboard, obtenerPaginaProyectos } from "../services/api";
 
 const DashboardPage: React.FC = () => {
   const [password, setPassword] = useState<string>("");
@@ -42,6 +37,9 @@ const DashboardPage: React.FC = () => {
   const [graficos, setGraficos] = useState<any>(null);
   const [insigths, setInsigths] = useState<any>(null);
   const [proyectos, setProyectos] = useState<any[]>([]);
+  const [paginaProyectos, setPaginaProyectos] = useState<any[]>([]);
+  const [totalProyectos, setTotalProyectos] = useState(0);
+  const [ordenProyectos, setOrdenProyectos] = useState("-Puntaje Total");
   const [activeTab, setActiveTab] = useState<
     "metrics" | "charts" | "search" | "projects-table" | "insigths"
   >("metrics");
@@ -60,17 +58,18 @@ const DashboardPage: React.FC = () => {
     setStatus({ type: "loading", message: "Actualizando datos..." });
   
     try {
-      const [proyectosRes, metricasRes, graficosRes, insigthsRes] = await Promise.all([
-        obtenerProyectos(passwordLimpia),
-        getMetricasPrincipales(passwordLimpia),
-        getGraficosData(passwordLimpia),
-        getInsightsGenerales(passwordLimpia),
+      // Los proyectos se piden por página; aquí solo el top 10
+      const [dashboard, top10] = await Promise.all([
+        getDashboard(passwordLimpia, ["metricas", "graficos", "insights"]),
+        obtenerPaginaProyectos(passwordLimpia, { limite: 10, orden: "-Puntaje Total" }),
       ]);
   
-      setProyectos(Array.isArray(proyectosRes) ? proyectosRes : []);
-      setMetricas(metricasRes);
-      setInsigths(insigthsRes);
-      setGraficos(graficosRes.graficos);
+      setProyectos(top10.proyectos);
+      setTotalProyectos(top10.total);
+      setCurrentPage(1);
+      setMetricas(dashboard.metricas);
+      setInsigths(dashboard.insights);
+      setGraficos(dashboard.graficos);
       setStatus({
         type: "success",
         message: "Datos actualizados correctamente",
@@ -84,6 +83,22 @@ const DashboardPage: React.FC = () => {
     }
   };
   
+  // Página actual de la tabla de proyectos, ordenada y recortada en el backend
+  useEffect(() => {
+    if (status.type !== "success") return;
+    obtenerPaginaProyectos(limpiarContraseña(password), {
+      limite: itemsPerPage,
+      desplazamiento: (currentPage - 1) * itemsPerPage,
+      orden: ordenProyectos,
+      aprobados_primero: true,
+    })
+      .then((pagina) => {
+        setPaginaProyectos(pagina.proyectos);
+        setTotalProyectos(pagina.total);
+      })
+      .catch(() => setPaginaProyectos([]));
+  }, [status.type, currentPage, ordenProyectos]);
+
   const limpiarContraseña = (password: string) => {
     return password
       .replace(/\u00A0/g, " ")
@@ -305,11 +320,16 @@ const DashboardPage: React.FC = () => {
               >
                 {proyectos.length > 0 ? (
                   <ProjectsTable
-                    proyectos={proyectos}
+                    proyectos={paginaProyectos}
+                    totalItems={totalProyectos}
                     currentPage={currentPage}
                     itemsPerPage={itemsPerPage}
                     password={password}
                     setCurrentPage={setCurrentPage}
+                    onSortChange={(key, direction) => {
+                      setOrdenProyectos(direction === "descending" ? `-${key}` : key);
+                      setCurrentPage(1);
+                    }}
                   />
                 ) : (
                   <div className="text-center py-12 text-gray-500 bg-gray-50 rounded-lg">
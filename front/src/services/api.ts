@@ -10,6 +10,22 @@ const limpiarContraseña = (password: string): string =>
     .replace(/\uFEFF/g, "")  // BOM
     .trim();
 
+export const getDashboard = async (password: string, secciones?: string[]) => {
+  try {
+    const limpia = limpiarContraseña(password);
+    const response = await axios.get(`${apiUrl}/dashboard`, {
+      headers: {
+        Authorization: `Basic ${btoa(`multimediafalab:${limpia}`)}`
+      },
+      params: secciones ? { secciones: secciones.join(",") } : undefined,
+    });
+    return response.data;
+  } catch (error) {
+    console.error("Error obteniendo el dashboard:", error);
+    throw error;
+  }
+};
+
 export const getGraficosData = async (password: string) => {
   try {
     const limpia = limpiarContraseña(password);
@@ -85,6 +101,33 @@ export const obtenerProyectos = async (password: string) => {
   }
 };
 
+export interface ParametrosProyectos {
+  limite?: number;
+  desplazamiento?: number;
+  orden?: string;
+  aprobados_primero?: boolean;
+  segmento?: string;
+  industria?: string;
+  aprobado?: "Sí" | "No";
+  campos?: string[];
+}
+
+export const obtenerPaginaProyectos = async (password: string, parametros: ParametrosProyectos) => {
+  try {
+    const limpia = limpiarContraseña(password);
+    const response = await axios.get(`${apiUrl}/proyectos`, {
+      params: { ...parametros, campos: parametros.campos?.join(",") },
+      headers: {
+        Authorization: `Basic ${btoa(`multimediafalab:${limpia}`)}`
+      },
+    });
+    return response.data as { proyectos: any[]; total: number };
+  } catch (error) {
+    console.error("Error obteniendo proyectos:", error);
+    throw error;
+  }
+};
+
 export const buscarProyecto = async (nombre: string, password: string) => {
   try {
     const limpia = limpiarContraseña(password);
@@ -103,11 +146,42 @@ export const buscarProyecto = async (nombre: string, password: string) => {
   }
 };
 
-export const generarReporteProyecto = async (nombre: string, password: string) => {
+export const sugerirProyectos = async (q: string, password: string, limite = 8) => {
+  try {
+    const limpia = limpiarContraseña(password);
+    const response = await axios.get(`${apiUrl}/buscar-proyecto/sugerencias`, {
+      params: { q, limite },
+      headers: {
+        Authorization: `Basic ${btoa(`multimediafalab:${limpia}`)}`
+      },
+    });
+    return response.data.proyectos;
+  } catch (error) {
+    console.error("Error obteniendo sugerencias:", error);
+    return [];
+  }
+};
+
+export const obtenerProyecto = async (id: number, password: string) => {
+  try {
+    const limpia = limpiarContraseña(password);
+    const response = await axios.get(`${apiUrl}/proyecto/${id}`, {
+      headers: {
+        Authorization: `Basic ${btoa(`multimediafalab:${limpia}`)}`
+      },
+    });
+    return response.data;
+  } catch (error) {
+    console.error("Error obteniendo el proyecto:", error);
+    return null;
+  }
+};
+
+export const generarReporteProyecto = async (id: number, password: string) => {
   try {
     const limpia = limpiarContraseña(password);
     const auth = btoa(`multimediafalab:${limpia}`);
-    const url = `/reporte-proyecto/${encodeURIComponent(nombre)}?auth=${auth}`;
+    const url = `${apiUrl}/proyecto/${id}/reporte?auth=${encodeURIComponent(auth)}`;
 
     const win = window.open(url, "_blank");
     if (win) {
@@ -121,11 +195,56 @@ export const generarReporteProyecto = async (nombre: string, password: string) =
   }
 };
 
-export const descargarReporteAprobados = async (password: string): Promise<void> => {
+export const descargarReportesProyectos = async (
+  password: string,
+  filtros: { aprobado?: "Sí" | "No"; segmento?: string; industria?: string } = {}
+): Promise<string | null> => {
+  // La ventana se abre antes del await para que el navegador no la bloquee
+  const win = window.open("", "_blank");
+  if (!win) {
+    alert("Permite las ventanas emergentes para descargar los reportes.");
+    return null;
+  }
+
+  const limpia = limpiarContraseña(password);
+  try {
+    // El id lo genera el servidor; con él se consulta el avance desde cualquier worker
+    const response = await axios.post(`${apiUrl}/reportes-proyectos/exportaciones`, null, {
+      headers: {
+        Authorization: `Basic ${btoa(`multimediafalab:${limpia}`)}`
+      },
+    });
+    const tarea = response.data.id as string;
+    const params = new URLSearchParams({ auth: btoa(`multimediafalab:${limpia}`), tarea });
+    Object.entries(filtros).forEach(([clave, valor]) => valor && params.append(clave, valor));
+    win.location.href = `/reportes-proyectos?${params.toString()}`;
+    return tarea;
+  } catch (error) {
+    win.close();
+    console.error("Error iniciando la descarga de reportes:", error);
+    alert("No se pudo iniciar la descarga de reportes.");
+    return null;
+  }
+};
+
+export const obtenerProgresoReportes = async (tarea: string, password: string) => {
+  const limpia = limpiarContraseña(password);
+  const response = await axios.get(`${apiUrl}/reportes-proyectos/progreso/${tarea}`, {
+    headers: {
+      Authorization: `Basic ${btoa(`multimediafalab:${limpia}`)}`
+    },
+  });
+  return response.data as { estado: string; generados: number; total: number };
+};
+
+export const descargarReporteAprobados = async (
+  password: string,
+  formato: "xlsx" | "csv" = "xlsx"
+): Promise<void> => {
   try {
     const limpia = limpiarContraseña(password);
     const auth = btoa(`multimediafalab:${limpia}`);
-    const url = `/reporte-aprobados?auth=${auth}`;
+    const url = `/reporte-aprobados?auth=${auth}&formato=${formato}`;
 
     const win = window.open(url, "_blank");
     if (win) {
@@ -0,0 +1,178 @@
+// src/utils/chartSpecs.ts
+// Estilos fijos de los gráficos generales. El backend (/datos-graficos) solo
+// envía las series agregadas; aquí se arman las trazas y el layout de Plotly.
+
+export interface Conteos {
+  etiquetas: string[];
+  valores: number[];
+}
+
+export interface DatosGraficos {
+  aprobados_por_segmento: Conteos;
+  aprobacion: Conteos;
+  aprobacion_por_segmento: { etiquetas: string[]; "Sí": number[]; No: number[] };
+  histograma_trl_1_3: { bordes: number[]; valores: number[] };
+  industria: Conteos;
+  nivel_ingles: Conteos;
+  ubicacion: Conteos;
+}
+
+export interface ChartSpec {
+  title: string;
+  data: { data: any[]; layout: any } | null;
+}
+
+const colors: Record<string, string> = {
+  "Sí": "#27ae60",
+  No: "#e74c3c",
+  "TRL 1-3": "#3498db",
+  "TRL 4-7": "#9b59b6",
+  "TRL 8-9": "#e67e22",
+};
+const coloresUbicacion = ["#3498db", "#2ecc71", "#e74c3c", "#f1c40f", "#95a5a6"];
+const paleta = ["#636efa", "#EF553B", "#00cc96", "#ab63fa", "#FFA15A", "#19d3f3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52"];
+
+const crearLayout = (titulo: string, extra: Record<string, any> = {}) => ({
+  title: {
+    text: `<b>${titulo}</b>`,
+    font: { family: "Arial", size: 22, color: "#2c3e50" },
+    x: 0.5,
+    y: 0.95,
+  },
+  font: { family: "Arial", size: 14, color: "#34495e" },
+  plot_bgcolor: "#ffffff",
+  paper_bgcolor: "#f8f9fa",
+  margin: { l: 50, r: 50, t: 80, b: 70 },
+  hoverlabel: { bgcolor: "white", font: { size: 14, family: "Arial" }, bordercolor: "#bdc3c7" },
+  legend: { orientation: "h", yanchor: "top", y: -0.25, xanchor: "center", x: 0.5 },
+  ...extra,
+});
+
+const ejes = (x: string, y: string) => ({
+  xaxis: { title: { text: x }, tickangle: -30 },
+  yaxis: { title: { text: y } },
+});
+
+const barrasPorEtiqueta = (conteos: Conteos, horizontal = false) =>
+  conteos.etiquetas.map((etiqueta, i) => ({
+    type: "bar",
+    name: etiqueta,
+    x: horizontal ? [conteos.valores[i]] : [etiqueta],
+    y: horizontal ? [etiqueta] : [conteos.valores[i]],
+    orientation: horizontal ? "h" : "v",
+    marker: { color: colors[etiqueta] ?? paleta[i % paleta.length] },
+  }));
+
+export const construirGraficos = (datos: DatosGraficos | null): ChartSpec[] => {
+  if (!datos) {
+    return [
+      "📊 Aprobados por Nivel TRL",
+      "✅ Proyectos Aprobados",
+      "📈 Aprobación por TRL",
+      "🔍 Puntajes TRL 1-3",
+      "🏭 Proyectos por Industria",
+      "🌍 Nivel de Inglés",
+      "📍 Ubicación Geográfica",
+    ].map((title) => ({ title, data: null }));
+  }
+
+  const hist = datos.histograma_trl_1_3;
+  const centros = hist.valores.map((_, i) => (hist.bordes[i] + hist.bordes[i + 1]) / 2);
+  const ancho = hist.bordes.length > 1 ? hist.bordes[1] - hist.bordes[0] : 1;
+
+  return [
+    {
+      title: "📊 Aprobados por Nivel TRL",
+      data: {
+        data: barrasPorEtiqueta(datos.aprobados_por_segmento).map((traza) => ({
+          ...traza,
+          text: traza.y,
+          textposition: "outside",
+          textfont: { size: 14 },
+        })),
+        layout: crearLayout("📊 Aprobados por Nivel TRL", { ...ejes("Segmento TRL", "Número de Proyectos"), showlegend: false }),
+      },
+    },
+    {
+      title: "✅ Proyectos Aprobados",
+      data: {
+        data: [
+          {
+            type: "pie",
+            labels: datos.aprobacion.etiquetas,
+            values: datos.aprobacion.valores,
+            hole: 0.4,
+            pull: datos.aprobacion.etiquetas.map((_, i) => (i === 0 ? 0.05 : 0)),
+            textinfo: "percent+label",
+            textfont: { size: 14 },
+            marker: { colors: datos.aprobacion.etiquetas.map((e) => colors[e]) },
+          },
+        ],
+        layout: crearLayout("✅ Proyectos Aprobados", { showlegend: false }),
+      },
+    },
+    {
+      title: "📈 Aprobación por TRL",
+      data: {
+        data: (["Sí", "No"] as const).map((estado) => ({
+          type: "bar",
+          name: estado,
+          x: datos.aprobacion_por_segmento.etiquetas,
+          y: datos.aprobacion_por_segmento[estado],
+          marker: { color: colors[estado] },
+        })),
+        layout: crearLayout("📈 Aprobación por Segmento TRL", {
+          ...ejes("Segmento TRL", "Número de Proyectos"),
+          barmode: "group",
+          legend: { title: { text: "Aprobado" }, orientation: "h", yanchor: "top", y: -0.25, xanchor: "center", x: 0.5 },
+        }),
+      },
+    },
+    {
+      title: "🔍 Puntajes TRL 1-3",
+      data: {
+        data: [
+          {
+            type: "bar",
+            x: centros,
+            y: hist.valores,
+            width: ancho,
+            marker: { color: colors["TRL 1-3"] },
+          },
+        ],
+        layout: crearLayout("🔍 Puntajes TRL 1-3", { ...ejes("Puntaje", "Número de Proyectos"), bargap: 0 }),
+      },
+    },
+    {
+      title: "🏭 Proyectos por Industria",
+      data: {
+        data: barrasPorEtiqueta(datos.industria, true),
+        layout: crearLayout("🏭 Proyectos por Industria", { showlegend: false }),
+      },
+    },
+    {
+      title: "🌍 Nivel de Inglés",
+      data: {
+        data: barrasPorEtiqueta(datos.nivel_ingles),
+        layout: crearLayout("🌍 Nivel de Inglés", { xaxis: { tickangle: -30 }, showlegend: false }),
+      },
+    },
+    {
+      title: "📍 Ubicación Geográfica",
+      data: {
+        data: [
+          {
+            type: "pie",
+            labels: datos.ubicacion.etiquetas,
+            values: datos.ubicacion.valores,
+            hole: 0.3,
+            textinfo: "percent+label",
+            textfont: { size: 14 },
+            marker: { colors: coloresUbicacion },
+          },
+        ],
+        layout: crearLayout("📍 Ubicación Geográfica", { showlegend: false }),
+      },
+    },
+  ];
+};
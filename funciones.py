@@ -2,66 +2,86 @@
 import pandas as pd
 import io
 import re
-from typing import Optional
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 
-def generar_excel_aprobados(df: pd.DataFrame) -> io.BytesIO:
-    columnas = [
-        "Nombre del Proyecto", "Aprobado", "Nivel TRL", "Segmento TRL", "Docente Acompañante",
-        "Ubicación", "Nivel de Inglés", "Puntaje TRL 1-3", "Puntaje TRL 4-7", "Puntaje TRL 8-9",
-        "Puntaje Total", "Insights"
-    ]
-
-    # Asegurar que todas las columnas existan
-    for col in columnas:
-        if col not in df.columns:
-            df[col] = ""
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Proyectos Aprobados"
-
-    # Estilos
-    header_fill = PatternFill(start_color="6D28D9", end_color="6D28D9", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center_alignment = Alignment(horizontal="center", vertical="center", wrap_text=False)
-    border_style = Border(
+COLUMNAS_APROBADOS = [
+    "Nombre del Proyecto", "Aprobado", "Nivel TRL", "Segmento TRL", "Docente Acompañante",
+    "Ubicación", "Nivel de Inglés", "Puntaje TRL 1-3", "Puntaje TRL 4-7", "Puntaje TRL 8-9",
+    "Puntaje Total", "Insights"
+]
+
+def _valor_plano(value):
+    # Convertir listas a string plano
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    if isinstance(value, (dict, tuple)):
+        return str(value)
+    return value
+
+def _estilos_excel(wb):
+    """Estilos con nombre: se registran una vez en el libro y cada celda solo los referencia."""
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+
+    borde = Border(
         left=Side(style="thin"),
         right=Side(style="thin"),
         top=Side(style="thin"),
         bottom=Side(style="thin"),
     )
+    encabezado = NamedStyle(
+        name="encabezado",
+        fill=PatternFill(start_color="6D28D9", end_color="6D28D9", fill_type="solid"),
+        font=Font(color="FFFFFF", bold=True),
+        alignment=Alignment(horizontal="center", vertical="center", wrap_text=False),
+        border=borde,
+    )
+    celda = NamedStyle(name="celda", alignment=Alignment(wrap_text=False), border=borde)
+    wb.add_named_style(encabezado)
+    wb.add_named_style(celda)
+    return encabezado, celda
 
-    # Escribir encabezados
-    for col_num, col_name in enumerate(columnas, 1):
-        cell = ws.cell(row=1, column=col_num, value=col_name)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border_style
-
-    # Escribir datos
-    for row_num, row_data in enumerate(df[columnas].values.tolist(), 2):
-        for col_num, value in enumerate(row_data, 1):
-            # Convertir listas a string plano
-            if isinstance(value, list):
-                value = ", ".join(str(v) for v in value)
-            elif isinstance(value, (dict, tuple)):
-                value = str(value)
-
-            cell = ws.cell(row=row_num, column=col_num, value=value)
-            cell.alignment = Alignment(wrap_text=False)
-            cell.border = border_style
-
-    # (Opcional) Ancho fijo por columna
-    for col_letter in ws.iter_cols(min_row=1, max_row=1):
-        letra = col_letter[0].column_letter
-        ws.column_dimensions[letra].width = 25  # puedes ajustar a tu gusto
+def generar_excel_aprobados(df: pd.DataFrame) -> io.BytesIO:
+    """Excel de proyectos aprobados en modo solo escritura: las filas no se guardan en memoria."""
+    # openpyxl se importa al exportar: la API arranca sin cargarlo
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    # Las columnas que falten se exportan vacías
+    df = df.reindex(columns=COLUMNAS_APROBADOS, fill_value="")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Proyectos Aprobados")
+    encabezado, celda = _estilos_excel(wb)
+
+    # Ancho fijo por columna
+    for col_num in range(1, len(COLUMNAS_APROBADOS) + 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = 25
+
+    def fila(valores, estilo):
+        celdas = []
+        for value in valores:
+            cell = WriteOnlyCell(ws, value=_valor_plano(value))
+            cell.style = estilo.name
+            celdas.append(cell)
+        return celdas
+
+    ws.append(fila(COLUMNAS_APROBADOS, encabezado))
+    for row_data in df.itertuples(index=False, name=None):
+        ws.append(fila(row_data, celda))
 
     return _guardar_excel(wb)
 
-def _guardar_excel(workbook: Workbook) -> io.BytesIO:
+def generar_csv_aprobados(df: pd.DataFrame, filas_por_bloque: int = 1000):
+    """CSV de proyectos aprobados en bloques de texto, a medida que se generan las filas."""
+    df = df.reindex(columns=COLUMNAS_APROBADOS, fill_value="")
+    # BOM para que Excel reconozca UTF-8 al abrir el archivo
+    yield "\ufeff" + df.iloc[:0].to_csv(index=False, lineterminator="\n")
+    for inicio in range(0, len(df), filas_por_bloque):
+        bloque = df.iloc[inicio:inicio + filas_por_bloque]
+        bloque = bloque.assign(Insights=bloque["Insights"].map(_valor_plano))
+        yield bloque.to_csv(index=False, header=False, lineterminator="\n")
+
+def _guardar_excel(workbook) -> io.BytesIO:
     output = io.BytesIO()
     workbook.save(output)
     output.seek(0)
@@ -86,156 +106,3 @@ def normalizar_contraseña(password: str) -> str:
     if len(parts) >= 6:
         return '-'.join(parts[:6])  # Toma los primeros 6 segmentos
     return password
-
-def segmento_trl(nivel):
-    if 1 <= nivel <= 3:
-        return "TRL 1-3"
-    elif 4 <= nivel <= 7:
-        return "TRL 4-7"
-    elif 8 <= nivel <= 9:
-        return "TRL 8-9"
-    return "Desconocido"
-
-def calcular_puntajes_por_segmento(fila, diccionario):
-    puntajes = {"TRL 1-3": 0, "TRL 4-7": 0, "TRL 8-9": 0}
-    for pregunta, respuestas_map in diccionario.items():
-        for columna, respuesta_usuario in fila.items():
-            if respuesta_usuario in respuestas_map:
-                datos = respuestas_map[respuesta_usuario]
-                puntajes[datos["segmento"]] += datos["puntaje"]
-    return puntajes
-
-def analizar_madurez(proyecto, segmento):
-    """Analiza el nivel de madurez del proyecto basado en múltiples factores."""
-    trl = proyecto["Nivel TRL"]
-    docente = proyecto["Docente Acompañante"]
-    puntajes = {
-        "TRL 1-3": proyecto["Puntaje TRL 1-3"],
-        "TRL 4-7": proyecto["Puntaje TRL 4-7"],
-        "TRL 8-9": proyecto["Puntaje TRL 8-9"]
-    }
-    
-    if segmento == "TRL 1-3":
-        if puntajes["TRL 1-3"] >= 40:
-            return "Investigación sólida: Buen fundamento teórico y validación inicial"
-        else:
-            return "Etapa conceptual: Necesita más desarrollo teórico y validación"
-    
-    elif segmento == "TRL 4-7":
-        if puntajes["TRL 4-7"] >= 50:
-            return "Prototipo funcional: Validación técnica en progreso"
-        else:
-            return "Prototipo inicial: Requiere más desarrollo técnico"
-    
-    else:  # TRL 8-9
-        if puntajes["TRL 8-9"] >= 60:
-            return "Listo para implementación: Alta preparación para el mercado"
-        else:
-            return "Casi listo: Necesita ajustes finales para implementación"
-
-def identificar_fortalezas(proyecto):
-    """Identifica las principales fortalezas del proyecto."""
-    fortalezas = []
-    
-    # Fortalezas por puntajes
-    if proyecto["Puntaje TRL 1-3"] >= 40:
-        fortalezas.append("✅ Innovación bien fundamentada con investigación sólida")
-    if proyecto["Puntaje TRL 4-7"] >= 50:
-        fortalezas.append("✅ Desarrollo técnico avanzado y validado")
-    if proyecto["Puntaje TRL 8-9"] >= 50:
-        fortalezas.append("✅ Alto potencial de implementación y escalabilidad")
-    
-    # Otras fortalezas
-    if proyecto["Docente Acompañante"]:
-        fortalezas.append("✅ Excelente acompañamiento académico")
-    if proyecto.get("Nivel de Inglés", "") in ["Avanzado", "Intermedio"]:
-        fortalezas.append("✅ Buena capacidad para documentación internacional")
-    
-    return fortalezas
-
-def identificar_debilidades(proyecto):
-    """Identifica las principales debilidades del proyecto."""
-    debilidades = []
-    
-    # Debilidades por puntajes
-    if proyecto["Puntaje TRL 1-3"] < 30:
-        debilidades.append("⚠️ Fundamentación teórica débil - necesita más investigación")
-    if proyecto["Puntaje TRL 4-7"] < 40:
-        debilidades.append("⚠️ Desarrollo técnico insuficiente - requiere más validación")
-    if proyecto["Puntaje TRL 8-9"] < 40:
-        debilidades.append("⚠️ Preparación para el mercado limitada - necesita más desarrollo")
-    
-    # Otras debilidades
-    if not proyecto["Docente Acompañante"]:
-        debilidades.append("⚠️ Falta acompañamiento docente - recomendar mentoría")
-    if proyecto.get("Nivel de Inglés", "") == "Básico":
-        debilidades.append("⚠️ Limitaciones en inglés - afecta potencial internacional")
-    
-    return debilidades
-
-def generar_recomendaciones(proyecto):
-    """Genera recomendaciones personalizadas para el proyecto."""
-    recomendaciones = []
-    segmento = segmento_trl(proyecto["Nivel TRL"])
-    
-    # Recomendaciones por segmento TRL
-    if segmento == "TRL 1-3":
-        recomendaciones.append("Priorizar investigación y validación conceptual")
-        if proyecto["Puntaje TRL 1-3"] < 30:
-            recomendaciones.append("Realizar más investigación de mercado y técnica")
-    elif segmento == "TRL 4-7":
-        recomendaciones.append("Enfocarse en desarrollo técnico y pruebas")
-        if proyecto["Puntaje TRL 4-7"] < 40:
-            recomendaciones.append("Realizar pruebas técnicas más rigurosas")
-    else:
-        recomendaciones.append("Preparar estrategia de implementación y comercialización")
-        if proyecto["Puntaje TRL 8-9"] < 50:
-            recomendaciones.append("Realizar pruebas piloto con usuarios finales")
-    
-    # Recomendaciones específicas
-    if not proyecto["Docente Acompañante"]:
-        recomendaciones.append("Buscar mentoría docente para fortalecer el proyecto")
-    if proyecto.get("Nivel de Inglés", "") == "Básico":
-        recomendaciones.append("Mejorar documentación en inglés para mayor impacto")
-    
-    return recomendaciones
-
-def evaluar_potencial(proyecto):
-    """Evalúa el potencial general del proyecto."""
-    puntaje_total = sum([
-        proyecto["Puntaje TRL 1-3"],
-        proyecto["Puntaje TRL 4-7"],
-        proyecto["Puntaje TRL 8-9"]
-    ])
-    
-    if puntaje_total >= 120:
-        return "🌟 Excelente potencial: Proyecto bien desarrollado en todas las áreas"
-    elif puntaje_total >= 80:
-        return "✨ Buen potencial: Proyecto sólido con algunas áreas para mejorar"
-    elif puntaje_total >= 50:
-        return "💡 Potencial moderado: Necesita trabajo en varias áreas"
-    else:
-        return "🔍 Potencial limitado: Requiere desarrollo significativo"
-
- # Modificar la función generar_insights para usar todas las columnas necesarias
-
-def generar_insights(proyecto, diccionario=None):
-    """Genera insights personalizados (versión unificada)"""
-    insights = []
-    
-    # Asegurar existencia de campos
-    proyecto["Industria"] = proyecto.get("Industria", "No especificada")
-    proyecto["Ubicación"] = proyecto.get("Ubicación", "No especificada")
-    
-    # Resto de la lógica igual que en main.py
-    segmento = segmento_trl(proyecto["Nivel TRL"])
-    insights.append(analizar_madurez(proyecto, segmento))
-    insights.extend(identificar_fortalezas(proyecto))
-    insights.extend(identificar_debilidades(proyecto))
-    insights.extend(generar_recomendaciones(proyecto))
-    insights.append(evaluar_potencial(proyecto))
-    
-    # Insight adicional de industria
-    insights.append(f"🏭 Sector: {proyecto['Industria']} - Considerar tendencias del mercado relacionadas")
-    
-    return insights
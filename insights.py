@@ -0,0 +1,108 @@
+# insights.py
+import json
+import string
+
+import numpy as np
+import pandas as pd
+
+RUTA_REGLAS = "insights_config.json"
+# Una regla por bit de un entero sin signo de 64 bits
+MAX_REGLAS = 64
+
+OPERADORES = {
+    "==": lambda valores, valor: valores == valor,
+    "!=": lambda valores, valor: valores != valor,
+    ">=": lambda valores, valor: valores >= valor,
+    ">": lambda valores, valor: valores > valor,
+    "<=": lambda valores, valor: valores <= valor,
+    "<": lambda valores, valor: valores < valor,
+    "en": lambda valores, valor: np.isin(valores, valor),
+    "no_en": lambda valores, valor: ~np.isin(valores, valor),
+}
+
+
+class MotorInsights:
+    """Reglas de insights compiladas desde `insights_config.json`.
+
+    `evaluar` calcula para todo el frame un entero por fila donde el bit `i`
+    indica que aplica la regla `i`; los textos se arman solo al pedirlos, en el
+    orden de la tabla de reglas.
+    """
+
+    def __init__(self, reglas):
+        if len(reglas) > MAX_REGLAS:
+            raise ValueError(f"Se admiten hasta {MAX_REGLAS} reglas de insights")
+        for regla in reglas:
+            for _, operador, _ in regla["condiciones"]:
+                if operador not in OPERADORES:
+                    raise ValueError(f"Operador desconocido en la regla {regla['id']}: {operador}")
+        self.reglas = reglas
+        self.ids = [regla["id"] for regla in reglas]
+        # Columnas que usa cada mensaje con {columna}; vacío si el texto es fijo
+        self._campos_mensaje = [
+            [campo for _, campo, _, _ in string.Formatter().parse(regla["mensaje"]) if campo]
+            for regla in reglas
+        ]
+        self._bits_por_mascara = {}
+
+    @classmethod
+    def desde_json(cls, contenido):
+        return cls(json.loads(contenido)["reglas"])
+
+    def _valores(self, df, campo):
+        if isinstance(campo, list):
+            return sum(df[c].to_numpy() for c in campo)
+        return df[campo].to_numpy()
+
+    def evaluar(self, df):
+        """Bitset de reglas que aplican a cada fila de `df`."""
+        mascaras = np.zeros(len(df), dtype=np.uint64)
+        columnas = {}
+        for bit, regla in enumerate(self.reglas):
+            aplica = np.ones(len(df), dtype=bool)
+            for campo, operador, valor in regla["condiciones"]:
+                clave = tuple(campo) if isinstance(campo, list) else campo
+                if clave not in columnas:
+                    columnas[clave] = self._valores(df, campo)
+                aplica &= OPERADORES[operador](columnas[clave], valor)
+            mascaras[aplica] |= np.uint64(1 << bit)
+        return mascaras
+
+    def _bits(self, mascara):
+        return [bit for bit in range(len(self.reglas)) if mascara >> bit & 1]
+
+    def textos_fila(self, mascara, fila):
+        """Lista de mensajes de una fila a partir de su bitset."""
+        mascara = int(mascara)
+        bits = self._bits_por_mascara.get(mascara)
+        if bits is None:
+            bits = self._bits_por_mascara[mascara] = self._bits(mascara)
+        textos = []
+        for bit in bits:
+            mensaje = self.reglas[bit]["mensaje"]
+            if self._campos_mensaje[bit]:
+                mensaje = mensaje.format_map({c: fila.get(c) for c in self._campos_mensaje[bit]})
+            textos.append(mensaje)
+        return textos
+
+    def textos(self, df):
+        """Serie con la lista de mensajes de cada fila de `df` (columna `Insights` con bitsets)."""
+        campos = sorted({c for lista in self._campos_mensaje for c in lista})
+        filas = df[campos].to_dict(orient="records") if campos else [{}] * len(df)
+        return pd.Series(
+            [self.textos_fila(m, f) for m, f in zip(df["Insights"].to_numpy(), filas)],
+            index=df.index, dtype=object,
+        )
+
+
+def cargar_motor(ruta=RUTA_REGLAS):
+    with open(ruta, "rb") as f:
+        return MotorInsights.desde_json(f.read())
+
+
+def materializar(df, motor, campos=None):
+    """`df` (solo `campos` si se indican) con los bitsets de `Insights` convertidos en listas de mensajes."""
+    seleccion = df if campos is None else df[list(campos)]
+    if "Insights" not in seleccion.columns or seleccion["Insights"].dtype != np.uint64:
+        return seleccion
+    return seleccion.assign(Insights=motor.textos(df))
@@ -0,0 +1,117 @@
+# motor_puntajes.py
+import numpy as np
+import pandas as pd
+
+SEGMENTOS = ["TRL 1-3", "TRL 4-7", "TRL 8-9"]
+UMBRAL_APROBACION = 50
+
+# Campo de Gravity Forms (formulario 9) que responde cada pregunta del diccionario
+CAMPOS_POR_PREGUNTA = {
+    "¿Tu proyecto es innovador? Marca todas las opciones que apliquen.": "38",
+    "¿El problema que aborda tu proyecto está claramente identificado y justificado?": "40",
+    "¿Cómo evaluarías la viabilidad técnica de tu proyecto?": "42",
+    "¿Tu proyecto cuenta con respaldo de investigación previa? Marca todas las opciones que apliquen.": "44",
+    "¿Han realizado pruebas y validaciones iniciales?": "51",
+    "¿Cómo ha sido desarrollado el prototipo de tu proyecto?": "52",
+    "¿Qué pruebas de funcionamiento han sido realizadas en el prototipo?": "57",
+    "¿El prototipo ha sido validado en un entorno relevante o similar al real?": "59",
+    "¿Se han realizado iteraciones o mejoras en el prototipo después de las pruebas iniciales?": "60",
+    "¿El prototipo ha demostrado ser capaz de funcionar en condiciones cercanas al entorno real o simulado de manera efectiva?": "61",
+    "¿Cómo ha sido desarrollado el MVP de tu proyecto?": "64",
+    "¿Qué pruebas de funcionamiento ha realizado tu MVP?": "65",
+    "¿El MVP ha sido validado en un entorno relevante o similar al mercado real?": "66",
+    "¿Existen iteraciones y mejoras después de las pruebas iniciales?": "68",
+    "¿El MVP ha demostrado ser capaz de operar en condiciones comerciales o reales de manera efectiva?": "70",
+}
+
+
+class MotorPuntajes:
+    """Diccionario compilado: campos a evaluar y tabla respuesta -> puntos por segmento.
+
+    Una respuesta que aparece en varias preguntas suma los puntos de todas ellas,
+    igual que el cálculo fila por fila que usaban las apps de Streamlit.
+    """
+
+    def __init__(self, campos, tabla, evaluar_todo=False):
+        self.campos = campos
+        self.tabla = tabla
+        self.evaluar_todo = evaluar_todo
+        self._ceros = np.zeros(len(SEGMENTOS))
+
+    def campos_de(self, df):
+        if self.evaluar_todo:
+            return list(df.columns)
+        return [campo for campo in self.campos if campo in df.columns]
+
+    def puntos(self, valores):
+        """Matriz (len(valores) + 1, segmentos); la última fila son ceros para los códigos -1."""
+        filas = [self.tabla.get(valor, self._ceros) for valor in valores]
+        filas.append(self._ceros)
+        return np.vstack(filas)
+
+
+def compilar_diccionario(diccionario):
+    campos = []
+    tabla = {}
+    evaluar_todo = False
+
+    for pregunta, respuestas_map in diccionario.items():
+        campo = CAMPOS_POR_PREGUNTA.get(pregunta)
+        if campo is None:
+            # Pregunta sin campo conocido: se busca en todas las columnas como antes
+            evaluar_todo = True
+        elif campo not in campos:
+            campos.append(campo)
+
+        for respuesta, datos in respuestas_map.items():
+            if respuesta not in tabla:
+                tabla[respuesta] = np.zeros(len(SEGMENTOS))
+            tabla[respuesta][SEGMENTOS.index(datos["segmento"])] += datos["puntaje"]
+
+    return MotorPuntajes(campos, tabla, evaluar_todo)
+
+
+def calcular_puntajes(df, motor):
+    """Puntaje base por segmento para todas las filas, evaluando columna por columna."""
+    total = np.zeros((len(df), len(SEGMENTOS)))
+    for campo in motor.campos_de(df):
+        codigos, valores = pd.factorize(df[campo])
+        total += motor.puntos(valores)[codigos]
+    return total
+
+
+def calcular_extra(df):
+    """Bonificación por nivel de inglés (+2 intermedio, +4 avanzado) y docente acompañante (+10)."""
+    extra = np.zeros(len(df))
+
+    if "Nivel de Inglés" in df.columns:
+        nivel_ingles = df["Nivel de Inglés"].astype(str).str.strip().str.lower()
+        intermedio = nivel_ingles.str.contains("intermedio", regex=False).to_numpy()
+        avanzado = nivel_ingles.str.contains("avanzado", regex=False).to_numpy()
+        extra += np.where(intermedio, 2, np.where(avanzado, 4, 0))
+
+    if "Docente Acompañante" in df.columns:
+        docente = df["Docente Acompañante"].astype(str).str.strip().str.lower()
+        extra += np.where(docente.to_numpy() == "si", 10, 0)
+
+    return extra
+
+
+def segmentar_trl(niveles):
+    """Segmento TRL de cada nivel: 1-3, 4-7, 8-9 o "Desconocido"."""
+    valores = niveles.to_numpy()
+    segmentos = np.select(
+        [(valores >= 1) & (valores <= 3), (valores >= 4) & (valores <= 7), (valores >= 8) & (valores <= 9)],
+        SEGMENTOS,
+        default="Desconocido",
+    )
+    return pd.Series(segmentos, index=niveles.index, dtype=object)
+
+
+def puntuar(df, motor):
+    """Agrega las columnas `Puntaje <segmento>` y `Aprobado` a `df`."""
+    puntajes = calcular_puntajes(df, motor) + calcular_extra(df)[:, None]
+    for i, segmento in enumerate(SEGMENTOS):
+        df[f"Puntaje {segmento}"] = puntajes[:, i]
+    df["Aprobado"] = np.where((puntajes >= UMBRAL_APROBACION).any(axis=1), "Sí", "No")
+    return df
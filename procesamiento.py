@@ -0,0 +1,112 @@
+# procesamiento.py
+import pandas as pd
+
+from insights import cargar_motor
+from motor_puntajes import CAMPOS_POR_PREGUNTA, compilar_diccionario, puntuar, segmentar_trl
+
+COLUMNAS_RENOMBRADAS = {
+    "1": "Nombre del Proyecto",
+    "14": "Nivel TRL",
+    "15": "Docente Acompañante",
+    "17": "Nivel de Inglés",
+    "30": "Ubicación",
+    "3": "Industria"
+}
+
+# Cambia cuando cambia la forma del frame procesado, para no reutilizar frames guardados con la anterior
+VERSION_PROCESAMIENTO = b"3"
+
+# Metadatos de Gravity Forms que nada usa después de procesar (`id` y `date_updated` sí: son la clave incremental)
+COLUMNAS_DESCARTADAS = [
+    "form_id", "post_id", "is_starred", "is_read", "ip", "source_url", "user_agent",
+    "currency", "payment_status", "payment_date", "payment_amount", "payment_method",
+    "transaction_id", "is_fulfilled", "created_by", "transaction_type", "status", "source_id"
+]
+
+# Texto libre largo (descripción del proyecto y problema que aborda): no entra al frame
+# procesado, se guarda aparte y se lee por id solo cuando se pide (`almacen_datos.TablaTextos`)
+COLUMNAS_FRIAS = ["12", "13"]
+
+# Tipos del frame procesado: texto de pocos valores como categoría y puntajes en 32 bits
+ESQUEMA = {
+    "Aprobado": "category",
+    "Segmento TRL": "category",
+    "Industria": "category",
+    "Ubicación": "category",
+    "Nivel de Inglés": "category",
+    "Nivel TRL": "int16",
+    "Puntaje TRL 1-3": "float32",
+    "Puntaje TRL 4-7": "float32",
+    "Puntaje TRL 8-9": "float32",
+    "Puntaje Total": "float32",
+}
+
+def compactar(df):
+    """Frame procesado con el esquema compacto, sin las columnas descartadas ni las de texto largo."""
+    df = df.drop(columns=[c for c in COLUMNAS_DESCARTADAS + COLUMNAS_FRIAS if c in df.columns])
+    tipos = {c: t for c, t in ESQUEMA.items() if c in df.columns}
+    # Las respuestas de opción múltiple repiten unas pocas frases largas
+    tipos.update({c: "category" for c in CAMPOS_POR_PREGUNTA.values() if c in df.columns and df[c].dtype == object})
+    if (df["Nivel TRL"] % 1 != 0).any():
+        # Un nivel con decimales no cabe en un entero: se deja en coma flotante
+        tipos["Nivel TRL"] = "float32"
+    return df.astype(tipos)
+
+def memoria(df):
+    """Bytes que ocupa `df` en memoria, contando el contenido de los textos."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def procesar_datos_completos(df, diccionario, motor_insights=None):
+    df = df.rename(columns=COLUMNAS_RENOMBRADAS)
+
+    df["Nivel TRL"] = pd.to_numeric(df["Nivel TRL"], errors="coerce").fillna(0)
+    df["Segmento TRL"] = segmentar_trl(df["Nivel TRL"])
+    df = puntuar(df, compilar_diccionario(diccionario))
+
+    df["Docente Acompañante"] = df["Docente Acompañante"].astype(str).str.strip().str.upper() == "SI"
+    df["Nivel de Inglés"] = df["Nivel de Inglés"].fillna("No especificado").str.strip().str.capitalize()
+    df["Puntaje Total"] = df["Puntaje TRL 1-3"] + df["Puntaje TRL 4-7"] + df["Puntaje TRL 8-9"]
+    # Bitset de reglas de insights_config.json; el texto se arma con `insights.materializar`
+    df["Insights"] = (motor_insights or cargar_motor()).evaluar(df)
+
+    return compactar(df)
+
+def _claves_entrada(df):
+    """Clave por entrada de Gravity Forms: `id` + `date_updated`, o None si no es utilizable."""
+    if "id" not in df.columns or "date_updated" not in df.columns:
+        return None
+    claves = df["id"].astype(str) + "|" + df["date_updated"].astype(str)
+    if claves.duplicated().any():
+        return None
+    return claves
+
+def procesar_incremental(df, diccionario, previo=None, motor_insights=None):
+    """Procesa solo las entradas nuevas o modificadas y reutiliza el resto de `previo`.
+
+    `previo` debe haberse procesado con el mismo diccionario y reglas de insights. Las entradas que ya no
+    están en `df` se descartan. Devuelve el frame procesado y un resumen de cambios.
+    """
+    claves = _claves_entrada(df)
+    claves_previas = _claves_entrada(previo) if previo is not None else None
+    columnas = [c for c in df.rename(columns=COLUMNAS_RENOMBRADAS).columns if c not in COLUMNAS_DESCARTADAS + COLUMNAS_FRIAS]
+
+    if claves is None or claves_previas is None or list(previo.columns[:len(columnas)]) != columnas:
+        return procesar_datos_completos(df, diccionario, motor_insights), {
+            "procesadas": len(df), "reutilizadas": 0, "eliminadas": 0, "completo": True
+        }
+
+    reutilizables = claves.isin(claves_previas)
+    posiciones = pd.Index(claves_previas).get_indexer(claves[reutilizables])
+    partes = [previo.iloc[posiciones].set_axis(df.index[reutilizables])]
+    if not reutilizables.all():
+        partes.append(procesar_datos_completos(df[~reutilizables], diccionario, motor_insights))
+
+    # Las categorías de cada parte pueden diferir: se vuelve a compactar el resultado
+    resultado = compactar(pd.concat(partes).loc[df.index])
+    ids_vigentes = df["id"].astype(str)
+    return resultado, {
+        "procesadas": int((~reutilizables).sum()),
+        "reutilizadas": int(reutilizables.sum()),
+        "eliminadas": int((~previo["id"].astype(str).isin(ids_vigentes)).sum()),
+        "completo": False,
+    }
@@ -1,12 +1,25 @@
 # reporte.py
+import os
 from string import Template
 
+# Plantillas ya leídas: ruta -> (fecha de modificación, Template)
+_plantillas = {}
+
+def _cargar_plantilla(plantilla_path):
+    """Lee la plantilla una sola vez; se vuelve a leer solo si el archivo cambió."""
+    modificado = os.stat(plantilla_path).st_mtime_ns
+    guardada = _plantillas.get(plantilla_path)
+    if guardada is None or guardada[0] != modificado:
+        with open(plantilla_path, "r", encoding="utf-8") as f:
+            guardada = (modificado, Template(f.read()))
+        _plantillas[plantilla_path] = guardada
+    return guardada[1]
+
 def generar_html_reporte(nombre, puntajes, aprobado, plantilla_path="assets/reporte_template.html"):
     estado_texto = "APROBADO ✅" if aprobado == "Sí" else "NO APROBADO ❌"
     estado_clase = "aprobado" if aprobado == "Sí" else "rechazado"
 
-    with open(plantilla_path, "r", encoding="utf-8") as f:
-        html_template = Template(f.read())
+    html_template = _cargar_plantilla(plantilla_path)
 
     html_render = html_template.safe_substitute({
         "nombre": nombre,
@@ -0,0 +1,299 @@
+# reportes.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+
+from jinja2 import FileSystemBytecodeCache
+
+from agregaciones import CacheLRU
+from bloqueos import BloqueoArchivo
+from buscador import normalizar
+from tareas import TareaGuardada
+
+PLANTILLA_PROYECTO = "reports/reporte_template.html"
+PLANTILLA_TOP10 = "reports/reporte_top10.html"
+PLANTILLA_BASE = "reports/base.html"
+MAX_REPORTES_CACHE = 512
+MAX_EXPORTACIONES_GUARDADAS = 20
+# Avance de las descargas masivas, compartido entre workers
+DIRECTORIO_EXPORTACIONES = os.getenv("EXPORTACIONES_DIR", "exportaciones_reportes")
+# Cada cuánto se escribe en disco el avance de una exportación en curso
+INTERVALO_GUARDADO_S = 0.5
+# Bytecode compilado de las plantillas, compartido entre reinicios y procesos
+DIRECTORIO_BYTECODE = os.getenv("JINJA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "dashboard_trl_jinja"))
+
+
+def contexto_proyecto(proyecto, motor_insights):
+    """Variables de plantilla para una fila del dataset procesado."""
+    return {
+        "nombre_proyecto": proyecto["Nombre del Proyecto"],
+        "aprobado": proyecto["Aprobado"],
+        "nivel_trl": proyecto["Nivel TRL"],
+        "segmento_trl": proyecto["Segmento TRL"],
+        "docente_acompanante": "Sí" if proyecto["Docente Acompañante"] else "No",
+        "ubicacion": proyecto.get("Ubicación", "No especificada"),
+        "nivel_ingles": proyecto.get("Nivel de Inglés", "No especificado"),
+        "trl_1_3": proyecto["Puntaje TRL 1-3"],
+        "trl_4_7": proyecto["Puntaje TRL 4-7"],
+        "trl_8_9": proyecto["Puntaje TRL 8-9"],
+        "puntaje_total": proyecto["Puntaje Total"],
+        # Bitset calculado al procesar el dataset; aquí se arman los textos
+        "insights": motor_insights.textos_fila(proyecto["Insights"], proyecto),
+    }
+
+
+class RenderizadorReportes:
+    """Renderiza reportes HTML y guarda el resultado por (proyecto, versión del dataset, versión de plantilla)."""
+
+    def __init__(self, templates, maximo=MAX_REPORTES_CACHE, directorio_bytecode=DIRECTORIO_BYTECODE):
+        self.templates = templates
+        if directorio_bytecode:
+            os.makedirs(directorio_bytecode, exist_ok=True)
+            templates.env.bytecode_cache = FileSystemBytecodeCache(directorio_bytecode)
+        self.cache = CacheLRU(maximo)
+        self._versiones = {}
+
+    def version_plantilla(self, nombre):
+        """Hash del archivo de la plantilla; solo se vuelve a leer si cambió su fecha o tamaño."""
+        ruta = os.path.join(self.templates.env.loader.searchpath[0], nombre)
+        info = os.stat(ruta)
+        firma = (info.st_mtime_ns, info.st_size)
+        guardada = self._versiones.get(nombre)
+        if guardada is None or guardada[0] != firma:
+            with open(ruta, "rb") as f:
+                guardada = (firma, hashlib.sha256(f.read()).hexdigest()[:12])
+            self._versiones[nombre] = guardada
+        return guardada[1]
+
+    def renderizar(self, nombre, contexto, request):
+        contexto = {
+            **contexto,
+            "request": request,
+            "fecha_generacion": datetime.now().strftime("%d/%m/%Y %H:%M"),
+        }
+        return self.templates.get_template(nombre).render(contexto)
+
+    def _clave(self, snapshot, nombre, request, *partes):
+        # La URL base entra en la clave porque `url_for` genera enlaces absolutos
+        version = self.version_plantilla(nombre) + self.version_plantilla(PLANTILLA_BASE)
+        return (nombre, version, snapshot.version, str(request.base_url), *partes)
+
+    def reporte_proyecto(self, snapshot, posicion, request, guardar=True):
+        proyecto = snapshot.df.iloc[posicion]
+        clave = self._clave(snapshot, PLANTILLA_PROYECTO, request, str(proyecto["id"]))
+        return self.cache.obtener(
+            clave,
+            lambda: self.renderizar(PLANTILLA_PROYECTO, contexto_proyecto(proyecto, snapshot.motor_insights), request),
+            guardar,
+        )
+
+    def reporte_top10(self, snapshot, request):
+        def calcular():
+            top10 = snapshot.df.sort_values(by="Puntaje Total", ascending=False).head(10)
+            proyectos = [contexto_proyecto(proyecto, snapshot.motor_insights) for _, proyecto in top10.iterrows()]
+            return self.renderizar(PLANTILLA_TOP10, {"proyectos": proyectos}, request)
+        return self.cache.obtener(self._clave(snapshot, PLANTILLA_TOP10, request), calcular)
+
+
+_posiciones_por_nombre = CacheLRU(MAX_REPORTES_CACHE)
+
+
+def buscar_por_nombre(snapshot, nombre):
+    """Posición de la primera fila cuyo nombre contiene `nombre` (sin distinguir mayúsculas), o None."""
+    def calcular():
+        coincide = snapshot.df["Nombre del Proyecto"].str.contains(nombre, case=False, regex=False, na=False).to_numpy()
+        return int(coincide.argmax()) if coincide.any() else None
+    return _posiciones_por_nombre.obtener((snapshot.version, nombre.casefold()), calcular)
+
+
+class ExportacionReportes:
+    """Avance de una descarga masiva de reportes, consultable mientras se genera el ZIP."""
+
+    def __init__(self, id=None, total=0):
+        self.id = id or uuid.uuid4().hex[:12]
+        self.total = total
+        self.generados = 0
+        self.estado = "pendiente"
+        self.error = None
+        self.inicio = datetime.now()
+        self.fin = None
+        self.al_cambiar = None
+        self._guardado = 0.0
+
+    def _notificar(self):
+        self._guardado = time.monotonic()
+        if self.al_cambiar is not None:
+            self.al_cambiar(self)
+
+    def iniciar(self, total):
+        self.total = total
+        self.estado = "ejecutando"
+        self.inicio = datetime.now()
+        self._notificar()
+
+    def avanzar(self):
+        self.generados += 1
+        if time.monotonic() - self._guardado >= INTERVALO_GUARDADO_S:
+            self._notificar()
+
+    def terminar(self, error=None):
+        self.error = error
+        self.estado = "error" if error else "completado"
+        self.fin = datetime.now()
+        self._notificar()
+
+    def a_dict(self):
+        return {
+            "id": self.id,
+            "estado": self.estado,
+            "generados": self.generados,
+            "total": self.total,
+            "error": self.error,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "fin": self.fin.isoformat(timespec="seconds") if self.fin else None,
+        }
+
+
+class RegistroExportaciones:
+    """Exportaciones masivas con id generado por el servidor y avance guardado en disco.
+
+    `reservar` crea el id antes de abrir la descarga; `iniciar` la toma una sola
+    vez, en el worker que atienda la descarga, y `obtener` lee el avance desde
+    cualquier worker.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_EXPORTACIONES):
+        self.directorio = directorio
+
+    def _ruta(self, id):
+        return os.path.join(self.directorio, f"{id}.json")
+
+    def _guardar(self, exportacion):
+        os.makedirs(self.directorio, exist_ok=True)
+        temporal = f"{self._ruta(exportacion.id)}.{threading.get_ident()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(exportacion.a_dict(), f, ensure_ascii=False)
+        os.replace(temporal, self._ruta(exportacion.id))
+
+    def _podar(self):
+        guardadas = sorted(
+            (e for e in os.scandir(self.directorio) if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        for entrada in guardadas[:-MAX_EXPORTACIONES_GUARDADAS]:
+            try:
+                os.remove(entrada.path)
+            except FileNotFoundError:
+                pass
+
+    def _leer(self, id):
+        if not id.isalnum():
+            return None
+        try:
+            with open(self._ruta(id), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def reservar(self):
+        exportacion = ExportacionReportes()
+        exportacion.al_cambiar = self._guardar
+        self._guardar(exportacion)
+        self._podar()
+        return exportacion
+
+    def iniciar(self, id, total):
+        """Empieza la exportación reservada `id`, o None si no existe o ya se usó."""
+        with BloqueoArchivo("exportaciones"):
+            datos = self._leer(id)
+            if datos is None or datos["estado"] != "pendiente":
+                return None
+            exportacion = ExportacionReportes(id)
+            exportacion.al_cambiar = self._guardar
+            exportacion.iniciar(total)
+        return exportacion
+
+    def obtener(self, id):
+        datos = self._leer(id)
+        return None if datos is None else TareaGuardada(datos)
+
+
+class _SalidaZip:
+    """Destino sin `seek` para `zipfile`: acumula lo escrito hasta que se vacía."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def _nombre_archivo(proyecto):
+    nombre = normalizar(proyecto["Nombre del Proyecto"]).replace(" ", "_")[:60] or "proyecto"
+    return f"{proyecto['id']}_{nombre}.html"
+
+
+def zip_reportes(renderizador, snapshot, posiciones, request, exportacion, trabajos):
+    """Genera el ZIP con el reporte de cada posición, en bloques de bytes.
+
+    Los reportes se renderizan en `trabajos` (el `PoolTrabajos` compartido
+    con los endpoints) y cada uno se agrega al ZIP en cuanto termina. Cada
+    descarga tiene a lo sumo `trabajos.hilos` reportes en vuelo: la memoria no
+    crece con la cantidad de proyectos y las demás peticiones no esperan
+    detrás de toda la exportación.
+    """
+    salida = _SalidaZip()
+    pendientes = iter(posiciones.tolist())
+    en_vuelo = {}
+
+    def renderizar(posicion):
+        proyecto = snapshot.df.iloc[posicion]
+        return _nombre_archivo(proyecto), renderizador.reporte_proyecto(snapshot, posicion, request, guardar=False)
+
+    try:
+        with zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_DEFLATED) as archivo:
+            while True:
+                while len(en_vuelo) < trabajos.hilos:
+                    posicion = next(pendientes, None)
+                    if posicion is None:
+                        break
+                    en_vuelo[trabajos.enviar(renderizar, posicion)] = posicion
+                if not en_vuelo:
+                    break
+
+                listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    del en_vuelo[futuro]
+                    nombre, html = futuro.result()
+                    archivo.writestr(nombre, html)
+                    exportacion.avanzar()
+                yield salida.vaciar()
+        yield salida.vaciar()
+    except GeneratorExit:
+        exportacion.terminar(error="Descarga cancelada")
+        raise
+    except Exception as e:
+        exportacion.terminar(error=str(e))
+        raise
+    else:
+        exportacion.terminar()
+    finally:
+        # Lo que quedó en cola al cancelar o fallar no ocupa el pool
+        for futuro in en_vuelo:
+            futuro.cancel()
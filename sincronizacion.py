@@ -0,0 +1,111 @@
+# sincronizacion.py
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+RUTA_ESTADO = "estado_sincronizacion.json"
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+# Cada cuánto se hace una descarga completa para detectar entradas eliminadas
+HORAS_RECONCILIACION = float(os.getenv("GF_RECONCILIAR_HORAS", "24"))
+
+
+def cargar_estado(ruta=RUTA_ESTADO):
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def guardar_estado(estado, ruta=RUTA_ESTADO):
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(estado, f, indent=2)
+    os.replace(temporal, ruta)
+
+
+def marca_de_agua(df):
+    """Última `date_updated` e `id` más alto presentes en las entradas."""
+    return {
+        "ultima_actualizacion": str(df["date_updated"].max()),
+        "ultimo_id": int(pd.to_numeric(df["id"], errors="coerce").max()),
+    }
+
+
+def _claves(df):
+    return df["id"].astype(str) + "|" + df["date_updated"].astype(str)
+
+
+def fusionar_entradas(actual, nuevas):
+    """Reemplaza por `id` las entradas modificadas y agrega las nuevas.
+
+    Conserva el orden de columnas del archivo local y el orden de Gravity Forms
+    (id descendente).
+    """
+    ids_nuevos = set(nuevas["id"].astype(str))
+    conservadas = actual[~actual["id"].astype(str).isin(ids_nuevos)]
+    columnas = list(actual.columns) + [c for c in nuevas.columns if c not in actual.columns]
+
+    fusion = pd.concat([nuevas, conservadas], ignore_index=True)[columnas]
+    orden = pd.to_numeric(fusion["id"], errors="coerce").sort_values(ascending=False, kind="stable").index
+    return fusion.loc[orden].reset_index(drop=True)
+
+
+def requiere_reconciliacion(estado, existen_crudos, ahora=None):
+    ahora = ahora or datetime.now()
+    ultima = estado.get("ultima_reconciliacion")
+    if not existen_crudos or "ultima_actualizacion" not in estado or ultima is None:
+        return True
+    return ahora - datetime.fromisoformat(ultima) >= timedelta(hours=HORAS_RECONCILIACION)
+
+
+def sincronizar(usuario, clave_app, url_base, almacen, forzar_completo=False, ruta_estado=RUTA_ESTADO, progreso=None, fase=None):
+    """Trae de Gravity Forms solo lo nuevo desde la última marca de agua y lo publica en `almacen`.
+
+    Si no hay estado previo, pasó el intervalo de reconciliación o se pide
+    `forzar_completo`, descarga el formulario entero y reemplaza el archivo local,
+    lo que elimina las entradas borradas en Gravity Forms. `progreso` se pasa
+    a `descargar_entradas` y `fase(nombre)` se llama al empezar cada etapa.
+    """
+    # `requests` solo se carga cuando hay que descargar, no al arrancar la API
+    from auth import descargar_entradas, parametros_actualizadas
+
+    fase = fase or (lambda nombre: None)
+    estado = cargar_estado(ruta_estado)
+    ahora = datetime.now()
+
+    if forzar_completo or requiere_reconciliacion(estado, almacen.existen_crudos(), ahora):
+        fase("descargando")
+        df, descarga = descargar_entradas(usuario, clave_app, url_base, progreso=progreso)
+        if df.empty:
+            return {"modo": "completo", "entradas": 0, "total": 0, "descarga": descarga}
+        fase("procesando")
+        almacen.guardar_crudos(df)
+        estado = {**marca_de_agua(df), "ultima_reconciliacion": ahora.isoformat(timespec="seconds")}
+        guardar_estado(estado, ruta_estado)
+        return {"modo": "completo", "entradas": len(df), "total": len(df), "descarga": descarga}
+
+    # Un segundo de solapamiento: date_updated tiene resolución de segundos y
+    # las entradas repetidas se deduplican por id al fusionar
+    desde = datetime.strptime(estado["ultima_actualizacion"], FORMATO_FECHA) - timedelta(seconds=1)
+    fase("descargando")
+    nuevas, descarga = descargar_entradas(
+        usuario, clave_app, url_base, parametros_actualizadas(desde.strftime(FORMATO_FECHA)), progreso=progreso
+    )
+
+    fase("fusionando")
+    actual = almacen.cargar_crudos()
+    if not nuevas.empty:
+        # Descartar lo que ya está en el archivo local (solapamiento de la marca de agua)
+        conocidas = set(_claves(actual))
+        nuevas = nuevas[~_claves(nuevas).isin(conocidas)]
+    if nuevas.empty:
+        return {"modo": "incremental", "entradas": 0, "total": len(actual), "descarga": descarga}
+
+    fusion = fusionar_entradas(actual, nuevas)
+    fase("procesando")
+    almacen.guardar_crudos(fusion)
+    estado.update(marca_de_agua(fusion))
+    guardar_estado(estado, ruta_estado)
+    return {"modo": "incremental", "entradas": len(nuevas), "total": len(fusion), "descarga": descarga}
@@ -0,0 +1,201 @@
+# tablero.py
+import numpy as np
+import pandas as pd
+
+from insights import materializar
+from visualizaciones import graficos_generales, datos_graficos
+
+SECCIONES = ("metricas", "graficos", "proyectos", "insights")
+
+COLUMNAS_PROYECTOS = [
+    "id", "Nombre del Proyecto", "Aprobado", "Puntaje TRL 1-3",
+    "Puntaje TRL 4-7", "Puntaje TRL 8-9", "Puntaje Total",
+    "Segmento TRL", "Industria", "Insights"
+]
+
+def calcular_metricas(df):
+    # Top proyecto por segmento TRL
+    top_proyectos_trl = {}
+    for segmento in ["TRL 1-3", "TRL 4-7", "TRL 8-9"]:
+        filtro = df[df["Segmento TRL"] == segmento]
+        if not filtro.empty:
+            top_row = filtro.loc[filtro["Puntaje Total"].idxmax()]
+            top_proyectos_trl[segmento] = top_row["Nombre del Proyecto"]
+
+    # Nivel de inglés más común
+    nivel_ingles_mas_comun = df["Nivel de Inglés"].mode().iloc[0] if not df["Nivel de Inglés"].empty else "No especificado"
+
+    return {
+        "formularios": len(df),
+        "trl_max": int(df["Nivel TRL"].max()),
+        "aprobados": int((df["Aprobado"] == "Sí").sum()),
+        "docente_si": int(df["Docente Acompañante"].sum()),
+        "docente_no": len(df) - int(df["Docente Acompañante"].sum()),
+        "puntaje_maximo": round(float(df["Puntaje Total"].max()), 1),
+        "top_proyectos_trl": top_proyectos_trl,
+        "nivel_ingles_mas_comun": nivel_ingles_mas_comun
+    }
+
+def calcular_graficos_plotly(df):
+    """Figuras Plotly completas (formato anterior de /datos-graficos)."""
+    fig1, fig2, fig3, fig4, fig5, fig6, fig7 = graficos_generales(
+        df, "Industria", "Nivel de Inglés", "Ubicación"
+    )
+    return {
+        "grafico_1": fig1.to_json(),
+        "grafico_2": fig2.to_json(),
+        "grafico_3": fig3.to_json(),
+        "grafico_4": fig4.to_json(),
+        "grafico_5": fig5.to_json() if fig5 else None,
+        "grafico_6": fig6.to_json() if fig6 else None,
+        "grafico_7": fig7.to_json() if fig7 else None,
+    }
+
+# Columnas por las que se puede ordenar /proyectos y filtros disponibles (parámetro -> columna)
+COLUMNAS_ORDENABLES = [
+    "Puntaje TRL 1-3", "Puntaje TRL 4-7", "Puntaje TRL 8-9",
+    "Puntaje Total", "Nivel TRL", "Nombre del Proyecto"
+]
+FILTROS_PROYECTOS = {"segmento": "Segmento TRL", "industria": "Industria", "aprobado": "Aprobado"}
+
+def listar_proyectos(df, motor_insights):
+    return materializar(df, motor_insights, COLUMNAS_PROYECTOS).to_dict(orient="records")
+
+def _orden(snapshot, columna, descendente, aprobados_primero):
+    """Posiciones de fila ordenadas por `columna`, calculadas una vez por versión; los vacíos van al final."""
+    def calcular():
+        valores = snapshot.df[columna]
+        if pd.api.types.is_numeric_dtype(valores):
+            clave = valores.to_numpy(dtype=float)
+        else:
+            # Texto: rango alfabético sin distinguir mayúsculas
+            clave = pd.factorize(valores.str.casefold(), sort=True)[0].astype(float)
+            clave[clave < 0] = np.nan
+        if descendente:
+            clave = -clave
+        clave = np.where(np.isnan(clave), np.inf, clave)
+        claves = [np.arange(len(clave)), clave]
+        if aprobados_primero:
+            claves.append((snapshot.df["Aprobado"] != "Sí").to_numpy())
+        return np.lexsort(claves)
+    return snapshot.memo(("orden", columna, descendente, aprobados_primero), calcular)
+
+def _filtro(snapshot, columna, valor):
+    # Solo se guardan máscaras de valores presentes: lo que mande el cliente no hace crecer el snapshot
+    presentes = snapshot.memo(("valores", columna), lambda: set(snapshot.df[columna].dropna().unique()))
+    if valor not in presentes:
+        return np.zeros(len(snapshot.df), dtype=bool)
+    return snapshot.memo(("filtro", columna, valor), lambda: (snapshot.df[columna] == valor).to_numpy())
+
+def posiciones_proyectos(snapshot, orden=None, aprobados_primero=False, filtros=None):
+    """Posiciones de fila que pasan `filtros` (parámetro -> valor), en el orden pedido."""
+    if orden is not None:
+        columna = orden.removeprefix("-")
+        if columna not in COLUMNAS_ORDENABLES:
+            raise ValueError(f"No se puede ordenar por: {columna}")
+        posiciones = _orden(snapshot, columna, orden.startswith("-"), aprobados_primero)
+    elif aprobados_primero:
+        posiciones = np.argsort((snapshot.df["Aprobado"] != "Sí").to_numpy(), kind="stable")
+    else:
+        posiciones = np.arange(len(snapshot.df))
+
+    for parametro, valor in (filtros or {}).items():
+        if valor is not None:
+            posiciones = posiciones[_filtro(snapshot, FILTROS_PROYECTOS[parametro], valor)[posiciones]]
+    return posiciones
+
+def pagina_proyectos(snapshot, limite=None, desplazamiento=0, orden=None,
+                     aprobados_primero=False, filtros=None, campos=None):
+    """Página de proyectos filtrada y ordenada.
+
+    `orden` es una columna de `COLUMNAS_ORDENABLES`, con `-` delante para
+    orden descendente. Sin parámetros devuelve la lista completa de siempre.
+    """
+    filtros = {k: v for k, v in (filtros or {}).items() if v is not None}
+    campos = list(dict.fromkeys(campos or COLUMNAS_PROYECTOS))
+    desconocidos = [c for c in campos if c not in snapshot.df.columns]
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(desconocidos)}")
+
+    if limite is None and not desplazamiento and orden is None and not aprobados_primero and not filtros and campos == COLUMNAS_PROYECTOS:
+        proyectos = seccion(snapshot, "proyectos")
+        return {"proyectos": proyectos, "total": len(proyectos), "limite": None, "desplazamiento": 0}
+
+    posiciones = posiciones_proyectos(snapshot, orden, aprobados_primero, filtros)
+
+    fin = desplazamiento + limite if limite is not None else None
+    pagina = snapshot.df.iloc[posiciones[desplazamiento:fin]]
+    return {
+        "proyectos": materializar(pagina, snapshot.motor_insights, campos).to_dict(orient="records"),
+        "total": len(posiciones),
+        "limite": limite,
+        "desplazamiento": desplazamiento,
+    }
+
+def calcular_insights_generales(df):
+    total = len(df)
+    aprobados = int((df["Aprobado"] == "Sí").sum())
+    porcentaje = round((aprobados / total) * 100, 1) if total > 0 else 0.0
+
+    distribucion = df["Segmento TRL"].astype(str).value_counts().to_dict()
+    distribucion = {str(k): int(v) for k, v in distribucion.items()}
+
+    # Los puntajes se guardan en float32; el promedio se calcula en doble precisión
+    promedios = {
+        "TRL 1-3": round(df["Puntaje TRL 1-3"].astype(float).mean(), 1),
+        "TRL 4-7": round(df["Puntaje TRL 4-7"].astype(float).mean(), 1),
+        "TRL 8-9": round(df["Puntaje TRL 8-9"].astype(float).mean(), 1),
+        "Total": round(df["Puntaje Total"].astype(float).mean(), 1)
+    }
+
+    top_rows = df.nlargest(3, "Puntaje Total")[["Nombre del Proyecto", "Puntaje Total"]]
+    top_proyectos = [
+        {"Nombre del Proyecto": str(row["Nombre del Proyecto"]), "Puntaje Total": round(float(row["Puntaje Total"]), 1)}
+        for _, row in top_rows.iterrows()
+    ]
+
+    insights = [
+        f"📊 {aprobados} de {total} proyectos están aprobados ({porcentaje}%)",
+        f"🏆 Proyecto con mayor puntaje: {top_proyectos[0]['Nombre del Proyecto']} ({top_proyectos[0]['Puntaje Total']} pts)" if top_proyectos else "No hay proyectos destacados",
+        f"🔍 Distribución TRL: {distribucion.get('TRL 1-3', 0)} inicial, {distribucion.get('TRL 4-7', 0)} en desarrollo, {distribucion.get('TRL 8-9', 0)} listos",
+        f"📈 Promedios: TRL 1-3: {promedios['TRL 1-3']}, TRL 4-7: {promedios['TRL 4-7']}, TRL 8-9: {promedios['TRL 8-9']}",
+        "💡 Recomendación: " + ("Mentoría a proyectos iniciales" if distribucion.get('TRL 1-3', 0) > distribucion.get('TRL 8-9', 0) else "Preparar implementación")
+    ]
+
+    return {
+        "metricas": {
+            "total_proyectos": total,
+            "aprobados": aprobados,
+            "porcentaje_aprobados": porcentaje,
+            "distribucion_trl": distribucion,
+            "promedios": promedios
+        },
+        "top_proyectos": top_proyectos,
+        "insights": insights
+    }
+
+CALCULOS = {
+    "metricas": calcular_metricas,
+    "graficos": datos_graficos,
+    "graficos_plotly": calcular_graficos_plotly,
+    "proyectos": listar_proyectos,
+    "insights": calcular_insights_generales,
+}
+
+# Secciones que arman los textos de insights y necesitan el motor de reglas
+CON_MOTOR_INSIGHTS = {"proyectos"}
+
+def seccion(snapshot, nombre):
+    """Sección del tablero calculada una sola vez por versión del dataset."""
+    def calcular():
+        if nombre in CON_MOTOR_INSIGHTS:
+            return CALCULOS[nombre](snapshot.df, snapshot.motor_insights)
+        return CALCULOS[nombre](snapshot.df)
+    return snapshot.memo(("tablero", nombre), calcular)
+
+def construir_tablero(snapshot, secciones=SECCIONES):
+    """Todas las secciones pedidas a partir de un mismo snapshot."""
+    tablero = {"version": snapshot.version}
+    for nombre in secciones:
+        tablero[nombre] = seccion(snapshot, nombre)
+    return tablero
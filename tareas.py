@@ -0,0 +1,290 @@
+# tareas.py
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bloqueos import BloqueoArchivo
+
+MAX_TAREAS_GUARDADAS = 20
+# Estado de cada tarea en disco, para consultarlo desde cualquier worker
+DIRECTORIO_TAREAS = os.getenv("TAREAS_DIR", "tareas_actualizacion")
+# Hilos para el trabajo bloqueante de los endpoints (pandas, Plotly, Excel, plantillas)
+HILOS_TRABAJOS = int(os.getenv("TRABAJOS_HILOS", "4"))
+
+
+class TareaActualizacion:
+    """Estado observable de una actualización que corre en segundo plano."""
+
+    def __init__(self, origen, opciones=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.origen = origen
+        self.opciones = opciones or {}
+        self.estado = "pendiente"
+        self.fase = None
+        self.paginas_descargadas = 0
+        self.paginas_totales = None
+        self.resultado = None
+        self.error = None
+        self.inicio = datetime.now()
+        self.fin = None
+        self._t0 = time.perf_counter()
+        self._duracion = None
+        self.al_cambiar = None
+
+    def _notificar(self):
+        if self.al_cambiar is not None:
+            self.al_cambiar(self)
+
+    def cambiar_fase(self, fase):
+        self.fase = fase
+        self._notificar()
+
+    def reportar_paginas(self, descargadas, totales):
+        self.paginas_descargadas = descargadas
+        self.paginas_totales = totales
+        self._notificar()
+
+    def terminar(self, resultado=None, error=None):
+        self.resultado = resultado
+        self.error = error
+        self.estado = "error" if error else "completado"
+        self.fase = None
+        self.fin = datetime.now()
+        self._duracion = time.perf_counter() - self._t0
+        self._notificar()
+
+    @property
+    def activa(self):
+        return self.estado in ("pendiente", "ejecutando")
+
+    def a_dict(self):
+        duracion = self._duracion if self._duracion is not None else time.perf_counter() - self._t0
+        return {
+            "id": self.id,
+            "origen": self.origen,
+            "estado": self.estado,
+            "fase": self.fase,
+            "paginas_descargadas": self.paginas_descargadas,
+            "paginas_totales": self.paginas_totales,
+            "filas_fusionadas": (self.resultado or {}).get("entradas"),
+            "resultado": self.resultado,
+            "error": self.error,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "fin": self.fin.isoformat(timespec="seconds") if self.fin else None,
+            "duracion_s": round(duracion, 2),
+        }
+
+
+class TareaGuardada:
+    """Tarea de otro worker, leída del estado que dejó en disco."""
+
+    def __init__(self, datos):
+        self.datos = datos
+        self.id = datos["id"]
+
+    @property
+    def activa(self):
+        return self.datos["estado"] in ("pendiente", "ejecutando")
+
+    def a_dict(self):
+        return self.datos
+
+
+class GestorActualizaciones:
+    """Ejecuta actualizaciones en un hilo aparte, de a una a la vez.
+
+    `funcion(tarea)` hace el trabajo con `tarea.opciones` y reporta el avance
+    en `tarea`. Si ya hay una actualización en curso, `iniciar` devuelve esa
+    misma tarea en lugar de lanzar otra. Con `directorio`, el estado de cada
+    tarea también se escribe en disco y `obtener` encuentra las de otros workers;
+    mientras corre, la tarea tiene tomado un `BloqueoArchivo`, así que `iniciar`
+    en cualquier worker devuelve la que está en curso.
+    """
+
+    def __init__(self, funcion, directorio=None):
+        self.funcion = funcion
+        self.directorio = directorio
+        self._tareas = {}
+        self._activa = None
+        self._lock = threading.Lock()
+
+    def _ruta(self, tarea_id):
+        return os.path.join(self.directorio, f"{tarea_id}.json")
+
+    def _guardar(self, tarea):
+        temporal = f"{self._ruta(tarea.id)}.{threading.get_ident()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(tarea.a_dict(), f, ensure_ascii=False, default=str)
+        os.replace(temporal, self._ruta(tarea.id))
+
+    def _podar_directorio(self):
+        guardadas = sorted(
+            (e for e in os.scandir(self.directorio) if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        for entrada in guardadas[:-MAX_TAREAS_GUARDADAS]:
+            try:
+                os.remove(entrada.path)
+            except FileNotFoundError:
+                pass
+
+    def _activa_guardada(self):
+        """La tarea activa más reciente que haya en disco, de cualquier worker."""
+        activas = []
+        for entrada in os.scandir(self.directorio):
+            if not entrada.name.endswith(".json"):
+                continue
+            try:
+                with open(entrada.path, encoding="utf-8") as f:
+                    tarea = TareaGuardada(json.load(f))
+                if tarea.activa:
+                    activas.append((entrada.stat().st_mtime, tarea))
+            except (FileNotFoundError, ValueError):
+                continue
+        return max(activas, key=lambda par: par[0])[1] if activas else None
+
+    def iniciar(self, origen="api", **opciones):
+        with self._lock:
+            if self._activa is not None and self._activa.activa:
+                return self._activa, False
+
+            en_curso = None
+            if self.directorio:
+                os.makedirs(self.directorio, exist_ok=True)
+                # Se registra la tarea antes de soltar el bloqueo de `iniciar`: otro worker ya la encuentra
+                with BloqueoArchivo("actualizaciones"):
+                    en_curso = BloqueoArchivo("actualizacion_en_curso")
+                    if not en_curso.intentar():
+                        guardada = self._activa_guardada()
+                        if guardada is not None:
+                            return guardada, False
+                        # Sin estado en disco de la que corre: esta espera a que termine
+                        en_curso = None
+                    tarea = self._registrar(origen, opciones)
+                    tarea.al_cambiar = self._guardar
+                    self._guardar(tarea)
+                self._podar_directorio()
+            else:
+                tarea = self._registrar(origen, opciones)
+
+        threading.Thread(target=self._ejecutar, args=(tarea, en_curso), daemon=True).start()
+        return tarea, True
+
+    def _registrar(self, origen, opciones):
+        tarea = TareaActualizacion(origen, opciones)
+        self._tareas[tarea.id] = tarea
+        while len(self._tareas) > MAX_TAREAS_GUARDADAS:
+            self._tareas.pop(next(iter(self._tareas)))
+        self._activa = tarea
+        return tarea
+
+    def _ejecutar(self, tarea, en_curso=None):
+        tarea.estado = "ejecutando"
+        tarea._notificar()
+        try:
+            resultado = self.funcion(tarea)
+        except Exception as e:
+            tarea.terminar(error=str(e))
+        else:
+            tarea.terminar(resultado=resultado)
+        finally:
+            if en_curso is not None:
+                en_curso.liberar()
+
+    def obtener(self, tarea_id):
+        tarea = self._tareas.get(tarea_id)
+        if tarea is None and self.directorio and tarea_id.isalnum():
+            try:
+                with open(self._ruta(tarea_id), encoding="utf-8") as f:
+                    return TareaGuardada(json.load(f))
+            except (FileNotFoundError, ValueError):
+                return None
+        return tarea
+
+
+class ProgramadorActualizaciones:
+    """Lanza una actualización cada `intervalo_min` minutos mientras el proceso esté vivo."""
+
+    def __init__(self, gestor, intervalo_min):
+        self.gestor = gestor
+        self.intervalo_s = intervalo_min * 60
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        if self.intervalo_s <= 0 or self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo_s):
+            self.gestor.iniciar(origen="programada")
+
+
+class PoolTrabajos:
+    """Pool acotado de hilos para sacar del event loop el trabajo bloqueante.
+
+    Los endpoints esperan con `await ejecutar(...)` y el loop sigue atendiendo
+    otras peticiones mientras tanto. Con todos los hilos ocupados, los trabajos
+    nuevos esperan en cola; `estado` informa cuántos corren y cuántos esperan.
+    """
+
+    def __init__(self, hilos=HILOS_TRABAJOS):
+        self.hilos = max(1, hilos)
+        self._pool = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix="trabajos")
+        self._lock = threading.Lock()
+        self._en_cola = 0
+        self._en_curso = 0
+        self._completados = 0
+        self._espera_max_s = 0.0
+
+    def _correr(self, encolado, funcion, args, kwargs):
+        with self._lock:
+            self._en_cola -= 1
+            self._en_curso += 1
+            self._espera_max_s = max(self._espera_max_s, time.perf_counter() - encolado)
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._en_curso -= 1
+                self._completados += 1
+
+    def _descontar_cancelado(self, futuro):
+        if futuro.cancelled():
+            with self._lock:
+                self._en_cola -= 1
+
+    def enviar(self, funcion, *args, **kwargs):
+        """Encola `funcion(*args, **kwargs)` desde código síncrono; devuelve un `concurrent.futures.Future`."""
+        with self._lock:
+            self._en_cola += 1
+        futuro = self._pool.submit(self._correr, time.perf_counter(), funcion, args, kwargs)
+        futuro.add_done_callback(self._descontar_cancelado)
+        return futuro
+
+    async def ejecutar(self, funcion, *args, **kwargs):
+        """Corre `funcion(*args, **kwargs)` en el pool y devuelve su resultado."""
+        return await asyncio.wrap_future(self.enviar(funcion, *args, **kwargs))
+
+    def estado(self):
+        with self._lock:
+            return {
+                "hilos": self.hilos,
+                "en_curso": self._en_curso,
+                "en_cola": self._en_cola,
+                "completados": self._completados,
+                "espera_max_s": round(self._espera_max_s, 3),
+            }
+
+    def cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
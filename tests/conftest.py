@@ -0,0 +1,48 @@
+# tests/conftest.py
+import os
+import shutil
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from almacen_datos import AlmacenDatos  # noqa: E402
+
+
+def crear_almacen(directorio, ruta_csv=None):
+    """`AlmacenDatos` con los datos y archivos procesados en `directorio`, y el diccionario y reglas del repo."""
+    return AlmacenDatos(
+        ruta_datos=str(directorio / "datos_formularios.parquet"),
+        ruta_diccionario=os.path.join(RAIZ, "diccionario.csv"),
+        ruta_procesados=str(directorio / "datos_procesados.arrow"),
+        ruta_csv=ruta_csv,
+        ruta_reglas=os.path.join(RAIZ, "insights_config.json"),
+        ruta_textos=str(directorio / "datos_textos.arrow"),
+    )
+
+
+@pytest.fixture(autouse=True)
+def directorio_trabajo(tmp_path, monkeypatch):
+    # Los bloqueos y demás rutas relativas quedan dentro del directorio temporal
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    """`AlmacenDatos` sobre una copia de `datos_formularios.csv`."""
+    shutil.copy(os.path.join(RAIZ, "datos_formularios.csv"), tmp_path / "datos_formularios.csv")
+    return crear_almacen(tmp_path, str(tmp_path / "datos_formularios.csv"))
+
+
+@pytest.fixture
+def almacen_vacio(tmp_path):
+    """`AlmacenDatos` todavía sin entradas locales."""
+    return crear_almacen(tmp_path)
+
+
+@pytest.fixture
+def snapshot(almacen):
+    return almacen.snapshot()
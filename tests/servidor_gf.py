@@ -0,0 +1,102 @@
+# tests/servidor_gf.py
+"""Servidor local que imita `/wp-json/gf/v2/forms/{id}/entries` de Gravity Forms.
+
+Implementa lo que usa `auth.descargar_entradas`: paginación con
+`paging[page_size]` y `paging[current_page]`, `total_count`, el filtro
+`search` por `date_updated` y `sorting`. Guarda los parámetros de cada
+petición para revisarlos en las pruebas.
+"""
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+RUTA_ENTRADAS = "/wp-json/gf/v2/forms/9/entries"
+OPERADORES = {
+    ">": lambda valor, referencia: valor > referencia,
+    ">=": lambda valor, referencia: valor >= referencia,
+    "=": lambda valor, referencia: valor == referencia,
+}
+
+
+class ServidorGF:
+    """Entradas del formulario en memoria, servidas por HTTP en un hilo aparte.
+
+    `entradas` son dicts con todos los valores como texto, igual que la API.
+    Se pueden modificar entre sincronizaciones para simular altas, cambios y
+    eliminaciones.
+    """
+
+    def __init__(self, entradas, usuario="usuario", clave_app="clave"):
+        self.entradas = list(entradas)
+        self.usuario = usuario
+        self.clave_app = clave_app
+        self.peticiones = []
+        self._lock = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), self._manejador())
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, puerto = self._servidor.server_address
+        return f"http://{host}:{puerto}{RUTA_ENTRADAS}"
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def paginas_pedidas(self):
+        with self._lock:
+            return sorted(int(p["paging[current_page]"]) for p in self.peticiones)
+
+    def _responder(self, params):
+        entradas = self.entradas
+        if "search" in params:
+            for filtro in json.loads(params["search"])["field_filters"]:
+                comparar = OPERADORES[filtro.get("operator", "=")]
+                entradas = [e for e in entradas if comparar(e[filtro["key"]], filtro["value"])]
+
+        clave = params.get("sorting[key]", "id")
+        descendente = params.get("sorting[direction]", "DESC") == "DESC"
+        orden = (lambda e: int(e["id"])) if clave == "id" else (lambda e: e[clave])
+        entradas = sorted(entradas, key=orden, reverse=descendente)
+
+        tamano = int(params.get("paging[page_size]", 20))
+        pagina = int(params.get("paging[current_page]", 1))
+        return {"total_count": len(entradas), "entries": entradas[(pagina - 1) * tamano:pagina * tamano]}
+
+    def _manejador(self):
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                esperado = base64.b64encode(f"{servidor.usuario}:{servidor.clave_app}".encode()).decode()
+                if url.path != RUTA_ENTRADAS:
+                    return self._json(404, {"code": "rest_no_route"})
+                if self.headers.get("Authorization") != f"Basic {esperado}":
+                    return self._json(401, {"code": "rest_forbidden"})
+
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                with servidor._lock:
+                    servidor.peticiones.append(params)
+                    respuesta = servidor._responder(params)
+                self._json(200, respuesta)
+
+            def _json(self, estado, contenido):
+                cuerpo = json.dumps(contenido).encode()
+                self.send_response(estado)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        return Manejador
@@ -0,0 +1,19 @@
+# tests/test_agregaciones.py
+import pytest
+
+from agregaciones import agregar, validar_consulta
+
+
+def test_conteo_por_dimension(snapshot):
+    filas = agregar(snapshot.df, ["Aprobado"])["filas"]
+    assert sum(f["conteo"] for f in filas) == len(snapshot.df)
+    assert [f["conteo"] for f in filas] == sorted((f["conteo"] for f in filas), reverse=True)
+
+
+@pytest.mark.parametrize("dimensiones, metricas", [
+    (["Industria", "Industria"], ["conteo"]),
+    (["Industria"], ["conteo", "conteo"]),
+])
+def test_consulta_con_repetidas(dimensiones, metricas):
+    with pytest.raises(ValueError, match="repetidas"):
+        validar_consulta(dimensiones, metricas)
@@ -0,0 +1,25 @@
+# tests/test_almacen_datos.py
+from almacen_datos import AlmacenDatos
+
+
+def _otro_worker(almacen):
+    """Otro `AlmacenDatos` sobre los mismos archivos, como el de otro worker."""
+    return AlmacenDatos(
+        ruta_datos=almacen.ruta_datos, ruta_diccionario=almacen.ruta_diccionario,
+        ruta_procesados=almacen.ruta_procesados, ruta_csv=almacen.ruta_csv,
+        ruta_reglas=almacen.ruta_reglas, ruta_textos=almacen.ruta_textos,
+    )
+
+
+def test_textos_de_un_snapshot_no_cambian_con_una_version_nueva(almacen):
+    snapshot = almacen.snapshot()
+    id_ = snapshot.df["id"].iloc[0]
+    # El snapshot no lee sus textos hasta después de publicada la versión nueva
+    crudos = almacen.cargar_crudos()
+    original = crudos.loc[crudos["id"] == id_, "12"].iloc[0]
+    crudos.loc[crudos["id"] == id_, "12"] = "Texto de la versión nueva"
+    nuevo = _otro_worker(almacen).guardar_crudos(crudos)
+
+    assert nuevo.version != snapshot.version
+    assert nuevo.textos.filas([id_], ["12"]).iloc[0, 0] == "Texto de la versión nueva"
+    assert snapshot.textos.filas([id_], ["12"]).iloc[0, 0] == original
@@ -0,0 +1,15 @@
+# tests/test_buscador.py
+from buscador import buscar_proyectos, detalle_proyecto
+
+
+def test_busqueda_sin_coincidencias_con_campos_de_texto_largo(snapshot):
+    assert buscar_proyectos(snapshot, "zzzzz", campos=["12"]) == []
+    assert buscar_proyectos(snapshot, "zzzzz", campos=["id", "13"]) == []
+    assert buscar_proyectos(snapshot, "zzzzz") == []
+
+
+def test_busqueda_con_campos_de_texto_largo(snapshot):
+    nombre = snapshot.df["Nombre del Proyecto"].iloc[0]
+    filas = buscar_proyectos(snapshot, nombre, campos=["id", "12"])
+    assert filas and set(filas[0]) == {"id", "12"}
+    assert detalle_proyecto(snapshot, filas[0]["id"], campos=["12"]) == {"12": filas[0]["12"]}
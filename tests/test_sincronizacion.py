@@ -0,0 +1,173 @@
+# tests/test_sincronizacion.py
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import auth
+import sincronizacion
+from sincronizacion import FORMATO_FECHA, cargar_estado, fusionar_entradas, sincronizar
+from servidor_gf import ServidorGF
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _entradas_repo():
+    """Entradas de `datos_formularios.csv` como las devuelve la API: todo texto, vacíos como ""."""
+    df = pd.read_csv(os.path.join(RAIZ, "datos_formularios.csv"), dtype=str, keep_default_na=False)
+    return df.to_dict(orient="records")
+
+
+def _mas_tarde(entradas, segundos):
+    ultima = max(datetime.strptime(e["date_updated"], FORMATO_FECHA) for e in entradas)
+    return (ultima + timedelta(seconds=segundos)).strftime(FORMATO_FECHA)
+
+
+@pytest.fixture
+def servidor():
+    with ServidorGF(_entradas_repo()) as servidor:
+        yield servidor
+
+
+@pytest.fixture
+def sincronizar_con(servidor, almacen_vacio, tmp_path):
+    ruta_estado = str(tmp_path / "estado_sincronizacion.json")
+
+    def ejecutar(**opciones):
+        return sincronizar(
+            servidor.usuario, servidor.clave_app, servidor.url, almacen_vacio, ruta_estado=ruta_estado, **opciones
+        )
+
+    ejecutar.ruta_estado = ruta_estado
+    return ejecutar
+
+
+def test_descarga_paginas_en_paralelo(servidor, monkeypatch):
+    monkeypatch.setattr(auth, "TAMANO_PAGINA", 10)
+    avance = []
+    df, metricas = auth.descargar_entradas(
+        servidor.usuario, servidor.clave_app, servidor.url, concurrencia=3,
+        progreso=lambda descargadas, totales: avance.append((descargadas, totales)),
+    )
+
+    assert metricas["paginas"] == 8 and len(metricas["latencias_ms"]) == 8
+    assert servidor.paginas_pedidas() == list(range(1, 9))
+    assert avance[-1] == (8, 8) and len(avance) == 8
+    # Las páginas se unen en orden aunque lleguen desordenadas
+    assert df["id"].tolist() == sorted((e["id"] for e in servidor.entradas), key=int, reverse=True)
+
+
+def test_descarga_sin_total_count(servidor, monkeypatch):
+    monkeypatch.setattr(auth, "TAMANO_PAGINA", 10)
+    responder = servidor._responder
+    monkeypatch.setattr(servidor, "_responder", lambda params: {"entries": responder(params)["entries"]})
+
+    df, metricas = auth.descargar_entradas(servidor.usuario, servidor.clave_app, servidor.url)
+
+    assert len(df) == len(servidor.entradas)
+    assert metricas["paginas"] == 8
+
+
+def test_credenciales_invalidas(servidor):
+    with pytest.raises(auth.requests.HTTPError):
+        auth.descargar_entradas(servidor.usuario, "otra", servidor.url)
+
+
+def test_primera_sincronizacion_es_completa(servidor, sincronizar_con, almacen_vacio):
+    resultado = sincronizar_con()
+
+    assert resultado["modo"] == "completo"
+    assert resultado["entradas"] == len(servidor.entradas)
+    assert "search" not in servidor.peticiones[0]
+    assert len(almacen_vacio.snapshot().df) == len(servidor.entradas)
+    estado = cargar_estado(sincronizar_con.ruta_estado)
+    assert estado["ultima_actualizacion"] == max(e["date_updated"] for e in servidor.entradas)
+    assert estado["ultimo_id"] == max(int(e["id"]) for e in servidor.entradas)
+
+
+def test_sincronizacion_incremental(servidor, sincronizar_con, almacen_vacio):
+    sincronizar_con()
+    antes = almacen_vacio.snapshot()
+    marca = cargar_estado(sincronizar_con.ruta_estado)["ultima_actualizacion"]
+
+    modificada = dict(servidor.entradas[-1], date_updated=_mas_tarde(servidor.entradas, 60))
+    modificada["1"] = "Nombre corregido"
+    nueva = dict(servidor.entradas[0], id=str(max(int(e["id"]) for e in servidor.entradas) + 1),
+                 date_created=_mas_tarde(servidor.entradas, 120), date_updated=_mas_tarde(servidor.entradas, 120))
+    nueva["1"] = "Proyecto nuevo"
+    servidor.entradas = [nueva] + servidor.entradas[:-1] + [modificada]
+    servidor.peticiones.clear()
+
+    resultado = sincronizar_con()
+
+    assert resultado["modo"] == "incremental"
+    assert resultado["entradas"] == 2
+    assert resultado["total"] == len(antes.df) + 1
+    # Solo se piden las entradas modificadas desde la marca de agua, con un segundo de solapamiento
+    filtro = json.loads(servidor.peticiones[0]["search"])["field_filters"][0]
+    desde = datetime.strptime(marca, FORMATO_FECHA) - timedelta(seconds=1)
+    assert filtro == {"key": "date_updated", "value": desde.strftime(FORMATO_FECHA), "operator": ">"}
+    assert servidor.peticiones[0]["sorting[key]"] == "date_updated"
+
+    crudos = almacen_vacio.cargar_crudos()
+    assert crudos["id"].tolist() == sorted(crudos["id"].tolist(), reverse=True)
+    assert crudos["id"].is_unique
+    assert crudos.loc[crudos["id"] == int(modificada["id"]), "1"].item() == "Nombre corregido"
+    assert crudos.loc[crudos["id"] == int(nueva["id"]), "1"].item() == "Proyecto nuevo"
+    assert cargar_estado(sincronizar_con.ruta_estado)["ultima_actualizacion"] == nueva["date_updated"]
+    assert almacen_vacio.snapshot().version != antes.version
+
+
+def test_solapamiento_no_vuelve_a_guardar(servidor, sincronizar_con, almacen_vacio):
+    sincronizar_con()
+    version = almacen_vacio.snapshot().version
+    servidor.peticiones.clear()
+
+    resultado = sincronizar_con()
+
+    # Las entradas del último segundo vuelven por el solapamiento y se descartan
+    assert resultado["descarga"]["entradas"] > 0
+    assert (resultado["modo"], resultado["entradas"], resultado["total"]) == ("incremental", 0, len(servidor.entradas))
+    assert almacen_vacio.snapshot().version == version
+
+
+def test_reconciliacion_elimina_entradas_borradas(servidor, sincronizar_con, almacen_vacio):
+    sincronizar_con()
+    borrada = servidor.entradas.pop(3)
+
+    # Una sincronización incremental no ve las entradas borradas
+    assert sincronizar_con()["modo"] == "incremental"
+    assert int(borrada["id"]) in almacen_vacio.cargar_crudos()["id"].tolist()
+
+    # Pasado el intervalo de reconciliación se descarga todo y se reemplaza el archivo local
+    estado = cargar_estado(sincronizar_con.ruta_estado)
+    hace_un_dia = datetime.now() - timedelta(hours=sincronizacion.HORAS_RECONCILIACION, minutes=1)
+    sincronizacion.guardar_estado({**estado, "ultima_reconciliacion": hace_un_dia.isoformat()}, sincronizar_con.ruta_estado)
+    servidor.peticiones.clear()
+
+    resultado = sincronizar_con()
+
+    assert resultado["modo"] == "completo"
+    assert "search" not in servidor.peticiones[0]
+    assert int(borrada["id"]) not in almacen_vacio.cargar_crudos()["id"].tolist()
+    assert len(almacen_vacio.snapshot().df) == len(servidor.entradas)
+    assert cargar_estado(sincronizar_con.ruta_estado)["ultima_reconciliacion"] > hace_un_dia.isoformat()
+
+
+def test_reconciliacion_forzada(servidor, sincronizar_con):
+    sincronizar_con()
+    servidor.entradas.pop(0)
+    assert sincronizar_con(forzar_completo=True)["total"] == len(servidor.entradas)
+
+
+def test_fusionar_entradas_por_id():
+    actual = pd.DataFrame({"id": [3, 2, 1], "date_updated": ["b", "a", "a"], "1": ["x", "y", "z"]})
+    nuevas = pd.DataFrame({"id": [4, 2], "date_updated": ["c", "c"], "1": ["nueva", "cambiada"], "extra": ["e", "f"]})
+
+    fusion = fusionar_entradas(actual, nuevas)
+
+    assert fusion.columns.tolist() == ["id", "date_updated", "1", "extra"]
+    assert fusion["id"].tolist() == [4, 3, 2, 1]
+    assert fusion["1"].tolist() == ["nueva", "x", "cambiada", "z"]
@@ -0,0 +1,15 @@
+# tests/test_tablero.py
+from tablero import pagina_proyectos
+
+
+def test_campos_repetidos(snapshot):
+    pagina = pagina_proyectos(snapshot, limite=1, campos=["Insights", "Insights", "id"])
+    assert list(pagina["proyectos"][0]) == ["Insights", "id"]
+
+
+def test_pagina_filtrada_y_ordenada(snapshot):
+    pagina = pagina_proyectos(snapshot, limite=5, orden="-Puntaje Total", filtros={"aprobado": "Sí"})
+    puntajes = [p["Puntaje Total"] for p in pagina["proyectos"]]
+    assert puntajes == sorted(puntajes, reverse=True)
+    assert {p["Aprobado"] for p in pagina["proyectos"]} == {"Sí"}
+    assert pagina["total"] == int((snapshot.df["Aprobado"] == "Sí").sum())
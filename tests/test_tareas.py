@@ -0,0 +1,71 @@
+# tests/test_tareas.py
+import json
+import threading
+
+from tareas import GestorActualizaciones, PoolTrabajos
+
+
+def _esperar(gestor, tarea_id):
+    for _ in range(200):
+        tarea = gestor.obtener(tarea_id)
+        if not tarea.activa:
+            return tarea
+        threading.Event().wait(0.01)
+    raise AssertionError("la tarea no terminó")
+
+
+def test_una_actualizacion_a_la_vez_entre_workers(tmp_path):
+    continuar = threading.Event()
+    ejecutadas = []
+
+    def actualizar(tarea):
+        ejecutadas.append(tarea.id)
+        continuar.wait(5)
+        return {"entradas": 1}
+
+    # Dos gestores sobre el mismo directorio, como los de dos workers
+    worker_a = GestorActualizaciones(actualizar, str(tmp_path / "tareas"))
+    worker_b = GestorActualizaciones(actualizar, str(tmp_path / "tareas"))
+
+    tarea, nueva = worker_a.iniciar()
+    repetida, nueva_b = worker_b.iniciar()
+    assert nueva and not nueva_b
+    assert repetida.id == tarea.id
+    assert worker_b.obtener(tarea.id).a_dict()["estado"] in ("pendiente", "ejecutando")
+
+    continuar.set()
+    assert _esperar(worker_b, tarea.id).a_dict()["estado"] == "completado"
+
+    siguiente, nueva = worker_b.iniciar()
+    assert nueva and siguiente.id != tarea.id
+    _esperar(worker_b, siguiente.id)
+    assert ejecutadas == [tarea.id, siguiente.id]
+
+
+def test_tarea_de_un_worker_caido_no_bloquea(tmp_path):
+    directorio = tmp_path / "tareas"
+    directorio.mkdir()
+    # Estado que dejó un worker que murió a mitad de una actualización
+    (directorio / "0123456789ab.json").write_text(json.dumps({"id": "0123456789ab", "estado": "ejecutando"}))
+
+    gestor = GestorActualizaciones(lambda tarea: {}, str(directorio))
+    tarea, nueva = gestor.iniciar()
+
+    assert nueva and tarea.id != "0123456789ab"
+    assert _esperar(gestor, tarea.id).a_dict()["estado"] == "completado"
+
+
+def test_pool_descuenta_trabajos_cancelados():
+    pool = PoolTrabajos(hilos=1)
+    continuar = threading.Event()
+    ocupado = pool.enviar(continuar.wait, 5)
+    en_cola = pool.enviar(lambda: "no corre")
+    assert pool.estado()["en_cola"] >= 1
+
+    assert en_cola.cancel()
+    continuar.set()
+    ocupado.result(5)
+
+    estado = pool.estado()
+    assert (estado["en_cola"], estado["en_curso"], estado["completados"]) == (0, 0, 1)
+    pool.cerrar()
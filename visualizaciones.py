@@ -1,7 +1,11 @@
-import plotly.express as px
+import numpy as np
 import pandas as pd
-from plotly.subplots import make_subplots
-import plotly.graph_objects as go
+
+from agregaciones import agregar
+from motor_puntajes import SEGMENTOS, UMBRAL_APROBACION
+
+# Métricas de agregaciones con los proyectos que superan el umbral en cada segmento
+METRICAS_SUPERA = ["aprobados_trl_1_3", "aprobados_trl_4_7", "aprobados_trl_8_9"]
 
 def crear_layout(titulo):
     return dict(
@@ -30,7 +34,18 @@ def crear_layout(titulo):
         )
     )
 
+def _conteo_por(df, columna, dimension, etiqueta):
+    """Conteo de `columna` normalizada como la dimensión `dimension` de `agregar`."""
+    filas = agregar(df[[columna]].rename(columns={columna: dimension}), [dimension])["filas"]
+    return pd.DataFrame({
+        etiqueta: [f[dimension] for f in filas],
+        "Cantidad": [int(f["conteo"]) for f in filas],
+    })
+
 def graficos_generales(df, columna_industria, columna_ingles, columna_ubicacion):
+    # Plotly se importa al armar las figuras: la API arranca sin cargarlo
+    import plotly.express as px
+
     colors = {
         "Sí": "#27ae60",
         "No": "#e74c3c",
@@ -41,14 +56,12 @@ def graficos_generales(df, columna_industria, columna_ingles, columna_ubicacion)
     }
 
     # Gráfico 1
-    registros = []
-    for _, row in df[df["Aprobado"] == "Sí"].iterrows():
-        for segmento in ["TRL 1-3", "TRL 4-7", "TRL 8-9"]:
-            if row[f"Puntaje {segmento}"] >= 50:
-                registros.append({"Segmento TRL": segmento})
-    df_aprobados = pd.DataFrame(registros)
-    conteo_aprobados = df_aprobados["Segmento TRL"].value_counts().reset_index()
-    conteo_aprobados.columns = ["Segmento TRL", "Aprobados"]
+    supera = agregar(df[df["Aprobado"] == "Sí"], metricas=METRICAS_SUPERA)["filas"][0]
+    conteo_aprobados = pd.DataFrame({
+        "Segmento TRL": SEGMENTOS,
+        "Aprobados": [supera[m] for m in METRICAS_SUPERA],
+    })
+    conteo_aprobados = conteo_aprobados[conteo_aprobados["Aprobados"] > 0].sort_values("Aprobados", ascending=False, kind="stable")
 
     fig1 = px.bar(
         conteo_aprobados,
@@ -67,35 +80,32 @@ def graficos_generales(df, columna_industria, columna_ingles, columna_ubicacion)
     fig1.update_xaxes(tickangle=-30)
 
     # Gráfico 2
-    fig2 = px.pie(df, names="Aprobado", hole=0.4, color="Aprobado", color_discrete_map={"Sí": colors["Sí"], "No": colors["No"]}, template="plotly_white")
+    # Aprobado es categórico y los puntajes float32: Plotly recibe texto y doble precisión como antes
+    aprobado = pd.DataFrame({"Aprobado": df["Aprobado"].astype(str)})
+    fig2 = px.pie(aprobado, names="Aprobado", hole=0.4, color="Aprobado", color_discrete_map={"Sí": colors["Sí"], "No": colors["No"]}, template="plotly_white")
     fig2.update_traces(textinfo="percent+label", pull=[0.05, 0], textfont_size=14)
     fig2.update_layout(**crear_layout("✅ Proyectos Aprobados"), showlegend=False, height=600)
 
     # Gráfico 3
-    registros = []
-    for _, row in df.iterrows():
-        for segmento in ["TRL 1-3", "TRL 4-7", "TRL 8-9"]:
-            aprobado = "Sí" if row[f"Puntaje {segmento}"] >= 50 else "No"
-            registros.append({
-                "Segmento TRL": segmento,
-                "Aprobado": aprobado
-            })
-    df_segmentos = pd.DataFrame(registros)
+    puntajes = df[[f"Puntaje {segmento}" for segmento in SEGMENTOS]].to_numpy()
+    df_segmentos = pd.DataFrame({
+        "Segmento TRL": np.tile(SEGMENTOS, len(df)),
+        "Aprobado": np.where(puntajes.ravel() >= UMBRAL_APROBACION, "Sí", "No"),
+    })
     fig3 = px.histogram(df_segmentos, x="Segmento TRL", color="Aprobado", barmode="group", color_discrete_map={"Sí": colors["Sí"], "No": colors["No"]}, template="plotly_white")
     fig3.update_traces()
     fig3.update_layout(**crear_layout("📈 Aprobación por Segmento TRL"), xaxis_title="Segmento TRL", yaxis_title="Número de Proyectos", height=600)
     fig3.update_xaxes(tickangle=-30)
 
     # Gráfico 4
-    fig4 = px.histogram(df, x="Puntaje TRL 1-3", nbins=20, color_discrete_sequence=[colors["TRL 1-3"]], template="plotly_white")
+    puntajes_1_3 = pd.DataFrame({"Puntaje TRL 1-3": df["Puntaje TRL 1-3"].astype(float)})
+    fig4 = px.histogram(puntajes_1_3, x="Puntaje TRL 1-3", nbins=20, color_discrete_sequence=[colors["TRL 1-3"]], template="plotly_white")
     fig4.update_layout(**crear_layout("🔍 Puntajes TRL 1-3"), xaxis_title="Puntaje", yaxis_title="Número de Proyectos", height=600)
     fig4.update_xaxes(tickangle=-30)
 
     # Gráfico 5
     if columna_industria in df.columns:
-        df["Industria"] = df[columna_industria].fillna("No especificada").astype(str).str.strip()
-        conteo_industria = df["Industria"].value_counts().reset_index()
-        conteo_industria.columns = ["Industria", "Cantidad"]
+        conteo_industria = _conteo_por(df, columna_industria, "Industria", "Industria")
         fig5 = px.bar(conteo_industria, x="Cantidad", y="Industria", orientation="h", color="Industria", template="plotly_white")
         fig5.update_layout(**crear_layout("🏭 Proyectos por Industria"), height=600, showlegend=False)
     else:
@@ -103,9 +113,7 @@ def graficos_generales(df, columna_industria, columna_ingles, columna_ubicacion)
 
     # Gráfico 6
     if columna_ingles in df.columns:
-        df["Nivel de Inglés"] = df[columna_ingles].fillna("No especificado").str.strip().str.capitalize()
-        conteo_ingles = df["Nivel de Inglés"].value_counts().reset_index()
-        conteo_ingles.columns = ["Nivel", "Cantidad"]
+        conteo_ingles = _conteo_por(df, columna_ingles, "Nivel de Inglés", "Nivel")
         fig6 = px.bar(conteo_ingles, x="Nivel", y="Cantidad", color="Nivel", template="plotly_white")
         fig6.update_layout(**crear_layout("🌍 Nivel de Inglés"), height=600, showlegend=False)
         fig6.update_xaxes(tickangle=-30)
@@ -114,9 +122,7 @@ def graficos_generales(df, columna_industria, columna_ingles, columna_ubicacion)
 
     # Gráfico 7
     if columna_ubicacion in df.columns:
-        df["Ubicación"] = df[columna_ubicacion].astype(str).str.strip().str.capitalize().replace({"Nan": "No especificada", "": "No especificada"})
-        conteo_ubicacion = df["Ubicación"].value_counts().reset_index()
-        conteo_ubicacion.columns = ["Ubicación", "Cantidad"]
+        conteo_ubicacion = _conteo_por(df, columna_ubicacion, "Ubicación", "Ubicación")
         fig7 = px.pie(conteo_ubicacion, names="Ubicación", values="Cantidad", hole=0.3, color_discrete_sequence=colors["Ubicación"], template="plotly_white")
         fig7.update_traces(textinfo="percent+label", textfont_size=14)
         fig7.update_layout(**crear_layout("📍 Ubicación Geográfica"), height=600, showlegend=False)
@@ -124,3 +130,44 @@ def graficos_generales(df, columna_industria, columna_ingles, columna_ubicacion)
         fig7 = None
 
     return fig1, fig2, fig3, fig4, fig5, fig6, fig7
+
+def _conteos(agregado, dimension):
+    filas = agregado["filas"]
+    return {"etiquetas": [str(f[dimension]) for f in filas], "valores": [int(f["conteo"]) for f in filas]}
+
+def datos_graficos(df, bins_puntaje=20):
+    """Series agregadas de los siete gráficos generales, sin estilos.
+
+    Mismos conteos que `graficos_generales`, pero solo los datos: los colores y
+    títulos se aplican en el cliente.
+    """
+    totales = agregar(df, metricas=["conteo"] + METRICAS_SUPERA)["filas"][0]
+    por_aprobado = agregar(df, ["Aprobado"], METRICAS_SUPERA)["filas"]
+    aprobados = next((f for f in por_aprobado if f["Aprobado"] == "Sí"), dict.fromkeys(METRICAS_SUPERA, 0))
+
+    # Gráfico 1: segmentos con puntaje >= 50 entre los proyectos aprobados
+    aprobados_segmento = pd.Series([aprobados[m] for m in METRICAS_SUPERA], index=SEGMENTOS)
+    aprobados_segmento = aprobados_segmento[aprobados_segmento > 0].sort_values(ascending=False, kind="stable")
+
+    # Gráfico 4: histograma de Puntaje TRL 1-3
+    conteos, bordes = np.histogram(df["Puntaje TRL 1-3"].dropna().to_numpy(), bins=bins_puntaje)
+
+    return {
+        "aprobados_por_segmento": {
+            "etiquetas": list(aprobados_segmento.index),
+            "valores": [int(v) for v in aprobados_segmento.values],
+        },
+        "aprobacion": _conteos(agregar(df, ["Aprobado"]), "Aprobado"),
+        "aprobacion_por_segmento": {
+            "etiquetas": SEGMENTOS,
+            "Sí": [int(totales[m]) for m in METRICAS_SUPERA],
+            "No": [int(totales["conteo"] - totales[m]) for m in METRICAS_SUPERA],
+        },
+        "histograma_trl_1_3": {
+            "bordes": [float(b) for b in bordes],
+            "valores": [int(c) for c in conteos],
+        },
+        "industria": _conteos(agregar(df, ["Industria"]), "Industria"),
+        "nivel_ingles": _conteos(agregar(df, ["Nivel de Inglés"]), "Nivel de Inglés"),
+        "ubicacion": _conteos(agregar(df, ["Ubicación"]), "Ubicación"),
+    }